@@ -0,0 +1,169 @@
+"""Batch runs straight from and into tar/zip archives.
+
+Covers are read member by member (tar in streaming 'r|*' mode) and decoded with cv2.imdecode from memory,
+so a large corpus never has to be unpacked to disk. Stego images and the results CSV are written straight
+into the output archive; only one member is held in memory at a time.
+"""
+import io
+import os
+import csv
+import time
+import tarfile
+import zipfile
+
+import dct_data_embedding as stego
+import dct_jpeg_domain as jpeg_domain
+import stego_layout
+import results_store
+import fanout
+import dwt
+
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz', '.zip')
+TAR_COMPRESSION = {'.gz': 'gz', '.tgz': 'gz', '.bz2': 'bz2', '.tbz2': 'bz2', '.xz': 'xz', '.txz': 'xz'}
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif')
+
+def archive_stem(path):
+    """Archive name without its suffix, used as the tier name (covers_low.tar.gz -> covers_low)"""
+    name = os.path.basename(path)
+    for suffix in sorted(ARCHIVE_SUFFIXES, key=len, reverse=True):
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+def iter_image_members(path):
+    """Yield (member name, bytes) for every image member, in archive order"""
+    if path.lower().endswith('.zip'):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTENSIONS):
+                    yield info.filename, archive.read(info)
+    else:
+        # Streaming mode: members are read in order without seeking, so compressed tars work from pipes too
+        with tarfile.open(path, 'r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield member.name, archive.extractfile(member).read()
+
+class Archive_Writer(object):
+    """Sequential writer for a tar (optionally compressed) or zip output archive"""
+    def __init__(self, path):
+        self.is_zip = path.lower().endswith('.zip')
+        if self.is_zip:
+            self.archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED)
+        else:
+            compression = TAR_COMPRESSION.get(os.path.splitext(path)[1].lower(), '')
+            self.archive = tarfile.open(path, f"w|{compression}")
+
+    def add(self, name, data):
+        if self.is_zip:
+            self.archive.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self):
+        self.archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def csv_bytes(header, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+def embed_archive(input_archive, output_archive, message, method='dct', key=None, verify='fast',
+                  store_path=results_store.RESULTS_STORE_PATH, **layout):
+    '''
+    Embed the message into every image member of an archive and write the stego images and the results CSV
+    into output_archive
+    :param layout: channels for dct; channels, subbands, levels for dwt
+    :param store_path: columnar results store the rows are also appended to, None to skip it
+    :return: number of embedded members
+    '''
+    tier = archive_stem(input_archive)
+    if method == 'dct':
+        layout_name = stego_layout.describe_layout(stego_layout.dct_layout(**layout))
+    else:
+        layout_name = stego_layout.describe_layout(*stego_layout.dwt_layout(**layout))
+    rows = []
+    store_rows = []
+    with Archive_Writer(output_archive) as writer:
+        for name, data in iter_image_members(input_archive):
+            print(f"Processing: {input_archive}:{name}")
+            try:
+                start_time = time.perf_counter()
+                stego_name, stego_data, width, height, capacity_bits, embedded_message, verified = fanout.embed_cover_bytes(name, data, message, method, key, verify, layout)
+                writer.add(stego_name, stego_data)
+                embed_seconds = time.perf_counter() - start_time
+                if verified is False:
+                    print(f"Verification failed: {stego_name}")
+                rows.append([name, stego_name, len(data), len(stego_data), f"{width}x{height}", layout_name, capacity_bits, embedded_message,
+                             "" if verified is None else verified])
+                store_rows.append({'algorithm': method, 'tier': tier, 'stage': 'embed', 'filename': name, 'layout': layout_name,
+                                   'width': width, 'height': height, 'original_size': len(data), 'stego_size': len(stego_data),
+                                   'size_increase_pct': results_store.size_increase_pct(len(data), len(stego_data)),
+                                   'capacity_bits': capacity_bits, 'embed_seconds': embed_seconds, 'verified': verified,
+                                   'expected': embedded_message})
+            except Exception as e:
+                print(f"Error processing {name}: {e}")
+                rows.append([name, "", len(data), "", "", layout_name, "", f"[ERROR: {e}]", ""])
+                store_rows.append({'algorithm': method, 'tier': tier, 'stage': 'embed', 'filename': name, 'error': str(e)})
+        writer.add(f"{method}_stego_results_{tier}.csv", csv_bytes(
+            ["filename", "stego filename", "original size", "stego size", "resolution", "layout", "capacity bits", "embedded_message", "verified"], rows))
+    print(f"Stego images and summary saved to {output_archive}")
+    results_store.append_to_results_store(store_rows, store_path)
+    return sum(1 for row in store_rows if 'error' not in row)
+
+def extract_member(name, data, method, key, layout):
+    """Extracted message and resolution of one stego member"""
+    if method == 'dct' and name.lower().endswith(fanout.JPEG_EXTENSIONS):
+        stego_jpeg = jpeg_domain.read_jpeg_coefficients(data)
+        return stego.decode_extracted_data(jpeg_domain.extract_encoded_data_from_JPEG(stego_jpeg, key=key)), stego_jpeg.width, stego_jpeg.height
+    image = fanout.decode_image(data)
+    if image is None:
+        raise ValueError("Failed to decode image")
+    height, width = image.shape[:2]
+    if method == 'dct':
+        channel_names = stego_layout.dct_layout(**layout)
+        layout_code = stego_layout.dct_layout_code(channel_names)
+        return stego.decode_extracted_data(fanout.recovered_coefficient_data(image, key, channel_names), layout_code), width, height
+    return dwt.sanitize_text(dwt.extract_text_from_image(image, key, *stego_layout.dwt_layout(**layout))), width, height
+
+def extract_archive(input_archive, csv_path, expected_message, method='dct', key=None,
+                    store_path=results_store.RESULTS_STORE_PATH, **layout):
+    '''
+    Extract the message from every stego member of an archive into a CSV with the columns of the extraction
+    scripts, so compare_and_analyze.py can read it
+    :return: number of processed members
+    '''
+    tier = archive_stem(input_archive)
+    rows = []
+    store_rows = []
+    for name, data in iter_image_members(input_archive):
+        if '_steg' not in os.path.basename(name):
+            continue
+        try:
+            start_time = time.perf_counter()
+            extracted, width, height = extract_member(name, data, method, key, layout)
+            rows.append([name, "", len(data), f"{width}x{height}", extracted, expected_message])
+            store_rows.append({'algorithm': method, 'tier': tier, 'stage': 'extract', 'filename': name, 'width': width, 'height': height,
+                               'stego_size': len(data), 'extract_seconds': time.perf_counter() - start_time,
+                               'extracted': extracted, 'expected': expected_message})
+            print(f"Extracted from {name}")
+        except Exception as e:
+            rows.append([name, "ERROR", "", "", "", str(e).replace(',', ';')])
+            store_rows.append({'algorithm': method, 'tier': tier, 'stage': 'extract', 'filename': name, 'error': str(e)})
+            print(f"Error processing {name}: {e}")
+    with open(csv_path, "wb") as out_f:
+        out_f.write(csv_bytes(["filename", "original size", "stego size", "resolution", "extracted", "expected"], rows))
+    print(f"All results saved to {csv_path}")
+    results_store.append_to_results_store(store_rows, store_path)
+    return len(rows)
@@ -1,6 +1,7 @@
 import pandas as pd
 import os
 from difflib import SequenceMatcher
+import results_store
 
 # --- Configuration ---
 # Sesuaikan path ini agar cocok dengan struktur folder Anda
@@ -17,6 +18,11 @@ INPUT_CSV_PATH = "./dwt/dwt_extracted_results_low.csv"
 # Path tempat CSV akhir yang terperinci akan disimpan
 OUTPUT_CSV_PATH = "./dwt/dwt_low_analysis.csv"
 
+# Algoritma dan tier untuk results store kolumnar (None untuk hanya menulis CSV)
+ALGORITHM = "dwt"
+TIER = "low"
+RESULTS_STORE = results_store.RESULTS_STORE_PATH
+
 # --- Helper Function for Bit Error Rate (BER) ---
 
 def calculate_ber_percentage(expected_str, extracted_str):
@@ -63,23 +69,24 @@ def analyze_text_match(expected, extracted):
 
 # --- Main Analysis Script ---
 
-def main():
-    """Fungsi utama untuk melakukan analisis."""
+def analyze(input_csv_path=INPUT_CSV_PATH, original_images_folder=ORIGINAL_IMAGES_FOLDER, stego_folder=STEGO_FOLDER,
+            output_csv_path=OUTPUT_CSV_PATH, algorithm=ALGORITHM, tier=TIER, results_store_path=RESULTS_STORE):
+    """Melakukan analisis untuk satu CSV hasil ekstraksi (default: konfigurasi di atas)."""
     print("Memulai analisis...")
     
-    if not os.path.exists(INPUT_CSV_PATH):
-        print(f"Error: File input tidak ditemukan di '{INPUT_CSV_PATH}'")
+    if not os.path.exists(input_csv_path):
+        print(f"Error: File input tidak ditemukan di '{input_csv_path}'")
         return
 
-    df = pd.read_csv(INPUT_CSV_PATH)
+    df = pd.read_csv(input_csv_path)
     
     new_data = []
 
     for index, row in df.iterrows():
         stego_filename = row['filename']
         original_filename = stego_filename.replace('_stego', '')
-        original_path = os.path.join(ORIGINAL_IMAGES_FOLDER, original_filename)
-        stego_path = os.path.join(STEGO_FOLDER, stego_filename)
+        original_path = os.path.join(original_images_folder, original_filename)
+        stego_path = os.path.join(stego_folder, stego_filename)
         
         # Inisialisasi data baris tanpa metrik gambar
         row_data = {
@@ -135,8 +142,29 @@ def main():
     ]
     final_df = final_df[column_order]
 
-    final_df.to_csv(OUTPUT_CSV_PATH, index=False, float_format='%.4f')
-    print(f"\nAnalisis selesai! Hasil telah disimpan ke '{OUTPUT_CSV_PATH}'")
+    final_df.to_csv(output_csv_path, index=False, float_format='%.4f')
+    print(f"\nAnalisis selesai! Hasil telah disimpan ke '{output_csv_path}'")
+
+    if results_store_path is not None:
+        store_rows = [{
+            'algorithm': algorithm,
+            'tier': tier,
+            'stage': 'analysis',
+            'filename': row['filename'],
+            'original_size': row['original size'],
+            'stego_size': row['stego size'],
+            'size_increase_pct': row['size percentage increase'],
+            'analysis': row['analysis'],
+            'ber_pct': row['BER %'],
+            'expected': row['expected'],
+            'extracted': row['extracted'],
+        } for row in new_data]
+        if results_store.append_to_results_store(store_rows, results_store_path):
+            print(f"Hasil juga ditambahkan ke results store '{results_store_path}'")
+
+def main():
+    """Fungsi utama untuk melakukan analisis."""
+    analyze()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,39 +1,107 @@
-#------ External Libraries ------#
-import bitstring
-import numpy as np
-#================================#
-
-def extract_encoded_data_from_DCT(dct_blocks):
-    extracted_data = ""
-    for current_dct_block in dct_blocks:
-        for i in range(1, len(current_dct_block)):
-            curr_coeff = np.int32(current_dct_block[i])
-            if (curr_coeff > 1):
-                extracted_data += bitstring.pack('uint:1', np.uint8(current_dct_block[i]) & 0x01)
-    return extracted_data
-
-# ============================================================================= #
-# ============================================================================= #
-# ============================================================================= #
-# ============================================================================= #
-
-def embed_encoded_data_into_DCT(encoded_bits, dct_blocks):
-    data_complete = False; encoded_bits.pos = 0
-    encoded_data_len = bitstring.pack('uint:32', len(encoded_bits))
-    converted_blocks = []
-    for current_dct_block in dct_blocks:
-        for i in range(1, len(current_dct_block)):
-            curr_coeff = np.int32(current_dct_block[i])
-            if (curr_coeff > 1):
-                curr_coeff = np.uint8(current_dct_block[i])
-                if (encoded_bits.pos == (len(encoded_bits) - 1)): data_complete = True; break
-                pack_coeff = bitstring.pack('uint:8', curr_coeff)
-                if (encoded_data_len.pos <= len(encoded_data_len) - 1): pack_coeff[-1] = encoded_data_len.read(1)
-                else: pack_coeff[-1] = encoded_bits.read(1)
-                # Replace converted coefficient
-                current_dct_block[i] = np.float32(pack_coeff.read('uint:8'))
-        converted_blocks.append(current_dct_block)
-
-    # if not(data_complete): raise ValueError("Data didn't fully embed into cover image!")
-
-    return converted_blocks
\ No newline at end of file
+#------ External Libraries ------#
+import struct
+import bitstring
+import numpy as np
+#================================#
+#---------- Source Files --------#
+import keyed_permutation as keyed
+#================================#
+
+def extract_encoded_data_from_DCT(dct_blocks):
+    extracted_data = ""
+    for current_dct_block in dct_blocks:
+        for i in range(1, len(current_dct_block)):
+            curr_coeff = np.int32(current_dct_block[i])
+            if (curr_coeff > 1):
+                extracted_data += bitstring.pack('uint:1', np.uint8(current_dct_block[i]) & 0x01)
+    return extracted_data
+
+# ============================================================================= #
+# ============================================================================= #
+# ============================================================================= #
+# ============================================================================= #
+
+def embed_encoded_data_into_DCT(encoded_bits, dct_blocks):
+    data_complete = False; encoded_bits.pos = 0
+    encoded_data_len = bitstring.pack('uint:32', len(encoded_bits))
+    converted_blocks = []
+    for current_dct_block in dct_blocks:
+        for i in range(1, len(current_dct_block)):
+            curr_coeff = np.int32(current_dct_block[i])
+            if (curr_coeff > 1):
+                curr_coeff = np.uint8(current_dct_block[i])
+                if (encoded_bits.pos == len(encoded_bits)): data_complete = True; break
+                pack_coeff = bitstring.pack('uint:8', curr_coeff)
+                if (encoded_data_len.pos <= len(encoded_data_len) - 1): pack_coeff[-1] = encoded_data_len.read(1)
+                else: pack_coeff[-1] = encoded_bits.read(1)
+                # Replace converted coefficient
+                current_dct_block[i] = np.float32(pack_coeff.read('uint:8'))
+        converted_blocks.append(current_dct_block)
+
+    # if not(data_complete): raise ValueError("Data didn't fully embed into cover image!")
+
+    return converted_blocks
+# ============================================================================= #
+# ============================================================================= #
+# ============================================================================= #
+# ============================================================================= #
+
+def encoded_bits_to_array(encoded_bits):
+    bits = bitstring.Bits(encoded_bits)
+    return np.unpackbits(np.frombuffer(bits.tobytes(), dtype=np.uint8))[:len(bits)]
+
+def embed_encoded_data_into_coefficients(encoded_bits, coefficients, key=None, layout_code=None):
+    '''
+    Array version of embed_encoded_data_into_DCT: same 32-bit length header, same (coeff > 1) rule and same
+    block-then-zigzag order, but on a (num_blocks, 64) array of integer-valued coefficients of any magnitude
+    :param key: scatter the bits over the eligible coefficients in a keyed order instead of filling them from the top
+    :param layout_code: 16-bit layout word (stego_layout.layout_code) written after the length header, if any
+    :return: modified copy of the coefficients
+    '''
+    header_and_data = bitstring.pack('uint:32', len(encoded_bits))
+    if layout_code is not None: header_and_data += bitstring.pack('uint:16', layout_code)
+    header_and_data += bitstring.Bits(encoded_bits)
+    bits = encoded_bits_to_array(header_and_data)
+    converted = np.array(coefficients, copy=True)
+    ac_coefficients = converted[:, 1:].reshape(-1)
+    order = keyed.coefficient_order(key, (len(converted), 63))
+    positions = order[ac_coefficients[order] > 1]
+    if len(bits) > len(positions):
+        raise ValueError(f"Insufficient capacity: Need {len(bits)} bits, Available {len(positions)} bits")
+    selected = positions[:len(bits)]
+    values = ac_coefficients[selected].astype(np.int64)
+    ac_coefficients[selected] = (values & ~1) | bits
+    converted[:, 1:] = ac_coefficients.reshape(-1, 63)
+    return converted
+
+def extract_encoded_data_from_coefficients(coefficients, key=None):
+    ac_coefficients = np.asarray(coefficients)[:, 1:].reshape(-1)
+    ac_coefficients = ac_coefficients[keyed.coefficient_order(key, (len(ac_coefficients) // 63, 63))]
+    bits = (ac_coefficients[ac_coefficients > 1].astype(np.int64) & 0x01).astype(np.uint8)
+    return bitstring.BitStream(bytes=np.packbits(bits).tobytes(), length=len(bits))
+
+def decode_extracted_data(recovered_data, layout_code=None):
+    '''
+    Read the 32-bit length header and the payload bytes that follow it, as dct_extract_stego_image.py does
+    :param layout_code: layout word expected after the length header, if any
+    :return: decoded message (undecodable bytes replaced)
+    '''
+    return decode_extracted_bytes(recovered_data, layout_code).decode('utf-8', errors='replace')
+
+def decode_extracted_bytes(recovered_data, layout_code=None):
+    '''
+    Payload bytes behind the length header (and layout word), for binary payloads
+    :param layout_code: layout word expected after the length header, if any
+    :return: payload bytes
+    '''
+    recovered_data.pos = 0
+    data_len = int(recovered_data.read('uint:32') / 8)
+    if layout_code is not None and recovered_data.read('uint:16') != layout_code:
+        raise ValueError("Layout mismatch")
+    extracted_data = bytes()
+    for _ in range(data_len):
+        if recovered_data.len - recovered_data.pos >= 8:
+            extracted_data += struct.pack('>B', recovered_data.read('uint:8'))
+        else:
+            break
+    return extracted_data
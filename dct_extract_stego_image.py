@@ -1,93 +1,145 @@
-'''
-Author: Mason Edgar
-ECE 529 - Algorithm Project
-Image Steganography
-'''
-#------ External Libraries ------#
-import os
-import cv2
-import struct
-import bitstring
-import numpy  as np
-import dct_zigzag as zz
-import dct_data_embedding as stego
-import dct_image_preparation   as img
-import csv
-
-# Folder berisi file stego PNG
-STEGO_FOLDER = "./dct/low"
-OUTPUT_CSV = "./dct/dct_extracted_results_low.csv"
-
-# Pastikan folder output ada
-output_dir = os.path.dirname(OUTPUT_CSV)
-if output_dir and not os.path.exists(output_dir):
-    os.makedirs(output_dir)
-
-# Ambil semua file PNG yang ada _steg pada namanya, urut nama
-stego_files = sorted([f for f in os.listdir(STEGO_FOLDER) if f.lower().endswith('.png') and '_steg' in f])
-
-EXPECTED_MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Curabitur dictum justo eget est maximus, in mollis massa porttitor. Mauris gravida scelerisque orci id eleifend. Sed fermentum orci a velit eleifend laoreet. Cras semper sed nibh eget vehicula. Donec sed eros arcu. Aenean tempor, felis ac dictum tincidunt, odio nulla consectetur dolor, nec molestie lorem felis et sem. Orci varius natoque penatibus et magnis dis parturient montes, nascetur ridiculus mus. Fusce aliquet est venenatis euismod bibendum. Ut ultricies a nulla quis sollicitudin. Nam sagittis venenatis ac."
-
-count = 0
-with open(OUTPUT_CSV, "w", encoding="utf-8", newline='') as out_f:
-    writer = csv.writer(out_f)
-    writer.writerow(["filename", "original size", "stego size", "resolution", "extracted", "expected"])
-    for stego_file in stego_files:
-        try:
-            stego_path = os.path.join(STEGO_FOLDER, stego_file)
-            print(f"Processing: {stego_path}")
-
-            stego_image = cv2.imread(stego_path)
-            if stego_image is None:
-                writer.writerow([stego_file, "[FAILED TO READ IMAGE]", "", "", "", ""])
-                print(f"{stego_file}: [FAILED TO READ IMAGE]")
-                continue
-
-            stego_size = os.path.getsize(stego_path)
-            # Cari file asli (tanpa _steg)
-            original_file = stego_file.replace('_steg', '')
-            original_path = os.path.join(os.path.dirname(STEGO_FOLDER), original_file)
-            if os.path.exists(original_path):
-                ori_size = os.path.getsize(original_path)
-            else:
-                ori_size = "[ORIGINAL NOT FOUND]"
-
-            height, width = stego_image.shape[:2]
-            stego_image_f32 = np.float32(stego_image)
-            stego_image_YCC = img.YCC_Image(cv2.cvtColor(stego_image_f32, cv2.COLOR_BGR2YCrCb))
-
-            # FORWARD DCT STAGE
-            dct_blocks = [cv2.dct(block) for block in stego_image_YCC.channels[0]]  # Only care about Luminance layer
-
-            # QUANTIZATION STAGE
-            dct_quants = [np.around(np.divide(item, img.JPEG_STD_LUM_QUANT_TABLE)) for item in dct_blocks]
-
-            # Sort DCT coefficients by frequency
-            sorted_coefficients = [zz.zigzag(block) for block in dct_quants]
-
-            # DATA EXTRACTION STAGE
-            recovered_data = stego.extract_encoded_data_from_DCT(sorted_coefficients)
-            recovered_data.pos = 0
-
-            try:
-                data_len = int(recovered_data.read('uint:32') / 8)
-                extracted_data = bytes()
-                for _ in range(data_len): 
-                    if recovered_data.len - recovered_data.pos >= 8:
-                        extracted_data += struct.pack('>B', recovered_data.read('uint:8'))
-                    else:
-                        break
-                secret_message = extracted_data.decode('utf-8', errors='replace')
-            except Exception as e:
-                secret_message = f"[EXTRACTION ERROR: {e}]"
-
-            writer.writerow([stego_file, ori_size, stego_size, f"{width}x{height}", secret_message, EXPECTED_MESSAGE])
-            print(f"Extracted from {stego_file}")
-            count+=1
-            print(f"Proses file ke {count}")
-
-        except Exception as e:
-            writer.writerow([stego_file, "ERROR", "", "", "", str(e).replace(',', ';')])
-            print(f"Error processing {stego_file}: {e}")
-
-print(f"All results saved to {OUTPUT_CSV}")
+'''
+Author: Mason Edgar
+ECE 529 - Algorithm Project
+Image Steganography
+'''
+#------ External Libraries ------#
+import os
+import cv2
+import bitstring
+import numpy  as np
+import dct_zigzag as zz
+import dct_data_embedding as stego
+import dct_image_preparation   as img
+import dct_jpeg_domain as jpeg_domain
+import stego_layout
+import results_store
+import csv
+import time
+
+# Folder berisi file stego PNG
+STEGO_FOLDER = "./dct/low"
+OUTPUT_CSV = "./dct/dct_extracted_results_low.csv"
+# Columnar results store the rows are also appended to (None to only write the CSV)
+RESULTS_STORE = results_store.RESULTS_STORE_PATH
+# Read JPEG stego files straight from their quantized coefficients (see dct_run_stego_algorithm.py)
+JPEG_COEFFICIENT_MODE = True
+# Key used when embedding (None for sequential embedding)
+STEGO_KEY = None
+# Channels used when embedding (see DCT_CHANNELS in dct_run_stego_algorithm.py)
+DCT_CHANNELS = ('Y',)
+
+EXPECTED_MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Curabitur dictum justo eget est maximus, in mollis massa porttitor. Mauris gravida scelerisque orci id eleifend. Sed fermentum orci a velit eleifend laoreet. Cras semper sed nibh eget vehicula. Donec sed eros arcu. Aenean tempor, felis ac dictum tincidunt, odio nulla consectetur dolor, nec molestie lorem felis et sem. Orci varius natoque penatibus et magnis dis parturient montes, nascetur ridiculus mus. Fusce aliquet est venenatis euismod bibendum. Ut ultricies a nulla quis sollicitudin. Nam sagittis venenatis ac."
+
+def extract_folder(stego_folder=STEGO_FOLDER, output_csv=OUTPUT_CSV, expected_message=EXPECTED_MESSAGE, key=STEGO_KEY,
+                   channels=DCT_CHANNELS, jpeg_coefficient_mode=JPEG_COEFFICIENT_MODE, results_store_path=RESULTS_STORE):
+    '''
+    Extract the message from every stego image of a folder and write the results CSV (defaults: the constants above)
+    :param channels: channels used when embedding
+    :param results_store_path: columnar results store the rows are also appended to, None to only write the CSV
+    :return: number of processed files
+    '''
+    embed_channel_names = stego_layout.dct_layout(channels)
+    layout_code = stego_layout.dct_layout_code(embed_channel_names)
+    tier = os.path.basename(os.path.normpath(stego_folder))
+
+    # Pastikan folder output ada
+    output_dir = os.path.dirname(output_csv)
+    if output_dir and not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # Ambil semua file PNG (dan JPEG bila jpeg_coefficient_mode) yang ada _steg pada namanya, urut nama
+    image_extensions = ('.png', '.jpg', '.jpeg') if jpeg_coefficient_mode else ('.png',)
+    stego_files = sorted([f for f in os.listdir(stego_folder) if f.lower().endswith(image_extensions) and '_steg' in f])
+
+    count = 0
+    store_rows = []
+    with open(output_csv, "w", encoding="utf-8", newline='') as out_f:
+        writer = csv.writer(out_f)
+        writer.writerow(["filename", "original size", "stego size", "resolution", "extracted", "expected"])
+        for stego_file in stego_files:
+            try:
+                stego_path = os.path.join(stego_folder, stego_file)
+                print(f"Processing: {stego_path}")
+                start_time = time.perf_counter()
+
+                if jpeg_coefficient_mode and stego_file.lower().endswith(('.jpg', '.jpeg')):
+                    with open(stego_path, 'rb') as stego_f:
+                        stego_jpeg = jpeg_domain.read_jpeg_coefficients(stego_f.read())
+                    original_path = os.path.join(os.path.dirname(stego_folder), stego_file.replace('_steg', ''))
+                    ori_size = os.path.getsize(original_path) if os.path.exists(original_path) else "[ORIGINAL NOT FOUND]"
+                    try:
+                        secret_message = stego.decode_extracted_data(jpeg_domain.extract_encoded_data_from_JPEG(stego_jpeg, key=key))
+                    except Exception as e:
+                        secret_message = f"[EXTRACTION ERROR: {e}]"
+                    writer.writerow([stego_file, ori_size, os.path.getsize(stego_path), f"{stego_jpeg.width}x{stego_jpeg.height}", secret_message, expected_message])
+                    store_rows.append({'algorithm': 'dct', 'tier': tier, 'stage': 'extract', 'filename': stego_file, 'layout': 'JPEG Y',
+                                       'width': stego_jpeg.width, 'height': stego_jpeg.height, 'stego_size': os.path.getsize(stego_path),
+                                       'extract_seconds': time.perf_counter() - start_time, 'extracted': secret_message, 'expected': expected_message})
+                    print(f"Extracted from {stego_file}")
+                    count+=1
+                    print(f"Proses file ke {count}")
+                    continue
+
+                stego_image = cv2.imread(stego_path)
+                if stego_image is None:
+                    writer.writerow([stego_file, "[FAILED TO READ IMAGE]", "", "", "", ""])
+                    print(f"{stego_file}: [FAILED TO READ IMAGE]")
+                    continue
+
+                stego_size = os.path.getsize(stego_path)
+                # Cari file asli (tanpa _steg)
+                original_file = stego_file.replace('_steg', '')
+                original_path = os.path.join(os.path.dirname(stego_folder), original_file)
+                if os.path.exists(original_path):
+                    ori_size = os.path.getsize(original_path)
+                else:
+                    ori_size = "[ORIGINAL NOT FOUND]"
+
+                height, width = stego_image.shape[:2]
+                stego_image_f32 = np.float32(stego_image)
+                stego_image_YCC = img.YCC_Image(cv2.cvtColor(stego_image_f32, cv2.COLOR_BGR2YCrCb))
+
+                sorted_coefficients = []
+                for name in embed_channel_names:  # Only care about the embedding layers (Luminance by default)
+                    # FORWARD DCT STAGE
+                    dct_blocks = [cv2.dct(block) for block in stego_image_YCC.channels[stego_layout.CHANNEL_INDEX[name]]]
+
+                    # QUANTIZATION STAGE
+                    dct_quants = [np.around(np.divide(item, img.JPEG_STD_LUM_QUANT_TABLE)) for item in dct_blocks]
+
+                    # Sort DCT coefficients by frequency
+                    sorted_coefficients += [zz.zigzag(block) for block in dct_quants]
+
+                # DATA EXTRACTION STAGE
+                if key is None and layout_code is None:
+                    recovered_data = stego.extract_encoded_data_from_DCT(sorted_coefficients)
+                else:
+                    recovered_data = stego.extract_encoded_data_from_coefficients(np.array(sorted_coefficients), key=key)
+
+                try:
+                    secret_message = stego.decode_extracted_data(recovered_data, layout_code)
+                except Exception as e:
+                    secret_message = f"[EXTRACTION ERROR: {e}]"
+
+                writer.writerow([stego_file, ori_size, stego_size, f"{width}x{height}", secret_message, expected_message])
+                store_rows.append({'algorithm': 'dct', 'tier': tier, 'stage': 'extract', 'filename': stego_file,
+                                   'layout': stego_layout.describe_layout(embed_channel_names), 'width': width, 'height': height,
+                                   'stego_size': stego_size, 'extract_seconds': time.perf_counter() - start_time,
+                                   'extracted': secret_message, 'expected': expected_message})
+                print(f"Extracted from {stego_file}")
+                count+=1
+                print(f"Proses file ke {count}")
+
+            except Exception as e:
+                writer.writerow([stego_file, "ERROR", "", "", "", str(e).replace(',', ';')])
+                store_rows.append({'algorithm': 'dct', 'tier': tier, 'stage': 'extract', 'filename': stego_file, 'error': str(e)})
+                print(f"Error processing {stego_file}: {e}")
+
+    results_store.append_to_results_store(store_rows, results_store_path)
+
+    print(f"All results saved to {output_csv}")
+    return count
+
+if __name__ == "__main__":
+    extract_folder()
@@ -0,0 +1,358 @@
+'''
+Baseline JPEG coefficient domain.
+Reads the quantized DCT blocks straight out of the entropy-coded scan, so JPEG covers can be embedded
+without decoding to pixels, running the forward DCT / IDCT and re-encoding the result as PNG.
+Only baseline (SOF0/SOF1) files with a single scan are supported.
+'''
+#------ External Libraries ------#
+import math
+import numpy as np
+#================================#
+#---------- Source Files --------#
+import dct_data_embedding as stego
+#================================#
+
+# JPEG markers
+EOI  = 0xD9
+SOS  = 0xDA
+DHT  = 0xC4
+DRI  = 0xDD
+SOF0 = 0xC0
+SOF1 = 0xC1
+RST0 = 0xD0
+RST7 = 0xD7
+# SOF markers of the progressive / lossless / arithmetic coded variants we can't handle
+UNSUPPORTED_SOF = (0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF)
+
+BYTE_BITS = [format(value, '08b') for value in range(256)]
+
+# Container for a parsed baseline JPEG
+class JPEG_Coefficients(object):
+    def __init__(self):
+        self.header = b""           # Everything from SOI up to and including the SOS segment
+        self.trailer = b""          # Everything after the entropy-coded scan (normally just EOI)
+        self.height = 0
+        self.width = 0
+        self.components = []        # Frame components, each a dict (id, h, v, dc_table, ac_table, blocks)
+        self.scan_components = []   # Indices into self.components in scan order
+        self.restart_interval = 0
+        self.dc_tables = {}
+        self.ac_tables = {}
+
+#====================================================================================================#
+#====================================================================================================#
+
+def build_huffman_table(counts, symbols):
+    '''
+    Build the canonical Huffman codes of a DHT table
+    :param counts: number of codes of each length 1..16
+    :param symbols: symbols in code order
+    :return: (lookup {(length, code): symbol}, codes {symbol: (code, length)})
+    '''
+    lookup, codes = {}, {}
+    code, k = 0, 0
+    for length in range(1, 17):
+        for _ in range(counts[length - 1]):
+            lookup[(length, code)] = symbols[k]
+            codes[symbols[k]] = (code, length)
+            code += 1; k += 1
+        code <<= 1
+    return lookup, codes
+
+#====================================================================================================#
+#====================================================================================================#
+
+def split_scan_into_intervals(data, start):
+    '''
+    Remove byte stuffing from the entropy-coded scan and split it at the restart markers
+    :param data: whole JPEG file
+    :param start: offset of the first byte after the SOS segment
+    :return: (list of de-stuffed restart intervals, offset of the marker ending the scan)
+    '''
+    intervals, current = [], bytearray()
+    pos = start
+    while True:
+        marker = data.find(b'\xff', pos)
+        if marker < 0 or marker + 1 >= len(data): raise ValueError("Truncated JPEG scan")
+        current += data[pos:marker]
+        following = data[marker + 1]
+        if following == 0x00:
+            current.append(0xFF); pos = marker + 2
+        elif following == 0xFF:
+            pos = marker + 1
+        elif RST0 <= following <= RST7:
+            intervals.append(bytes(current)); current = bytearray(); pos = marker + 2
+        else:
+            intervals.append(bytes(current))
+            return intervals, marker
+
+#====================================================================================================#
+#====================================================================================================#
+
+def mcu_layout(jpeg):
+    '''
+    :return: (number of MCU rows, number of MCU columns, [(component index, block row offset, block col offset)] per MCU)
+    '''
+    if len(jpeg.scan_components) == 1:
+        comp = jpeg.components[jpeg.scan_components[0]]
+        rows, cols = comp['blocks_shape']
+        return rows, cols, [(jpeg.scan_components[0], 0, 0)]
+    h_max = max(comp['h'] for comp in jpeg.components)
+    v_max = max(comp['v'] for comp in jpeg.components)
+    mcu_rows = math.ceil(jpeg.height / (8 * v_max))
+    mcu_cols = math.ceil(jpeg.width / (8 * h_max))
+    units = []
+    for index in jpeg.scan_components:
+        comp = jpeg.components[index]
+        for v in range(comp['v']):
+            for h in range(comp['h']):
+                units.append((index, v, h))
+    return mcu_rows, mcu_cols, units
+
+#====================================================================================================#
+#====================================================================================================#
+
+def decode_scan(jpeg, intervals):
+    mcu_rows, mcu_cols, units = mcu_layout(jpeg)
+    total_mcus = mcu_rows * mcu_cols
+    per_interval = jpeg.restart_interval or total_mcus
+    blocks = {index: [[None] * jpeg.components[index]['blocks_shape'][1] for _ in range(jpeg.components[index]['blocks_shape'][0])]
+              for index in jpeg.scan_components}
+
+    mcu = 0
+    for interval in intervals:
+        if mcu >= total_mcus: break
+        # Pad with 1s so the last codes can be read past the end of the data
+        bits = ''.join(BYTE_BITS[byte] for byte in interval) + '1' * 32
+        pos = 0
+        predictors = {index: 0 for index in jpeg.scan_components}
+        for _ in range(min(per_interval, total_mcus - mcu)):
+            mcu_row, mcu_col = divmod(mcu, mcu_cols)
+            for index, v, h in units:
+                comp = jpeg.components[index]
+                dc_lookup = jpeg.dc_tables[comp['dc_table']][0]
+                ac_lookup = jpeg.ac_tables[comp['ac_table']][0]
+                block = [0] * 64
+
+                # DC coefficient (difference to the previous block of the component)
+                code, length = 0, 0
+                while True:
+                    code = (code << 1) | (bits[pos] == '1'); pos += 1; length += 1
+                    if (length, code) in dc_lookup: size = dc_lookup[(length, code)]; break
+                    if length == 16: raise ValueError("Invalid Huffman code in JPEG scan")
+                diff = 0
+                if size:
+                    diff = int(bits[pos:pos + size], 2); pos += size
+                    if diff < (1 << (size - 1)): diff -= (1 << size) - 1
+                predictors[index] += diff
+                block[0] = predictors[index]
+
+                # AC coefficients, run-length coded in zigzag order
+                k = 1
+                while k < 64:
+                    code, length = 0, 0
+                    while True:
+                        code = (code << 1) | (bits[pos] == '1'); pos += 1; length += 1
+                        if (length, code) in ac_lookup: run_size = ac_lookup[(length, code)]; break
+                        if length == 16: raise ValueError("Invalid Huffman code in JPEG scan")
+                    run, size = run_size >> 4, run_size & 0x0F
+                    if size == 0:
+                        if run == 15: k += 16; continue
+                        break
+                    k += run
+                    if k > 63: raise ValueError("Corrupt AC run in JPEG scan")
+                    value = int(bits[pos:pos + size], 2); pos += size
+                    if value < (1 << (size - 1)): value -= (1 << size) - 1
+                    block[k] = value
+                    k += 1
+
+                row = mcu_row * comp['v'] + v if len(units) > 1 else mcu_row
+                col = mcu_col * comp['h'] + h if len(units) > 1 else mcu_col
+                blocks[index][row][col] = block
+            mcu += 1
+
+    if mcu < total_mcus: raise ValueError("JPEG scan ended before the last MCU")
+    for index in jpeg.scan_components:
+        jpeg.components[index]['blocks'] = np.array(blocks[index], dtype=np.int32)
+
+#====================================================================================================#
+#====================================================================================================#
+
+def read_jpeg_coefficients(jpeg_bytes):
+    '''
+    Parse a baseline JPEG down to its quantized coefficient blocks
+    :param jpeg_bytes: contents of the JPEG file
+    :return: JPEG_Coefficients; each component carries a (block rows, block cols, 64) int32 array in zigzag order
+    '''
+    data = bytes(jpeg_bytes)
+    if data[:2] != b'\xff\xd8': raise ValueError("Not a JPEG file")
+    jpeg = JPEG_Coefficients()
+    pos = 2
+    while True:
+        if pos + 4 > len(data) or data[pos] != 0xFF: raise ValueError("Corrupt JPEG marker structure")
+        marker = data[pos + 1]
+        if marker == 0xFF: pos += 1; continue
+        length = int.from_bytes(data[pos + 2:pos + 4], 'big')
+        segment = data[pos + 4:pos + 2 + length]
+
+        if marker in UNSUPPORTED_SOF:
+            raise ValueError("Only baseline JPEG files are supported")
+        elif marker in (SOF0, SOF1):
+            if segment[0] != 8: raise ValueError("Only 8-bit JPEG files are supported")
+            jpeg.height = int.from_bytes(segment[1:3], 'big')
+            jpeg.width = int.from_bytes(segment[3:5], 'big')
+            for i in range(segment[5]):
+                comp_id, sampling, quant_table = segment[6 + 3 * i:9 + 3 * i]
+                jpeg.components.append({'id': comp_id, 'h': sampling >> 4, 'v': sampling & 0x0F, 'quant_table': quant_table})
+        elif marker == DHT:
+            i = 0
+            while i < len(segment):
+                table_class, table_id = segment[i] >> 4, segment[i] & 0x0F
+                counts = list(segment[i + 1:i + 17])
+                symbols = list(segment[i + 17:i + 17 + sum(counts)])
+                table = build_huffman_table(counts, symbols)
+                if table_class == 0: jpeg.dc_tables[table_id] = table
+                else: jpeg.ac_tables[table_id] = table
+                i += 17 + sum(counts)
+        elif marker == DRI:
+            jpeg.restart_interval = int.from_bytes(segment[0:2], 'big')
+        elif marker == SOS:
+            if not(jpeg.components): raise ValueError("SOS before frame header")
+            for i in range(segment[0]):
+                comp_id, tables = segment[1 + 2 * i:3 + 2 * i]
+                index = [comp['id'] for comp in jpeg.components].index(comp_id)
+                jpeg.components[index]['dc_table'] = tables >> 4
+                jpeg.components[index]['ac_table'] = tables & 0x0F
+                jpeg.scan_components.append(index)
+            if len(jpeg.scan_components) != len(jpeg.components):
+                raise ValueError("Only single-scan baseline JPEG files are supported")
+            jpeg.header = data[:pos + 2 + length]
+            break
+        elif marker == EOI:
+            raise ValueError("JPEG file has no image data")
+        pos += 2 + length
+
+    h_max = max(comp['h'] for comp in jpeg.components)
+    v_max = max(comp['v'] for comp in jpeg.components)
+    for comp in jpeg.components:
+        if len(jpeg.components) == 1:
+            comp['blocks_shape'] = (math.ceil(jpeg.height / 8), math.ceil(jpeg.width / 8))
+        else:
+            comp['blocks_shape'] = (math.ceil(jpeg.height / (8 * v_max)) * comp['v'], math.ceil(jpeg.width / (8 * h_max)) * comp['h'])
+
+    intervals, scan_end = split_scan_into_intervals(data, len(jpeg.header))
+    decode_scan(jpeg, intervals)
+
+    # Anything after the scan has to be the end of the file, a second scan would need progressive handling
+    jpeg.trailer = data[scan_end:]
+    if b'\xff\xda' in jpeg.trailer: raise ValueError("Only single-scan baseline JPEG files are supported")
+    return jpeg
+
+#====================================================================================================#
+#====================================================================================================#
+
+class BitWriter(object):
+    def __init__(self):
+        self.output = bytearray()
+        self.accumulator = 0
+        self.count = 0
+
+    def write(self, value, length):
+        self.accumulator = (self.accumulator << length) | value
+        self.count += length
+        while self.count >= 8:
+            self.count -= 8
+            byte = (self.accumulator >> self.count) & 0xFF
+            self.output.append(byte)
+            if byte == 0xFF: self.output.append(0x00)   # Byte stuffing
+        self.accumulator &= (1 << self.count) - 1
+
+    def flush(self):
+        # Pad the last byte with 1s
+        if self.count: self.write((1 << (8 - self.count)) - 1, 8 - self.count)
+
+#====================================================================================================#
+#====================================================================================================#
+
+def huffman_code(codes, symbol):
+    if symbol not in codes: raise ValueError(f"Symbol {symbol:#04x} is missing from the JPEG Huffman table")
+    return codes[symbol]
+
+def encode_scan(jpeg):
+    mcu_rows, mcu_cols, units = mcu_layout(jpeg)
+    total_mcus = mcu_rows * mcu_cols
+    per_interval = jpeg.restart_interval or total_mcus
+    blocks = {index: jpeg.components[index]['blocks'].tolist() for index in jpeg.scan_components}
+
+    writer = BitWriter()
+    predictors = {index: 0 for index in jpeg.scan_components}
+    for mcu in range(total_mcus):
+        if mcu and not(mcu % per_interval):
+            writer.flush()
+            writer.output += bytes([0xFF, RST0 + ((mcu // per_interval) - 1) % 8])
+            predictors = {index: 0 for index in jpeg.scan_components}
+        mcu_row, mcu_col = divmod(mcu, mcu_cols)
+        for index, v, h in units:
+            comp = jpeg.components[index]
+            dc_codes = jpeg.dc_tables[comp['dc_table']][1]
+            ac_codes = jpeg.ac_tables[comp['ac_table']][1]
+            row = mcu_row * comp['v'] + v if len(units) > 1 else mcu_row
+            col = mcu_col * comp['h'] + h if len(units) > 1 else mcu_col
+            block = blocks[index][row][col]
+
+            diff = block[0] - predictors[index]
+            predictors[index] = block[0]
+            size = abs(diff).bit_length()
+            writer.write(*huffman_code(dc_codes, size))
+            if size: writer.write(diff if diff > 0 else diff + (1 << size) - 1, size)
+
+            run = 0
+            for k in range(1, 64):
+                value = block[k]
+                if value == 0: run += 1; continue
+                while run > 15:
+                    writer.write(*huffman_code(ac_codes, 0xF0)); run -= 16
+                size = abs(value).bit_length()
+                writer.write(*huffman_code(ac_codes, (run << 4) | size))
+                writer.write(value if value > 0 else value + (1 << size) - 1, size)
+                run = 0
+            if run: writer.write(*huffman_code(ac_codes, 0x00))
+    writer.flush()
+    return bytes(writer.output)
+
+def write_jpeg_coefficients(jpeg):
+    '''
+    Re-entropy-code the coefficient blocks with the file's own Huffman tables
+    :return: contents of the new JPEG file
+    '''
+    return jpeg.header + encode_scan(jpeg) + jpeg.trailer
+
+#====================================================================================================#
+#====================================================================================================#
+
+def embed_encoded_data_into_JPEG(encoded_bits, jpeg, key=None):
+    '''
+    Embed into the luminance blocks of a parsed JPEG using the same zigzag/LSB rules as the pixel pipeline
+    :param encoded_bits: payload bits
+    :param jpeg: JPEG_Coefficients from read_jpeg_coefficients (modified in place)
+    :param key: optional key for scattered coefficient selection
+    :return: the same JPEG_Coefficients, ready for write_jpeg_coefficients
+    '''
+    luminance = jpeg.components[0]
+    rows, cols, _ = luminance['blocks'].shape
+    converted = stego.embed_encoded_data_into_coefficients(encoded_bits, luminance['blocks'].reshape(rows * cols, 64), key=key)
+    luminance['blocks'] = converted.reshape(rows, cols, 64)
+    return jpeg
+
+def extract_encoded_data_from_JPEG(jpeg, key=None):
+    return stego.extract_encoded_data_from_coefficients(jpeg.components[0]['blocks'].reshape(-1, 64), key=key)
+
+def JPEG_capacity_bits(jpeg):
+    '''
+    :return: number of payload bits (after the 32-bit header) the luminance blocks can hold
+    '''
+    ac_coefficients = jpeg.components[0]['blocks'][:, :, 1:]
+    return max(int(np.count_nonzero(ac_coefficients > 1)) - 32, 0)
+
+#====================================================================================================#
+#====================================================================================================#
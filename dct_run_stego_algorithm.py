@@ -1,110 +1,226 @@
-#------ External Libraries ------#
-import cv2
-import struct
-import bitstring
-import numpy  as np
-import dct_zigzag as zz
-import os
-import csv
-#================================#
-#---------- Source Files --------#
-import dct_image_preparation as img
-import dct_data_embedding as stego
-#================================#
-
-NUM_CHANNELS = 3
-FOLDER_PATH = "./ori/low"
-OUTPUT_FOLDER = "./dct/low"
-OUTPUT_CSV = "./dct/dct_stego_results_low.csv"
-
-# Pastikan folder output ada
-if not os.path.exists(OUTPUT_FOLDER):
-    os.makedirs(OUTPUT_FOLDER)
-
-# Mendapatkan semua file PNG di folder, urut nama
-image_files = sorted([f for f in os.listdir(FOLDER_PATH) if f.lower().endswith('.png')])
-
-count = 0
-with open(OUTPUT_CSV, "w", encoding="utf-8", newline='') as out_f:
-    writer = csv.writer(out_f)
-    writer.writerow(["filename", "original_size", "stego_size", "resolution", "embedded_message"])
-    for image_file in image_files:
-        try:
-            COVER_IMAGE_FILEPATH = os.path.join(FOLDER_PATH, image_file)
-            filename, ext = os.path.splitext(image_file)
-            STEGO_IMAGE_FILEPATH = os.path.join(OUTPUT_FOLDER, f"{filename}_stego{ext}")
-
-            print(f"Processing: {COVER_IMAGE_FILEPATH}")
-
-            raw_cover_image = cv2.imread(COVER_IMAGE_FILEPATH, flags=cv2.IMREAD_COLOR)
-            if raw_cover_image is None:
-                writer.writerow([image_file, "[FAILED TO READ IMAGE]", "", "", ""])
-                print(f"{image_file}: [FAILED TO READ IMAGE]")
-                continue
-
-            height, width = raw_cover_image.shape[:2]
-            ori_size = os.path.getsize(COVER_IMAGE_FILEPATH)
-            # Force Image Dimensions to be 8x8 compliant
-            pad_height, pad_width = height, width
-            while(pad_height % 8): pad_height += 1
-            while(pad_width  % 8): pad_width  += 1
-            valid_dim = (pad_width, pad_height)
-            padded_image    = cv2.resize(raw_cover_image, valid_dim)
-            cover_image_f32 = np.float32(padded_image)
-            cover_image_YCC = img.YCC_Image(cv2.cvtColor(cover_image_f32, cv2.COLOR_BGR2YCrCb))
-
-            # Placeholder for holding stego image data
-            stego_image = np.empty_like(cover_image_f32)
-            embedded_message = ""
-            for chan_index in range(NUM_CHANNELS):
-                # FORWARD DCT STAGE
-                dct_blocks = [cv2.dct(block) for block in cover_image_YCC.channels[chan_index]]
-
-                # QUANTIZATION STAGE
-                dct_quants = [np.around(np.divide(item, img.JPEG_STD_LUM_QUANT_TABLE)) for item in dct_blocks]
-
-                # Sort DCT coefficients by frequency
-                sorted_coefficients = [zz.zigzag(block) for block in dct_quants]
-
-                array_coefficients = np.array(sorted_coefficients)
-                valid_coefficients = array_coefficients[array_coefficients != 0]
-                print(f"Valid DCT coefficients available: {len(valid_coefficients)}")
-
-                max_capacity_bits = len(valid_coefficients)
-                max_capacity_bytes = max_capacity_bits // 8
-                max_capacity_chars = max_capacity_bytes
-
-                print(f"Maksimum kapasitas penyisipan: {max_capacity_bits} bits ({max_capacity_bytes} bytes, {max_capacity_chars} karakter)")
-
-                if (chan_index == 0):
-                    SECRET_MESSAGE_STRING = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Curabitur dictum justo eget est maximus, in mollis massa porttitor. Mauris gravida scelerisque orci id eleifend. Sed fermentum orci a velit eleifend laoreet. Cras semper sed nibh eget vehicula. Donec sed eros arcu. Aenean tempor, felis ac dictum tincidunt, odio nulla consectetur dolor, nec molestie lorem felis et sem. Orci varius natoque penatibus et magnis dis parturient montes, nascetur ridiculus mus. Fusce aliquet est venenatis euismod bibendum. Ut ultricies a nulla quis sollicitudin. Nam sagittis venenatis ac."
-                    # Potong pesan jika lebih panjang dari kapasitas
-                    max_chars = min(len(SECRET_MESSAGE_STRING), max_capacity_chars)
-                    embedded_message = SECRET_MESSAGE_STRING[:max_chars]
-                    secret_data = ""
-                    for char in embedded_message.encode('ascii'): secret_data += bitstring.pack('uint:8', char)
-                    print("hasil encode: ",secret_data)
-                    print(f"test2 Valid DCT Coefficients Available: {len(sorted_coefficients)}")
-
-                    embedded_dct_blocks   = stego.embed_encoded_data_into_DCT(secret_data, sorted_coefficients)
-                    desorted_coefficients = [zz.inverse_zigzag(block, vmax=8,hmax=8) for block in embedded_dct_blocks]
-                else:
-                    desorted_coefficients = [zz.inverse_zigzag(block, vmax=8,hmax=8) for block in sorted_coefficients]
-                print(f"test2 desorted DCT Coefficients Available: {len(desorted_coefficients)}")
-
-                dct_dequants = [np.multiply(data, img.JPEG_STD_LUM_QUANT_TABLE) for data in desorted_coefficients]
-                idct_blocks = [cv2.idct(block) for block in dct_dequants]
-                stego_image[:,:,chan_index] = np.asarray(img.stitch_8x8_blocks_back_together(cover_image_YCC.width, idct_blocks))
-
-            stego_image_BGR = cv2.cvtColor(stego_image, cv2.COLOR_YCR_CB2BGR)
-            final_stego_image = np.uint8(np.clip(stego_image_BGR, 0, 255))
-            cv2.imwrite(STEGO_IMAGE_FILEPATH, final_stego_image)
-            stego_size = os.path.getsize(STEGO_IMAGE_FILEPATH)
-            # Catat ke csv
-            writer.writerow([image_file, ori_size, stego_size, f"{width}x{height}", embedded_message])
-            print(f"Saved stego image: {STEGO_IMAGE_FILEPATH}\n")
-            count += 1
-            print(f"Processed file: {count}")
-        except Exception as e:
-            print(f"Error processing {image_file}: {e}")
-            writer.writerow([image_file, f"[ERROR: {e}]", "", "", ""])
+#------ External Libraries ------#
+import cv2
+import struct
+import bitstring
+import numpy  as np
+import dct_zigzag as zz
+import os
+import csv
+import time
+import contextlib
+#================================#
+#---------- Source Files --------#
+import dct_image_preparation as img
+import dct_data_embedding as stego
+import dct_verification as verify
+import dct_jpeg_domain as jpeg_domain
+import stego_layout
+import results_store
+#================================#
+
+NUM_CHANNELS = 3
+FOLDER_PATH = "./ori/low"
+OUTPUT_FOLDER = "./dct/low"
+OUTPUT_CSV = "./dct/dct_stego_results_low.csv"
+# Columnar results store the rows are also appended to (None to only write the CSV)
+RESULTS_STORE = results_store.RESULTS_STORE_PATH
+# "fast" re-quantizes only the block rows holding the payload, "full" re-extracts the whole image, None skips it
+VERIFY_MODE = "fast"
+# Embed JPEG covers directly in their quantized coefficients and write a JPEG instead of a PNG
+JPEG_COEFFICIENT_MODE = True
+# Key for scattering the payload over the eligible coefficients; None fills them in order from the top
+STEGO_KEY = None
+# Channels carrying the payload, any of 'Y', 'Cb', 'Cr' (see stego_layout.py). JPEG covers always use Y.
+DCT_CHANNELS = ('Y',)
+# Worker processes splitting one cover into 8-row bands (0 = one per CPU); None runs on one core.
+# Used for the default layout without key; the stego image is identical either way.
+PARALLEL_WORKERS = None
+
+SECRET_MESSAGE_STRING = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Curabitur dictum justo eget est maximus, in mollis massa porttitor. Mauris gravida scelerisque orci id eleifend. Sed fermentum orci a velit eleifend laoreet. Cras semper sed nibh eget vehicula. Donec sed eros arcu. Aenean tempor, felis ac dictum tincidunt, odio nulla consectetur dolor, nec molestie lorem felis et sem. Orci varius natoque penatibus et magnis dis parturient montes, nascetur ridiculus mus. Fusce aliquet est venenatis euismod bibendum. Ut ultricies a nulla quis sollicitudin. Nam sagittis venenatis ac."
+
+def embed_folder(folder_path=FOLDER_PATH, output_folder=OUTPUT_FOLDER, output_csv=OUTPUT_CSV, secret_message=SECRET_MESSAGE_STRING,
+                 verify_mode=VERIFY_MODE, key=STEGO_KEY, channels=DCT_CHANNELS, parallel_workers=PARALLEL_WORKERS,
+                 jpeg_coefficient_mode=JPEG_COEFFICIENT_MODE, results_store_path=RESULTS_STORE):
+    '''
+    Embed the secret message into every cover of a folder and write the summary CSV (defaults: the constants above)
+    :param channels: channels carrying the payload, any of 'Y', 'Cb', 'Cr'
+    :param parallel_workers: worker processes splitting each cover into row bands, None for one core
+    :param results_store_path: columnar results store the rows are also appended to, None to only write the CSV
+    :return: number of processed files
+    '''
+    embed_channel_names = stego_layout.dct_layout(channels)
+    embed_channels = [stego_layout.CHANNEL_INDEX[name] for name in embed_channel_names]
+    # Layout word written after the length header, None for the original Y-only layout
+    layout_code = stego_layout.dct_layout_code(embed_channel_names)
+    tier = os.path.basename(os.path.normpath(folder_path))
+    if jpeg_coefficient_mode and layout_code is not None:
+        print(f"JPEG coefficient mode embeds into Y only: JPEG covers are rejected for {stego_layout.describe_layout(embed_channel_names)}")
+
+    # Pastikan folder output ada
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+
+    # Mendapatkan semua file PNG (dan JPEG bila jpeg_coefficient_mode) di folder, urut nama
+    image_extensions = ('.png', '.jpg', '.jpeg') if jpeg_coefficient_mode else ('.png',)
+    image_files = sorted([f for f in os.listdir(folder_path) if f.lower().endswith(image_extensions)])
+
+    band_pool = None
+    if parallel_workers is not None and key is None and layout_code is None:
+        # Worker processes are started once and split every cover of the folder into row bands
+        import parallel_bands
+        band_pool = parallel_bands.Band_Pool(parallel_workers)
+
+    count = 0
+    store_rows = []
+    with open(output_csv, "w", encoding="utf-8", newline='') as out_f, (band_pool or contextlib.nullcontext()):
+        writer = csv.writer(out_f)
+        writer.writerow(["filename", "original_size", "stego_size", "resolution", "embedded_message", "verified"])
+        for image_file in image_files:
+            band_job = None
+            try:
+                COVER_IMAGE_FILEPATH = os.path.join(folder_path, image_file)
+                filename, ext = os.path.splitext(image_file)
+                STEGO_IMAGE_FILEPATH = os.path.join(output_folder, f"{filename}_stego{ext}")
+
+                print(f"Processing: {COVER_IMAGE_FILEPATH}")
+                start_time = time.perf_counter()
+
+                if jpeg_coefficient_mode and ext.lower() in ('.jpg', '.jpeg'):
+                    if layout_code is not None:
+                        raise ValueError(f"JPEG coefficient mode embeds into Y only, not {stego_layout.describe_layout(embed_channel_names)}")
+                    # Stay in the coefficient domain: no pixel decode, no DCT/IDCT, no PNG re-encode
+                    with open(COVER_IMAGE_FILEPATH, 'rb') as cover_f:
+                        cover_jpeg = jpeg_domain.read_jpeg_coefficients(cover_f.read())
+                    max_capacity_bytes = jpeg_domain.JPEG_capacity_bits(cover_jpeg) // 8
+                    print(f"Maksimum kapasitas penyisipan: {max_capacity_bytes * 8} bits ({max_capacity_bytes} bytes, {max_capacity_bytes} karakter)")
+                    embedded_message = secret_message[:min(len(secret_message), max_capacity_bytes)]
+                    secret_data = bitstring.BitStream()
+                    for char in embedded_message.encode('ascii'): secret_data += bitstring.pack('uint:8', char)
+                    jpeg_domain.embed_encoded_data_into_JPEG(secret_data, cover_jpeg, key=key)
+                    stego_jpeg_bytes = jpeg_domain.write_jpeg_coefficients(cover_jpeg)
+                    with open(STEGO_IMAGE_FILEPATH, 'wb') as stego_f:
+                        stego_f.write(stego_jpeg_bytes)
+                    embed_seconds = time.perf_counter() - start_time
+                    verified = ""
+                    if verify_mode is not None:
+                        # Exact in both modes: the file holds the coefficients themselves
+                        verified = verify.verify_embedded_JPEG(stego_jpeg_bytes, secret_data, key=key)
+                        if not(verified): print(f"Verification failed: {STEGO_IMAGE_FILEPATH}")
+                    stego_size = os.path.getsize(STEGO_IMAGE_FILEPATH)
+                    writer.writerow([image_file, os.path.getsize(COVER_IMAGE_FILEPATH), stego_size, f"{cover_jpeg.width}x{cover_jpeg.height}", embedded_message, verified])
+                    store_rows.append({'algorithm': 'dct', 'tier': tier, 'stage': 'embed', 'filename': image_file, 'layout': 'JPEG Y',
+                                       'width': cover_jpeg.width, 'height': cover_jpeg.height,
+                                       'original_size': os.path.getsize(COVER_IMAGE_FILEPATH), 'stego_size': stego_size,
+                                       'size_increase_pct': results_store.size_increase_pct(os.path.getsize(COVER_IMAGE_FILEPATH), stego_size),
+                                       'capacity_bits': max_capacity_bytes * 8, 'embed_seconds': embed_seconds,
+                                       'verified': verified if verified != "" else None, 'expected': embedded_message})
+                    print(f"Saved stego image: {STEGO_IMAGE_FILEPATH}\n")
+                    count += 1
+                    print(f"Processed file: {count}")
+                    continue
+
+                raw_cover_image = cv2.imread(COVER_IMAGE_FILEPATH, flags=cv2.IMREAD_COLOR)
+                if raw_cover_image is None:
+                    writer.writerow([image_file, "[FAILED TO READ IMAGE]", "", "", "", ""])
+                    print(f"{image_file}: [FAILED TO READ IMAGE]")
+                    continue
+
+                height, width = raw_cover_image.shape[:2]
+                ori_size = os.path.getsize(COVER_IMAGE_FILEPATH)
+                # Force Image Dimensions to be 8x8 compliant
+                pad_height, pad_width = height, width
+                while(pad_height % 8): pad_height += 1
+                while(pad_width  % 8): pad_width  += 1
+                valid_dim = (pad_width, pad_height)
+                padded_image    = cv2.resize(raw_cover_image, valid_dim)
+                if band_pool is not None:
+                    # Forward stage of the row bands runs in the workers, the coefficients stay in shared memory
+                    band_job = parallel_bands.DCT_Band_Job(padded_image, band_pool)
+                    eligible_coefficients = band_job.eligible_coefficients
+                else:
+                    cover_image_f32 = np.float32(padded_image)
+                    cover_image_YCC = img.YCC_Image(cv2.cvtColor(cover_image_f32, cv2.COLOR_BGR2YCrCb))
+
+                    # Placeholder for holding stego image data
+                    stego_image = np.empty_like(cover_image_f32)
+                    sorted_channels = []
+                    for chan_index in range(NUM_CHANNELS):
+                        # FORWARD DCT STAGE
+                        dct_blocks = [cv2.dct(block) for block in cover_image_YCC.channels[chan_index]]
+
+                        # QUANTIZATION STAGE
+                        dct_quants = [np.around(np.divide(item, img.JPEG_STD_LUM_QUANT_TABLE)) for item in dct_blocks]
+
+                        # Sort DCT coefficients by frequency
+                        sorted_channels.append([zz.zigzag(block) for block in dct_quants])
+                    eligible_coefficients = sum(np.count_nonzero(np.array(sorted_channels[chan_index])[:, 1:] > 1) for chan_index in embed_channels)
+
+                # Capacity of the layout: AC coefficients > 1 in the embedding channels, minus the header
+                header_bits = 32 + (stego_layout.LAYOUT_CODE_BITS if layout_code is not None else 0)
+                max_capacity_bits = max(eligible_coefficients - header_bits, 0)
+                max_capacity_bytes = max_capacity_bits // 8
+                max_capacity_chars = max_capacity_bytes
+                print(f"Valid DCT coefficients available ({stego_layout.describe_layout(embed_channel_names)}): {eligible_coefficients}")
+                print(f"Maksimum kapasitas penyisipan: {max_capacity_bits} bits ({max_capacity_bytes} bytes, {max_capacity_chars} karakter)")
+
+                # Potong pesan jika lebih panjang dari kapasitas
+                max_chars = min(len(secret_message), max_capacity_chars)
+                embedded_message = secret_message[:max_chars]
+                secret_data = bitstring.BitStream()
+                for char in embedded_message.encode('ascii'): secret_data += bitstring.pack('uint:8', char)
+
+                if band_job is not None:
+                    # Each band embeds its slice of the payload and runs the inverse stage
+                    final_stego_image = band_job.embed(secret_data)
+                else:
+                    if key is None and layout_code is None:
+                        sorted_channels[0] = stego.embed_encoded_data_into_DCT(secret_data, sorted_channels[0])
+                    else:
+                        # Channels are filled one after the other, in layout order
+                        stacked_coefficients = np.concatenate([np.array(sorted_channels[chan_index]) for chan_index in embed_channels])
+                        embedded_coefficients = stego.embed_encoded_data_into_coefficients(secret_data, stacked_coefficients, key=key, layout_code=layout_code)
+                        offset = 0
+                        for chan_index in embed_channels:
+                            num_blocks = len(sorted_channels[chan_index])
+                            sorted_channels[chan_index] = list(embedded_coefficients[offset:offset + num_blocks])
+                            offset += num_blocks
+
+                    for chan_index in range(NUM_CHANNELS):
+                        desorted_coefficients = [zz.inverse_zigzag(block, vmax=8,hmax=8) for block in sorted_channels[chan_index]]
+                        dct_dequants = [np.multiply(data, img.JPEG_STD_LUM_QUANT_TABLE) for data in desorted_coefficients]
+                        idct_blocks = [cv2.idct(block) for block in dct_dequants]
+                        stego_image[:,:,chan_index] = np.asarray(img.stitch_8x8_blocks_back_together(cover_image_YCC.width, idct_blocks))
+
+                    stego_image_BGR = cv2.cvtColor(stego_image, cv2.COLOR_YCR_CB2BGR)
+                    final_stego_image = np.uint8(np.clip(stego_image_BGR, 0, 255))
+                cv2.imwrite(STEGO_IMAGE_FILEPATH, final_stego_image)
+                embed_seconds = time.perf_counter() - start_time
+                verified = ""
+                if verify_mode is not None:
+                    verified = verify.verify_embedded_data(final_stego_image, secret_data, full=(verify_mode == "full"), key=key, channels=embed_channel_names)
+                    if not(verified): print(f"Verification failed: {STEGO_IMAGE_FILEPATH}")
+                stego_size = os.path.getsize(STEGO_IMAGE_FILEPATH)
+                # Catat ke csv
+                writer.writerow([image_file, ori_size, stego_size, f"{width}x{height}", embedded_message, verified])
+                store_rows.append({'algorithm': 'dct', 'tier': tier, 'stage': 'embed', 'filename': image_file,
+                                   'layout': stego_layout.describe_layout(embed_channel_names), 'width': width, 'height': height,
+                                   'original_size': ori_size, 'stego_size': stego_size,
+                                   'size_increase_pct': results_store.size_increase_pct(ori_size, stego_size),
+                                   'capacity_bits': max_capacity_bits, 'embed_seconds': embed_seconds,
+                                   'verified': verified if verified != "" else None, 'expected': embedded_message})
+                print(f"Saved stego image: {STEGO_IMAGE_FILEPATH}\n")
+                count += 1
+                print(f"Processed file: {count}")
+            except Exception as e:
+                print(f"Error processing {image_file}: {e}")
+                writer.writerow([image_file, f"[ERROR: {e}]", "", "", "", ""])
+                store_rows.append({'algorithm': 'dct', 'tier': tier, 'stage': 'embed', 'filename': image_file, 'error': str(e)})
+            finally:
+                # Shared memory of the cover, also when it failed between the forward stage and embed()
+                if band_job is not None: band_job.close()
+
+    results_store.append_to_results_store(store_rows, results_store_path)
+    return count
+
+if __name__ == "__main__":
+    embed_folder()
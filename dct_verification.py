@@ -0,0 +1,101 @@
+#------ External Libraries ------#
+import cv2
+import bitstring
+import numpy as np
+import dct_zigzag as zz
+#================================#
+#---------- Source Files --------#
+import dct_image_preparation as img
+import dct_data_embedding as stego
+import dct_jpeg_domain as jpeg_domain
+import stego_layout
+#================================#
+
+def expected_embedded_bits(encoded_bits, layout_code=None):
+    '''
+    Build the bit stream written by embed_encoded_data_into_DCT: a 32-bit length header followed by the payload
+    :param encoded_bits: payload bits that were handed to the embedder
+    :param layout_code: layout word written after the length header, if any
+    :return: BitArray with header + payload
+    '''
+    expected_bits = bitstring.BitArray(bitstring.pack('uint:32', len(encoded_bits)))
+    if layout_code is not None: expected_bits += bitstring.pack('uint:16', layout_code)
+    return expected_bits + encoded_bits
+
+#====================================================================================================#
+#====================================================================================================#
+
+def sort_coefficients_of_block_row(stego_image, top, chan_index=0):
+    '''
+    Re-run colour conversion, forward DCT, quantization and zigzag for one 8-pixel high strip of the luminance layer
+    :param stego_image: BGR stego image (height and width are multiples of 8)
+    :param top: first pixel row of the strip
+    :param chan_index: YCrCb plane, 0 is luminance
+    :return: zigzagged coefficients of the blocks in the strip
+    '''
+    strip = np.float32(stego_image[top:top + 8])
+    channel = cv2.cvtColor(strip, cv2.COLOR_BGR2YCrCb)[:, :, chan_index]
+    dct_blocks = [cv2.dct(block) for block in img.split_image_into_8x8_blocks(channel)]
+    dct_quants = [np.around(np.divide(item, img.JPEG_STD_LUM_QUANT_TABLE)) for item in dct_blocks]
+    return [zz.zigzag(block) for block in dct_quants]
+
+def extract_bits_from_block_row(stego_image, top):
+    '''
+    :return: bits recovered from one block row, in the same order as extract_encoded_data_from_DCT
+    '''
+    return bitstring.BitArray(stego.extract_encoded_data_from_DCT(sort_coefficients_of_block_row(stego_image, top)))
+
+#====================================================================================================#
+#====================================================================================================#
+
+def verify_embedded_data(stego_image, encoded_bits, full=False, key=None, channels=('Y',)):
+    '''
+    Check that the payload survives the trip back to 8-bit pixels.
+    Fast mode walks the luminance block rows from the top and stops once the header and payload
+    have been recovered, or at the first strip holding a wrong bit (e.g. a coefficient that no longer
+    satisfies > 1 and shifts every bit after it). Full mode re-extracts every block row.
+    :param stego_image: final uint8 BGR stego image
+    :param encoded_bits: payload bits that were handed to the embedder
+    :param full: re-extract the whole image instead of only the affected block rows
+    :param key: key used for scattered embedding; the bits can then sit in any block row, so every row is checked
+    :param channels: embedding channels; layouts other than Y-only are checked over every row as well
+    :return: True if the recovered bits match the header + payload
+    '''
+    channels = stego_layout.dct_layout(channels)
+    layout_code = stego_layout.dct_layout_code(channels)
+    expected_bits = expected_embedded_bits(encoded_bits, layout_code)
+    height = stego_image.shape[0]
+    if key is not None or layout_code is not None:
+        sorted_coefficients = []
+        for name in channels:
+            for top in range(0, height - (height % 8), 8):
+                sorted_coefficients += sort_coefficients_of_block_row(stego_image, top, stego_layout.CHANNEL_INDEX[name])
+        recovered_bits = stego.extract_encoded_data_from_coefficients(np.array(sorted_coefficients), key=key)
+        return recovered_bits[:len(expected_bits)] == expected_bits
+
+    recovered_bits = bitstring.BitArray()
+    for top in range(0, height - (height % 8), 8):
+        recovered_bits += extract_bits_from_block_row(stego_image, top)
+        checked = min(len(recovered_bits), len(expected_bits))
+        if recovered_bits[:checked] != expected_bits[:checked]: return False
+        if not(full) and checked == len(expected_bits): return True
+    return len(recovered_bits) >= len(expected_bits)
+
+#====================================================================================================#
+#====================================================================================================#
+
+def verify_embedded_JPEG(stego_jpeg_bytes, encoded_bits, key=None):
+    '''
+    Check the payload of a stego JPEG written in the coefficient domain.
+    The quantized coefficients are stored losslessly, so re-parsing the file and extracting is exact.
+    :param stego_jpeg_bytes: contents of the stego JPEG file
+    :param encoded_bits: payload bits that were handed to the embedder
+    :param key: key used for scattered embedding
+    :return: True if the recovered bits match the header + payload
+    '''
+    expected_bits = expected_embedded_bits(encoded_bits)
+    recovered_bits = jpeg_domain.extract_encoded_data_from_JPEG(jpeg_domain.read_jpeg_coefficients(stego_jpeg_bytes), key=key)
+    return recovered_bits[:len(expected_bits)] == expected_bits
+
+#====================================================================================================#
+#====================================================================================================#
@@ -1,278 +1,526 @@
-import numpy as np
-import cv2
-import pywt
-import os
-import pandas as pd
-import re
-
-def text_to_binary(text):
-    """Convert text to binary string with 8 bits per character"""
-    return ''.join(format(ord(char), '08b') for char in text)
-
-def binary_to_text(binary):
-    """Convert binary string to text"""
-    chars = [binary[i:i+8] for i in range(0, len(binary), 8)]
-    try:
-        return ''.join(chr(int(char, 2)) for char in chars if len(char) == 8)
-    except ValueError:
-        return "Error: Non-decodable binary sequence"
-
-def embed_text_in_image(image, text):
-    """Embed text into image using DWT on Cb channel"""
-    ycbcr = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
-    y, cb, cr = cv2.split(ycbcr)
-
-    h, w = cb.shape
-    pad_h = h % 2
-    pad_w = w % 2
-    cb_padded = cv2.copyMakeBorder(cb, 0, pad_h, 0, pad_w, cv2.BORDER_REFLECT)
-
-    coeffs = pywt.dwt2(cb_padded, 'haar')
-    LL, (LH, HL, HH) = coeffs
-
-    binary_text = text_to_binary(text)
-    text_length = len(binary_text)
-    header = format(text_length, '032b')
-    full_data = header + binary_text
-
-    HH_flat = HH.flatten()
-    HL_flat = HL.flatten()
-    
-    available_bits = len(HH_flat) + len(HL_flat)
-    required_bits = len(full_data)
-    
-    if required_bits > available_bits:
-        raise ValueError(f"Insufficient capacity: Need {required_bits} bits, Available {available_bits} bits")
-
-    data_index = 0
-    for i in range(len(HH_flat)):
-        if data_index < len(full_data):
-            HH_flat[i] = (np.int16(HH_flat[i]) & ~1) | int(full_data[data_index])
-            data_index += 1
-    
-    for i in range(len(HL_flat)):
-        if data_index < len(full_data):
-            HL_flat[i] = (np.int16(HL_flat[i]) & ~1) | int(full_data[data_index])
-            data_index += 1
-
-    HH_modified = HH_flat.reshape(HH.shape)
-    HL_modified = HL_flat.reshape(HL.shape)
-    
-    cb_modified_padded = pywt.idwt2((LL, (LH, HL_modified, HH_modified)), 'haar')
-    cb_modified = cb_modified_padded[:h, :w]
-
-    return cv2.cvtColor(cv2.merge([y, cb_modified.astype('uint8'), cr]), cv2.COLOR_YCrCb2BGR)
-
-def extract_text_from_image(image):
-    """Extract text from stego image using DWT"""
-    ycbcr = cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)
-    _, cb, _ = cv2.split(ycbcr)
-
-    h, w = cb.shape
-    pad_h = h % 2
-    pad_w = w % 2
-    cb_padded = cv2.copyMakeBorder(cb, 0, pad_h, 0, pad_w, cv2.BORDER_REFLECT)
-
-    coeffs = pywt.dwt2(cb_padded, 'haar')
-    _, (_, HL, HH) = coeffs
-
-    HH_flat = HH.flatten().astype(np.int16)
-    HL_flat = HL.flatten().astype(np.int16)
-
-    extracted_bits_hh = (HH_flat & 1)
-    extracted_bits_hl = (HL_flat & 1)
-    
-    binary_data = ''.join(map(str, np.concatenate([extracted_bits_hh, extracted_bits_hl])))
-    
-    if len(binary_data) < 32:
-        return "Error: Not enough data to read header"
-        
-    header = binary_data[:32]
-    try:
-        text_length = int(header, 2)
-    except ValueError:
-        return "Error: Invalid header format"
-    
-    if text_length > len(binary_data) - 32:
-        return "Error: Header indicates length larger than available data"
-
-    text_binary = binary_data[32:32 + text_length]
-    return binary_to_text(text_binary)
-
-def embed_text_in_folder(folder_path, text, output_folder, csv_path):
-    """Embeds text in all images in a folder and saves a summary CSV."""
-    if not os.path.exists(output_folder):
-        os.makedirs(output_folder)
-        
-    results = []
-    print("Embedding and verifying text... This may take a moment.")
-    for filename in sorted(os.listdir(folder_path)):
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-            image_path = os.path.join(folder_path, filename)
-            image = cv2.imread(image_path, cv2.IMREAD_COLOR)
-            
-            if image is None:
-                print(f"Error reading {filename}, skipping.")
-                continue
-                
-            try:
-                original_size = os.path.getsize(image_path)
-                h, w, _ = image.shape
-                resolution = f"{w}x{h}"
-
-                stego_image = embed_text_in_image(image, text)
-                name, ext = os.path.splitext(filename)
-                out_filename = f"{name}_stego{ext}"
-                out_path = os.path.join(output_folder, out_filename)
-                cv2.imwrite(out_path, stego_image)
-                
-                verified_text = extract_text_from_image(stego_image)
-                sanitized_verified_text = sanitize_text(verified_text)
-                stego_size = os.path.getsize(out_path)
-
-                results.append({
-                    'filename': filename,
-                    'original size': original_size,
-                    'stego size': stego_size,
-                    'resolution': resolution,
-                    'embedded_message': sanitized_verified_text
-                })
-                print(f"Embedded and verified text in {filename}, saved as {out_path}")
-
-            except Exception as e:
-                print(f"Error processing {filename}: {str(e)}")
-
-    df = pd.DataFrame(results)
-    df.to_csv(csv_path, index=False, encoding='utf-8')
-    print(f"\nEmbedding summary saved to {csv_path}")
-
-def sanitize_text(text):
-    if not isinstance(text, str):
-        return ""
-    return re.sub(r'[^\x00-\x7F]', '', text)
-
-def extract_texts_from_folder(folder_path, csv_path, expected_text):
-    """Extracts texts from all images in a folder and saves results to a CSV."""
-    results = []
-    
-    for filename in sorted(os.listdir(folder_path)):
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
-            image_path = os.path.join(folder_path, filename)
-            image = cv2.imread(image_path, cv2.IMREAD_COLOR)
-
-            if image is None:
-                print(f"Error reading {filename}, skipping.")
-                results.append({'filename': filename, 'stego size': 'N/A', 'resolution': 'N/A', 'extracted': 'Error reading image', 'expected': expected_text})
-                continue
-
-            try:
-                stego_size = os.path.getsize(image_path)
-                h, w, _ = image.shape
-                resolution = f"{w}x{h}"
-                extracted = extract_text_from_image(image)
-                sanitized = sanitize_text(extracted)
-                results.append({'filename': filename, 'stego size': stego_size, 'resolution': resolution, 'extracted': sanitized, 'expected': expected_text})
-            except Exception as e:
-                results.append({'filename': filename, 'stego size': 'N/A', 'resolution': 'N/A', 'extracted': f"Error: {str(e)}", 'expected': expected_text})
-
-    df = pd.DataFrame(results)
-    df.to_csv(csv_path, index=False, encoding='utf-8')
-    print(f"\nExtraction complete. Results saved to {csv_path}")
-
-# --- FUNGSI MAIN DIUBAH UNTUK MENYESUAIKAN OUTPUT SATU FILE ---
-def main():
-    print("\nDWT-Based Steganography System")
-    print("-----------------------------")
-    
-    while True:
-        choice = input("\nChoose an option:\n1. Embed text into a single image\n2. Extract text from a single image\n3. Embed text into a folder of images (and create CSV)\n4. Extract text from a folder of images (and create CSV)\n5. Exit\n> ")
-        
-        if choice == '1': # Embed untuk satu file
-            try:
-                image_path = input("Enter cover image path: ")
-                text = input("Enter text to embed: ")
-                output_path = input("Enter output path for stego image (e.g., stego.png): ")
-
-                image = cv2.imread(image_path, cv2.IMREAD_COLOR)
-                if image is None:
-                    print("Error: Could not read image file.")
-                    continue
-                
-                # Mengumpulkan informasi seperti pada fungsi folder
-                original_size = os.path.getsize(image_path)
-                h, w, _ = image.shape
-                resolution = f"{w}x{h}"
-
-                stego_image = embed_text_in_image(image, text)
-                cv2.imwrite(output_path, stego_image)
-
-                stego_size = os.path.getsize(output_path)
-                verified_text = sanitize_text(extract_text_from_image(stego_image))
-
-                # Mencetak ringkasan langsung ke terminal
-                print("\n--- Embed Summary ---")
-                print(f"  Original Filename : {os.path.basename(image_path)}")
-                print(f"  Original Size     : {original_size} bytes")
-                print(f"  Stego Size        : {stego_size} bytes")
-                print(f"  Resolution        : {resolution}")
-                print(f"  Verified Message  : {verified_text}")
-                print(f"  Stego image saved to '{output_path}'")
-                print("---------------------")
-
-            except Exception as e:
-                print(f"An error occurred: {str(e)}")
-        
-        elif choice == '2': # Extract untuk satu file
-            try:
-                stego_path = input("Enter stego image path: ")
-                expected_text = input("Enter the expected text for comparison: ")
-
-                stego_image = cv2.imread(stego_path, cv2.IMREAD_COLOR)
-                if stego_image is None:
-                    print("Error: Could not read stego image.")
-                    continue
-
-                # Mengumpulkan informasi seperti pada fungsi folder
-                stego_size = os.path.getsize(stego_path)
-                h, w, _ = stego_image.shape
-                resolution = f"{w}x{h}"
-                extracted_text = sanitize_text(extract_text_from_image(stego_image))
-                
-                # Mencetak ringkasan langsung ke terminal
-                print("\n--- Extract Summary ---")
-                print(f"  Stego Filename    : {os.path.basename(stego_path)}")
-                print(f"  Stego Size        : {stego_size} bytes")
-                print(f"  Resolution        : {resolution}")
-                print(f"  Extracted Text    : {extracted_text}")
-                print(f"  Expected Text     : {expected_text}")
-                if extracted_text == expected_text:
-                    print("  Status              : ✅ Match")
-                else:
-                    print("  Status              : ❌ No Match")
-                print("-----------------------")
-
-            except Exception as e:
-                print(f"An error occurred: {str(e)}")
-        
-        elif choice == '3': # Embed untuk folder (tetap menghasilkan CSV)
-            folder_path = input("Enter folder path containing original images: ")
-            text = input("Enter text to embed: ")
-            output_folder = input("Enter output folder for stego images: ")
-            csv_path = input("Enter output CSV file path for the summary (e.g., embed_summary.csv): ")
-            embed_text_in_folder(folder_path, text, output_folder, csv_path)
-
-        elif choice == '4': # Extract untuk folder (tetap menghasilkan CSV)
-            folder_path = input("Enter folder path containing stego images: ")
-            expected_text_input = input("Enter the expected text for comparison: ")
-            csv_path = input("Enter output CSV file path for extraction results (e.g., extract_results.csv): ")
-            extract_texts_from_folder(folder_path, csv_path, expected_text_input)
-
-        elif choice == '5':
-            print("Exiting program...")
-            break
-        
-        else:
-            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
-
-if __name__ == "__main__":
+import numpy as np
+import cv2
+import pywt
+import os
+import pandas as pd
+import re
+import time
+import keyed_permutation as keyed
+import stego_layout
+import results_store
+
+# Float error allowed when the keyed embedder floors the reconstructed whole and half pixel values
+RECONSTRUCTION_TOLERANCE = 1e-6
+# Keyed embeds tried before giving up on the stego image giving back every written value
+KEYED_EMBED_ATTEMPTS = 12
+# Values tried in turn for a keyed coefficient the color conversion clips, relative to the nearest one with the bit
+SAME_LSB_OFFSETS = np.array([0, -2, 2, -4, 4], dtype=np.int16)
+
+def text_to_binary(text):
+    """Convert text to binary string with 8 bits per character"""
+    return ''.join(format(ord(char), '08b') for char in text)
+
+def binary_to_text(binary):
+    """Convert binary string to text"""
+    chars = [binary[i:i+8] for i in range(0, len(binary), 8)]
+    try:
+        return ''.join(chr(int(char, 2)) for char in chars if len(char) == 8)
+    except ValueError:
+        return "Error: Non-decodable binary sequence"
+
+def pad_for_levels(plane, levels):
+    """Reflect-pad a plane so every decomposition level has even dimensions"""
+    h, w = plane.shape
+    multiple = 2 ** levels
+    return cv2.copyMakeBorder(plane, 0, (-h) % multiple, 0, (-w) % multiple, cv2.BORDER_REFLECT)
+
+def decompose_channels(image, channels, subbands, levels):
+    """Split the image into YCrCb planes and decompose the chosen ones.
+
+    Returns the planes, the wavelet decomposition per channel and the detail arrays that carry
+    the payload, in fill order: channel, then level (finest first), then subband.
+    """
+    planes = list(cv2.split(cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)))
+    decompositions = {}
+    targets = []
+    for name in channels:
+        coeffs = pywt.wavedec2(pad_for_levels(planes[stego_layout.CHANNEL_INDEX[name]], levels), 'haar', level=levels)
+        decompositions[name] = coeffs
+        for LH, HL, HH in reversed(coeffs[1:]):
+            named = {'LH': LH, 'HL': HL, 'HH': HH}
+            targets += [named[subband] for subband in subbands]
+    return planes, decompositions, targets
+
+def round_trip_mask(targets, image_shape, subbands, levels):
+    """Coefficients whose LSB survives the inverse transform and the uint8 conversion.
+
+    Those are the finest-level ones that are whole numbers (their 2x2 pixel group has an even sum, which an
+    LSB change keeps) outside the reflect padding, which is cropped off the stego image.
+    """
+    h, w = image_shape[:2]
+    masks = []
+    for index, target in enumerate(targets):
+        mask = np.zeros(target.shape, dtype=bool)
+        if index // len(subbands) % levels == 0:
+            mask[:h // 2, :w // 2] = (np.abs(target - np.rint(target)) < 0.25)[:h // 2, :w // 2]
+        masks.append(mask.flatten())
+    return np.concatenate(masks)
+
+def fill_order(targets, key, image_shape, subbands, levels):
+    """Coefficient positions in fill order: all of them from the top without a key, the round-trip ones scattered with one"""
+    order = keyed.coefficient_order(key, (sum(target.size for target in targets),))
+    if key is None:
+        return order
+    # Filtering the full permutation keeps a coefficient that drops out of the mask from reshuffling the rest
+    return order[round_trip_mask(targets, image_shape, subbands, levels)[order]]
+
+def pixel_groups(targets, subbands, levels):
+    """Finest-level 2x2 pixel group of every coefficient position (-1 for coarser levels)"""
+    groups = []
+    for index, target in enumerate(targets):
+        if index // len(subbands) % levels == 0:
+            channel = index // (len(subbands) * levels)
+            groups.append(channel * target.size + np.arange(target.size))
+        else:
+            groups.append(np.full(target.size, -1))
+    return np.concatenate(groups)
+
+def settle_color_round_trip(image):
+    """Cover pixels that convert to YCrCb and back unchanged, so pixel groups the payload leaves alone stay put on extraction"""
+    for _ in range(KEYED_EMBED_ATTEMPTS):
+        settled = cv2.cvtColor(cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb), cv2.COLOR_YCrCb2BGR)
+        if np.array_equal(settled, image):
+            break
+        image = settled
+    return image
+
+def settle_keyed_values(embed_values, coefficients, mask, groups, bits, key, channels, subbands, levels):
+    """Embed keyed bits, moving coefficients the BGR conversion clips or rounds away to other values with the same LSB.
+
+    A saturated pixel group can't take the LSB change in one direction, but a value two steps the other way
+    carries the same bit. Groups are re-checked until the stego image gives back every written value and mask.
+    A group no value settles (near-black or near-white pixels) keeps its cover values: the cover round-trips,
+    so its mask and the extractor's fill order stay the same and only the bits it should carry may flip.
+    :param embed_values: function of (selected positions, values) returning the stego image
+    """
+    permutation = keyed.coefficient_order(key, (len(coefficients),))
+    selected = permutation[mask[permutation]][:len(bits)]
+    original_values = coefficient_values(coefficients, key)
+    nearest_values = (original_values[selected] & ~1) | bits
+    candidates = np.zeros(len(coefficients), dtype=np.int64)
+    frozen = np.zeros(len(coefficients), dtype=bool)
+    for _ in range(KEYED_EMBED_ATTEMPTS):
+        values = np.where(frozen[selected], original_values[selected], nearest_values + SAME_LSB_OFFSETS[candidates[selected]])
+        stego_image = embed_values(selected, values)
+        _, _, stego_targets = decompose_channels(stego_image, channels, subbands, levels)
+        stego_coefficients = np.concatenate([target.flatten() for target in stego_targets])
+        stego_mask = round_trip_mask(stego_targets, stego_image.shape, subbands, levels)
+        expected_values = original_values.copy()
+        expected_values[selected] = values
+        changed = (stego_mask != mask) | (mask & (coefficient_values(stego_coefficients, key) != expected_values))
+        if not changed.any():
+            break
+        failing = np.isin(groups, groups[changed])
+        frozen |= failing & (candidates == len(SAME_LSB_OFFSETS) - 1)
+        candidates[failing & ~frozen] += 1
+    return stego_image
+
+def coefficient_values(coefficients, key):
+    """Integer coefficients carrying the LSBs: truncated like the original embedder, rounded for keyed orders"""
+    if key is None:
+        return coefficients.astype(np.int16)
+    return np.rint(coefficients).astype(np.int16)
+
+def plane_to_uint8(plane, key):
+    """Reconstructed plane as pixels: truncated like the original embedder, floored with a tolerance for keyed orders"""
+    if key is None:
+        return plane.astype('uint8')
+    return np.uint8(np.clip(np.floor(plane + RECONSTRUCTION_TOLERANCE), 0, 255))
+
+def dwt_capacity_bits(image_shape, channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+    """Number of coefficients (header included) a layout offers for an image of the given shape"""
+    channels, subbands, levels = stego_layout.dwt_layout(channels, subbands, levels)
+    h, w = image_shape[:2]
+    multiple = 2 ** levels
+    padded_h, padded_w = h + (-h) % multiple, w + (-w) % multiple
+    per_channel = sum((padded_h >> level) * (padded_w >> level) for level in range(1, levels + 1)) * len(subbands)
+    return per_channel * len(channels)
+
+def fill_capacity_bits(image, key=None, channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+    """Coefficients (header included) in the fill order of an image: all of them without a key, the round-trip ones with one"""
+    channels, subbands, levels = stego_layout.dwt_layout(channels, subbands, levels)
+    if key is None:
+        return dwt_capacity_bits(image.shape, channels, subbands, levels)
+    _, _, targets = decompose_channels(settle_color_round_trip(image), channels, subbands, levels)
+    return int(np.count_nonzero(round_trip_mask(targets, image.shape, subbands, levels)))
+
+def layout_header(channels, subbands, levels):
+    """Layout word written after the length header; the original Cb HH/HL layout has none"""
+    if (channels, subbands, levels) == stego_layout.DWT_DEFAULT_LAYOUT:
+        return ''
+    return format(stego_layout.layout_code(channels, subbands, levels), f'0{stego_layout.LAYOUT_CODE_BITS}b')
+
+def embed_text_in_image(image, text, key=None, channels=('Cb',), subbands=('HH', 'HL'), levels=1, workers=None):
+    """Embed text into image using DWT on Cb channel (or the given channels/subbands/levels, scattered with a key)"""
+    channels, subbands, levels = stego_layout.dwt_layout(channels, subbands, levels)
+    if workers is not None and key is None and (channels, subbands, levels) == stego_layout.DWT_DEFAULT_LAYOUT:
+        # Split the image into row bands transformed by worker processes (same output as below);
+        # workers is a process count or a parallel_bands.Band_Pool kept open by the caller
+        full_data = format(len(text_to_binary(text)), '032b') + text_to_binary(text)
+        available_bits = dwt_capacity_bits(image.shape, channels, subbands, levels)
+        if len(full_data) > available_bits:
+            raise ValueError(f"Insufficient capacity: Need {len(full_data)} bits, Available {available_bits} bits")
+        bits = np.frombuffer(full_data.encode('ascii'), dtype=np.uint8) - ord('0')
+        import parallel_bands
+        if isinstance(workers, parallel_bands.Band_Pool):
+            return parallel_bands.embed_dwt_parallel(image, bits, workers)
+        with parallel_bands.Band_Pool(workers) as band_pool:
+            return parallel_bands.embed_dwt_parallel(image, bits, band_pool)
+    if key is not None:
+        image = settle_color_round_trip(image)
+    planes, decompositions, targets = decompose_channels(image, channels, subbands, levels)
+    h, w = planes[0].shape
+
+    binary_text = text_to_binary(text)
+    text_length = len(binary_text)
+    header = format(text_length, '032b') + layout_header(channels, subbands, levels)
+    full_data = header + binary_text
+
+    coefficients = np.concatenate([target.flatten() for target in targets])
+
+    # Fill order (HH then HL for the default layout), from the top or in the keyed order
+    order = fill_order(targets, key, image.shape, subbands, levels)
+    available_bits = len(order)
+    required_bits = len(full_data)
+    
+    if required_bits > available_bits:
+        raise ValueError(f"Insufficient capacity: Need {required_bits} bits, Available {available_bits} bits")
+
+    selected = order[:required_bits]
+    bits = np.frombuffer(full_data.encode('ascii'), dtype=np.uint8) - ord('0')
+
+    def embed_values(selected, values):
+        modified = coefficients.copy()
+        modified[selected] = values
+
+        offset = 0
+        for target in targets:
+            target[...] = modified[offset:offset + target.size].reshape(target.shape)
+            offset += target.size
+
+        stego_planes = list(planes)
+        for name in channels:
+            plane_modified = pywt.waverec2(decompositions[name], 'haar')[:h, :w]
+            stego_planes[stego_layout.CHANNEL_INDEX[name]] = plane_to_uint8(plane_modified, key)
+
+        return cv2.cvtColor(cv2.merge(stego_planes), cv2.COLOR_YCrCb2BGR)
+
+    if key is None:
+        return embed_values(selected, (coefficients[selected].astype(np.int16) & ~1) | bits)
+    return settle_keyed_values(embed_values, coefficients, round_trip_mask(targets, image.shape, subbands, levels),
+                               pixel_groups(targets, subbands, levels), bits, key, channels, subbands, levels)
+
+def extract_bits_from_image(image, key=None, channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+    """LSBs of the layout's coefficients in fill order"""
+    channels, subbands, levels = stego_layout.dwt_layout(channels, subbands, levels)
+    _, _, targets = decompose_channels(image, channels, subbands, levels)
+    extracted_bits = np.concatenate([coefficient_values(target.flatten(), key) & 1 for target in targets])
+    return extracted_bits[fill_order(targets, key, image.shape, subbands, levels)]
+
+def extract_text_from_image(image, key=None, channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+    """Extract text from stego image using DWT"""
+    channels, subbands, levels = stego_layout.dwt_layout(channels, subbands, levels)
+    extracted_bits = extract_bits_from_image(image, key, channels, subbands, levels)
+    binary_data = ''.join(map(str, extracted_bits))
+    
+    if len(binary_data) < 32:
+        return "Error: Not enough data to read header"
+        
+    header = binary_data[:32]
+    try:
+        text_length = int(header, 2)
+    except ValueError:
+        return "Error: Invalid header format"
+
+    expected_layout = layout_header(channels, subbands, levels)
+    if binary_data[32:32 + len(expected_layout)] != expected_layout:
+        return "Error: Layout mismatch"
+    start = 32 + len(expected_layout)
+    
+    if text_length > len(binary_data) - start:
+        return "Error: Header indicates length larger than available data"
+
+    text_binary = binary_data[start:start + text_length]
+    return binary_to_text(text_binary)
+
+def verify_text_in_image(stego_image, text, key=None, channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+    """Check the embedded bits by transforming only the rows of the Cb channel that hold them"""
+    channels, subbands, levels = stego_layout.dwt_layout(channels, subbands, levels)
+    full_data = format(len(text_to_binary(text)), '032b') + layout_header(channels, subbands, levels) + text_to_binary(text)
+    expected_bits = np.array([int(bit) for bit in full_data], dtype=np.int16)
+
+    # Other layouts and keyed orders spread the bits over whole channels
+    if key is not None or (channels, subbands, levels) != stego_layout.DWT_DEFAULT_LAYOUT:
+        recovered_bits = extract_bits_from_image(stego_image, key, channels, subbands, levels)
+        if len(recovered_bits) < len(expected_bits):
+            return False
+        return bool(np.array_equal(recovered_bits[:len(expected_bits)], expected_bits))
+
+    h, w = stego_image.shape[:2]
+    half_w = (w + w % 2) // 2
+    hh_size = half_w * ((h + h % 2) // 2)
+
+    # HH is filled row by row first, so a payload that fits in HH only touches the top rows of Cb.
+    # Haar works on independent 2x2 pixel groups, so transforming just those rows gives the same coefficients.
+    if len(expected_bits) <= hh_size:
+        rows = min(h, 2 * -(-len(expected_bits) // half_w))
+    else:
+        rows = h
+
+    ycbcr = cv2.cvtColor(stego_image[:rows], cv2.COLOR_BGR2YCrCb)
+    _, cb, _ = cv2.split(ycbcr)
+    cb_padded = cv2.copyMakeBorder(cb, 0, rows % 2, 0, w % 2, cv2.BORDER_REFLECT)
+
+    _, (_, HL, HH) = pywt.dwt2(cb_padded, 'haar')
+    recovered_bits = np.concatenate([HH.flatten().astype(np.int16) & 1, HL.flatten().astype(np.int16) & 1])
+
+    if len(recovered_bits) < len(expected_bits):
+        return False
+    return bool(np.array_equal(recovered_bits[:len(expected_bits)], expected_bits))
+
+def embed_text_in_folder(folder_path, text, output_folder, csv_path, verify='fast', key=None, layout=stego_layout.DWT_DEFAULT_LAYOUT,
+                         store_path=results_store.RESULTS_STORE_PATH, workers=None):
+    """Embeds text in all images in a folder and saves a summary CSV.
+
+    verify: 'fast' checks only the Cb rows holding the payload, 'full' re-extracts the whole image, None skips it.
+    key: optional key for scattered coefficient selection (the same key is needed to extract).
+    layout: (channels, subbands, levels) carrying the payload.
+    store_path: columnar results store the rows are also appended to (None to only write the CSV).
+    workers: worker processes splitting each image into row bands, started once for the folder (None to embed on one core).
+    """
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+        
+    results = []
+    store_rows = []
+    tier = os.path.basename(os.path.normpath(folder_path))
+    print("Embedding and verifying text... This may take a moment.")
+    band_pool = None
+    if workers is not None and key is None and stego_layout.dwt_layout(*layout) == stego_layout.DWT_DEFAULT_LAYOUT:
+        # Worker processes are started once and split every image of the folder into row bands
+        import parallel_bands
+        band_pool = parallel_bands.Band_Pool(workers)
+    try:
+        for filename in sorted(os.listdir(folder_path)):
+            if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
+                image_path = os.path.join(folder_path, filename)
+                image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+            
+                if image is None:
+                    print(f"Error reading {filename}, skipping.")
+                    continue
+                
+                try:
+                    original_size = os.path.getsize(image_path)
+                    h, w, _ = image.shape
+                    resolution = f"{w}x{h}"
+
+                    capacity_bits = fill_capacity_bits(image, key, *layout)
+                    start_time = time.perf_counter()
+                    stego_image = embed_text_in_image(image, text, key, *layout, workers=band_pool)
+                    name, ext = os.path.splitext(filename)
+                    out_filename = f"{name}_stego{ext}"
+                    out_path = os.path.join(output_folder, out_filename)
+                    cv2.imwrite(out_path, stego_image)
+                    embed_seconds = time.perf_counter() - start_time
+                
+                    if verify == 'full':
+                        verified = sanitize_text(extract_text_from_image(stego_image, key, *layout)) == sanitize_text(text)
+                    elif verify == 'fast':
+                        verified = verify_text_in_image(stego_image, text, key, *layout)
+                    else:
+                        verified = None
+                    stego_size = os.path.getsize(out_path)
+
+                    results.append({
+                        'filename': filename,
+                        'original size': original_size,
+                        'stego size': stego_size,
+                        'resolution': resolution,
+                        'layout': stego_layout.describe_layout(*stego_layout.dwt_layout(*layout)),
+                        'capacity bits': capacity_bits,
+                        'embedded_message': sanitize_text(text),
+                        'verified': verified
+                    })
+                    store_rows.append({
+                        'algorithm': 'dwt', 'tier': tier, 'stage': 'embed', 'filename': filename,
+                        'layout': stego_layout.describe_layout(*stego_layout.dwt_layout(*layout)), 'width': w, 'height': h,
+                        'original_size': original_size, 'stego_size': stego_size,
+                        'size_increase_pct': results_store.size_increase_pct(original_size, stego_size),
+                        'capacity_bits': capacity_bits, 'embed_seconds': embed_seconds, 'verified': verified, 'expected': text
+                    })
+                    if verified is None:
+                        print(f"Embedded text in {filename}, saved as {out_path}")
+                    elif verified:
+                        print(f"Embedded and verified text in {filename}, saved as {out_path}")
+                    else:
+                        print(f"Verification failed for {filename}, saved as {out_path}")
+
+                except Exception as e:
+                    print(f"Error processing {filename}: {str(e)}")
+                    store_rows.append({'algorithm': 'dwt', 'tier': tier, 'stage': 'embed', 'filename': filename, 'error': str(e)})
+    finally:
+        if band_pool is not None:
+            band_pool.close()
+
+    df = pd.DataFrame(results)
+    df.to_csv(csv_path, index=False, encoding='utf-8')
+    print(f"\nEmbedding summary saved to {csv_path}")
+    results_store.append_to_results_store(store_rows, store_path)
+
+def sanitize_text(text):
+    if not isinstance(text, str):
+        return ""
+    return re.sub(r'[^\x00-\x7F]', '', text)
+
+def extract_texts_from_folder(folder_path, csv_path, expected_text, key=None, layout=stego_layout.DWT_DEFAULT_LAYOUT,
+                              store_path=results_store.RESULTS_STORE_PATH):
+    """Extracts texts from all images in a folder and saves results to a CSV."""
+    results = []
+    store_rows = []
+    tier = os.path.basename(os.path.normpath(folder_path))
+    
+    for filename in sorted(os.listdir(folder_path)):
+        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.tiff')):
+            image_path = os.path.join(folder_path, filename)
+            image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+
+            if image is None:
+                print(f"Error reading {filename}, skipping.")
+                results.append({'filename': filename, 'stego size': 'N/A', 'resolution': 'N/A', 'extracted': 'Error reading image', 'expected': expected_text})
+                continue
+
+            try:
+                stego_size = os.path.getsize(image_path)
+                h, w, _ = image.shape
+                resolution = f"{w}x{h}"
+                start_time = time.perf_counter()
+                extracted = extract_text_from_image(image, key, *layout)
+                extract_seconds = time.perf_counter() - start_time
+                sanitized = sanitize_text(extracted)
+                results.append({'filename': filename, 'stego size': stego_size, 'resolution': resolution, 'extracted': sanitized, 'expected': expected_text})
+                store_rows.append({
+                    'algorithm': 'dwt', 'tier': tier, 'stage': 'extract', 'filename': filename,
+                    'layout': stego_layout.describe_layout(*stego_layout.dwt_layout(*layout)), 'width': w, 'height': h,
+                    'stego_size': stego_size, 'extract_seconds': extract_seconds, 'extracted': sanitized, 'expected': expected_text
+                })
+            except Exception as e:
+                results.append({'filename': filename, 'stego size': 'N/A', 'resolution': 'N/A', 'extracted': f"Error: {str(e)}", 'expected': expected_text})
+                store_rows.append({'algorithm': 'dwt', 'tier': tier, 'stage': 'extract', 'filename': filename, 'error': str(e)})
+
+    df = pd.DataFrame(results)
+    df.to_csv(csv_path, index=False, encoding='utf-8')
+    print(f"\nExtraction complete. Results saved to {csv_path}")
+    results_store.append_to_results_store(store_rows, store_path)
+
+# --- FUNGSI MAIN DIUBAH UNTUK MENYESUAIKAN OUTPUT SATU FILE ---
+def main():
+    print("\nDWT-Based Steganography System")
+    print("-----------------------------")
+    
+    while True:
+        choice = input("\nChoose an option:\n1. Embed text into a single image\n2. Extract text from a single image\n3. Embed text into a folder of images (and create CSV)\n4. Extract text from a folder of images (and create CSV)\n5. Exit\n> ")
+        
+        if choice == '1': # Embed untuk satu file
+            try:
+                image_path = input("Enter cover image path: ")
+                text = input("Enter text to embed: ")
+                output_path = input("Enter output path for stego image (e.g., stego.png): ")
+                key = input("Enter key (leave empty for sequential embedding): ") or None
+
+                image = cv2.imread(image_path, cv2.IMREAD_COLOR)
+                if image is None:
+                    print("Error: Could not read image file.")
+                    continue
+                
+                # Mengumpulkan informasi seperti pada fungsi folder
+                original_size = os.path.getsize(image_path)
+                h, w, _ = image.shape
+                resolution = f"{w}x{h}"
+
+                stego_image = embed_text_in_image(image, text, key)
+                cv2.imwrite(output_path, stego_image)
+
+                stego_size = os.path.getsize(output_path)
+                verified_text = sanitize_text(extract_text_from_image(stego_image, key))
+
+                # Mencetak ringkasan langsung ke terminal
+                print("\n--- Embed Summary ---")
+                print(f"  Original Filename : {os.path.basename(image_path)}")
+                print(f"  Original Size     : {original_size} bytes")
+                print(f"  Stego Size        : {stego_size} bytes")
+                print(f"  Resolution        : {resolution}")
+                print(f"  Verified Message  : {verified_text}")
+                print(f"  Stego image saved to '{output_path}'")
+                print("---------------------")
+
+            except Exception as e:
+                print(f"An error occurred: {str(e)}")
+        
+        elif choice == '2': # Extract untuk satu file
+            try:
+                stego_path = input("Enter stego image path: ")
+                expected_text = input("Enter the expected text for comparison: ")
+                key = input("Enter key (leave empty for sequential embedding): ") or None
+
+                stego_image = cv2.imread(stego_path, cv2.IMREAD_COLOR)
+                if stego_image is None:
+                    print("Error: Could not read stego image.")
+                    continue
+
+                # Mengumpulkan informasi seperti pada fungsi folder
+                stego_size = os.path.getsize(stego_path)
+                h, w, _ = stego_image.shape
+                resolution = f"{w}x{h}"
+                extracted_text = sanitize_text(extract_text_from_image(stego_image, key))
+                
+                # Mencetak ringkasan langsung ke terminal
+                print("\n--- Extract Summary ---")
+                print(f"  Stego Filename    : {os.path.basename(stego_path)}")
+                print(f"  Stego Size        : {stego_size} bytes")
+                print(f"  Resolution        : {resolution}")
+                print(f"  Extracted Text    : {extracted_text}")
+                print(f"  Expected Text     : {expected_text}")
+                if extracted_text == expected_text:
+                    print("  Status              : ✅ Match")
+                else:
+                    print("  Status              : ❌ No Match")
+                print("-----------------------")
+
+            except Exception as e:
+                print(f"An error occurred: {str(e)}")
+        
+        elif choice == '3': # Embed untuk folder (tetap menghasilkan CSV)
+            folder_path = input("Enter folder path containing original images: ")
+            text = input("Enter text to embed: ")
+            output_folder = input("Enter output folder for stego images: ")
+            csv_path = input("Enter output CSV file path for the summary (e.g., embed_summary.csv): ")
+            key = input("Enter key (leave empty for sequential embedding): ") or None
+            embed_text_in_folder(folder_path, text, output_folder, csv_path, key=key)
+
+        elif choice == '4': # Extract untuk folder (tetap menghasilkan CSV)
+            folder_path = input("Enter folder path containing stego images: ")
+            expected_text_input = input("Enter the expected text for comparison: ")
+            csv_path = input("Enter output CSV file path for extraction results (e.g., extract_results.csv): ")
+            key = input("Enter key (leave empty for sequential embedding): ") or None
+            extract_texts_from_folder(folder_path, csv_path, expected_text_input, key)
+
+        elif choice == '5':
+            print("Exiting program...")
+            break
+        
+        else:
+            print("Invalid choice. Please enter 1, 2, 3, 4, or 5.")
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,247 @@
+"""One cover, many payloads: transform the cover once, then embed each payload with a vectorized scatter.
+
+A cover object keeps the quantized coefficients (DCT) or the wavelet decomposition (DWT), the eligible
+positions in fill order and the cover's own reconstruction. Each payload only sets LSBs and redoes the
+inverse transform where it has to: the 8x8 blocks it touched for DCT, the payload channels for DWT.
+Output is identical to dct_run_stego_algorithm.py / dwt.embed_text_in_image for the same message.
+"""
+import os
+
+import numpy as np
+import cv2
+import pywt
+import bitstring
+
+import dct_zigzag as zz
+import dct_image_preparation as img
+import dct_data_embedding as stego
+import dct_verification as verify_dct
+import dct_jpeg_domain as jpeg_domain
+import keyed_permutation as keyed
+import stego_layout
+import dwt
+
+NUM_CHANNELS = 3
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+# Zigzag scan as index tables: zigzag(block) == block.reshape(-1)[ZIGZAG_ORDER], inverse_zigzag(v) == v[INVERSE_ZIGZAG_ORDER]
+ZIGZAG_ORDER = zz.zigzag(np.arange(64).reshape(8, 8)).astype(np.intp)
+INVERSE_ZIGZAG_ORDER = zz.inverse_zigzag(np.arange(64), vmax=8, hmax=8).astype(np.intp)
+
+def text_to_encoded_bits(text):
+    """Payload bits of a message, as the DCT runner builds them"""
+    return bitstring.BitStream(bytes=text.encode('utf-8'))
+
+def inverse_block(sorted_block):
+    '''
+    Inverse zigzag, dequantization and IDCT of one block, as in dct_run_stego_algorithm.py
+    :param sorted_block: 64 zigzagged quantized coefficients
+    :return: 8x8 pixel block
+    '''
+    return cv2.idct(np.multiply(sorted_block[INVERSE_ZIGZAG_ORDER], img.JPEG_STD_LUM_QUANT_TABLE))
+
+def sorted_channel_coefficients(image_YCC, chan_index):
+    '''
+    Forward DCT, quantization and zigzag of one channel, as in dct_run_stego_algorithm.py
+    :param image_YCC: YCC_Image of an 8x8-compliant image
+    :return: (num_blocks, 64) array of quantized coefficients
+    '''
+    dct_quants = np.array([np.around(np.divide(cv2.dct(block), img.JPEG_STD_LUM_QUANT_TABLE)) for block in image_YCC.channels[chan_index]])
+    return dct_quants.reshape(len(dct_quants), 64)[:, ZIGZAG_ORDER].astype(np.float64)
+
+def recovered_coefficient_data(image, key=None, channels=('Y',)):
+    '''
+    Extraction side of DCT_Cover: LSBs of the eligible coefficients of an 8x8-compliant stego image
+    :return: BitStream for stego.decode_extracted_data / decode_extracted_bytes
+    '''
+    image_YCC = img.YCC_Image(cv2.cvtColor(np.float32(image), cv2.COLOR_BGR2YCrCb))
+    coefficients = np.concatenate([sorted_channel_coefficients(image_YCC, stego_layout.CHANNEL_INDEX[name]) for name in stego_layout.dct_layout(channels)])
+    return stego.extract_encoded_data_from_coefficients(coefficients, key)
+
+class DCT_Cover(object):
+    """Forward DCT state of one cover, reused for every payload embedded into it"""
+    def __init__(self, raw_cover_image, key=None, channels=('Y',)):
+        height, width = raw_cover_image.shape[:2]
+        # Force Image Dimensions to be 8x8 compliant
+        padded_image = cv2.resize(raw_cover_image, (width + (-width) % 8, height + (-height) % 8))
+        cover_image_YCC = img.YCC_Image(cv2.cvtColor(np.float32(padded_image), cv2.COLOR_BGR2YCrCb))
+        self.width, self.height = cover_image_YCC.width, cover_image_YCC.height
+        self.blocks_per_row = self.width // 8
+        self.key = key
+        self.channel_names = stego_layout.dct_layout(channels)
+        self.layout_code = stego_layout.dct_layout_code(self.channel_names)
+
+        sorted_channels = []
+        self.cover_ycc = np.empty((self.height, self.width, NUM_CHANNELS), dtype=np.float32)
+        for chan_index in range(NUM_CHANNELS):
+            sorted_channels.append(sorted_channel_coefficients(cover_image_YCC, chan_index))
+            self.cover_ycc[:, :, chan_index] = np.asarray(img.stitch_8x8_blocks_back_together(self.width, [inverse_block(block) for block in sorted_channels[-1]]))
+
+        # Payload channels stacked in fill order, and their eligible AC positions (value > 1) in embedding order
+        self.embed_channels = [stego_layout.CHANNEL_INDEX[name] for name in self.channel_names]
+        self.coefficients = np.concatenate([sorted_channels[chan_index] for chan_index in self.embed_channels])
+        ac_coefficients = self.coefficients[:, 1:].reshape(-1)
+        order = keyed.coefficient_order(key, (len(self.coefficients), 63))
+        self.positions = order[ac_coefficients[order] > 1]
+        self.cleared_values = ac_coefficients[self.positions].astype(np.int64) & ~1
+        self.header_bits = 32 + (stego_layout.LAYOUT_CODE_BITS if self.layout_code is not None else 0)
+
+    @property
+    def capacity_bits(self):
+        """Payload bits that fit after the header"""
+        return max(len(self.positions) - self.header_bits, 0)
+
+    def embed(self, encoded_bits):
+        '''
+        Embed one payload behind the usual length header (and layout word)
+        :param encoded_bits: payload bits (see text_to_encoded_bits)
+        :return: BGR uint8 stego image at the 8x8-compliant size
+        '''
+        header_and_data = bitstring.pack('uint:32', len(encoded_bits))
+        if self.layout_code is not None: header_and_data += bitstring.pack('uint:16', self.layout_code)
+        bits = stego.encoded_bits_to_array(header_and_data + bitstring.Bits(encoded_bits))
+        if len(bits) > len(self.positions):
+            raise ValueError(f"Insufficient capacity: Need {len(bits)} bits, Available {len(self.positions)} bits")
+
+        selected = self.positions[:len(bits)]
+        block_indices = selected // 63
+        touched_blocks = np.unique(block_indices)
+        modified_blocks = self.coefficients[touched_blocks]
+        modified_blocks[np.searchsorted(touched_blocks, block_indices), selected % 63 + 1] = self.cleared_values[:len(bits)] | bits
+
+        # Only the touched blocks differ from the cover's reconstruction
+        stego_ycc = self.cover_ycc.copy()
+        blocks_per_channel = len(self.coefficients) // len(self.embed_channels)
+        for block_index, sorted_block in zip(touched_blocks, modified_blocks):
+            chan_index = self.embed_channels[block_index // blocks_per_channel]
+            row, col = divmod(int(block_index % blocks_per_channel), self.blocks_per_row)
+            stego_ycc[row * 8:row * 8 + 8, col * 8:col * 8 + 8, chan_index] = inverse_block(sorted_block)
+
+        stego_image_BGR = cv2.cvtColor(stego_ycc, cv2.COLOR_YCR_CB2BGR)
+        return np.uint8(np.clip(stego_image_BGR, 0, 255))
+
+class DWT_Cover(object):
+    """Wavelet decomposition of one cover, reused for every payload embedded into it"""
+    def __init__(self, image, key=None, channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+        self.layout = stego_layout.dwt_layout(channels, subbands, levels)
+        if key is not None:
+            image = dwt.settle_color_round_trip(image)
+        self.planes, self.decompositions, self.targets = dwt.decompose_channels(image, *self.layout)
+        self.key = key
+        self.height, self.width = self.planes[0].shape
+        self.coefficients = np.concatenate([target.flatten() for target in self.targets])
+        self.order = dwt.fill_order(self.targets, key, image.shape, *self.layout[1:])
+        self.cleared_values = dwt.coefficient_values(self.coefficients[self.order], key) & ~1
+        if key is not None:
+            self.mask = dwt.round_trip_mask(self.targets, image.shape, *self.layout[1:])
+            self.groups = dwt.pixel_groups(self.targets, *self.layout[1:])
+        self.header = dwt.layout_header(*self.layout)
+
+    @property
+    def capacity_bits(self):
+        """Payload bits that fit after the header"""
+        return max(len(self.order) - 32 - len(self.header), 0)
+
+    def embed(self, text):
+        """Embed one message the way dwt.embed_text_in_image does; returns the BGR stego image"""
+        binary_text = dwt.text_to_binary(text)
+        full_data = format(len(binary_text), '032b') + self.header + binary_text
+        if len(full_data) > len(self.order):
+            raise ValueError(f"Insufficient capacity: Need {len(full_data)} bits, Available {len(self.order)} bits")
+
+        bits = np.frombuffer(full_data.encode('ascii'), dtype=np.uint8) - ord('0')
+        if self.key is None:
+            return self.embed_values(self.order[:len(bits)], self.cleared_values[:len(bits)] | bits)
+        return dwt.settle_keyed_values(self.embed_values, self.coefficients, self.mask, self.groups, bits, self.key, *self.layout)
+
+    def embed_values(self, selected, values):
+        coefficients = self.coefficients.copy()
+        coefficients[selected] = values
+
+        # The cached decomposition is overwritten completely for every payload
+        offset = 0
+        for target in self.targets:
+            target[...] = coefficients[offset:offset + target.size].reshape(target.shape)
+            offset += target.size
+
+        planes = list(self.planes)
+        for name in self.layout[0]:
+            plane_modified = pywt.waverec2(self.decompositions[name], 'haar')[:self.height, :self.width]
+            planes[stego_layout.CHANNEL_INDEX[name]] = dwt.plane_to_uint8(plane_modified, self.key)
+        return cv2.cvtColor(cv2.merge(planes), cv2.COLOR_YCrCb2BGR)
+
+def fan_out_to_folder(cover_path, messages, output_folder, method='dct', key=None, **layout):
+    '''
+    Embed every message into the same cover and write <name>_stego_<index>.png files
+    :param layout: channels for dct; channels, subbands, levels for dwt
+    :return: list of written paths
+    '''
+    raw_cover_image = cv2.imread(cover_path, flags=cv2.IMREAD_COLOR)
+    if raw_cover_image is None:
+        raise ValueError(f"Failed to read {cover_path}")
+    if method == 'dct':
+        cover = DCT_Cover(raw_cover_image, key, **layout)
+        embed = lambda message: cover.embed(text_to_encoded_bits(message))
+    else:
+        cover = DWT_Cover(raw_cover_image, key, **layout)
+        embed = cover.embed
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    name = os.path.splitext(os.path.basename(cover_path))[0]
+    paths = []
+    for index, message in enumerate(messages):
+        paths.append(os.path.join(output_folder, f"{name}_stego_{index}.png"))
+        cv2.imwrite(paths[-1], embed(message))
+    return paths
+
+def decode_image(data):
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+def stego_file_name(name, ext):
+    stem = os.path.splitext(name)[0]
+    return f"{stem}_stego{ext}"
+
+def embed_cover_bytes(name, data, message, method, key, verify, layout):
+    '''
+    Embed into one encoded cover file (an archive member or a file read from a folder)
+    :return: stego file name, stego bytes, width, height, capacity bits, embedded message, verified
+    '''
+    if method == 'dct' and name.lower().endswith(JPEG_EXTENSIONS):
+        # Coefficient domain, as dct_run_stego_algorithm.py does for JPEG covers (always Y)
+        if stego_layout.dct_layout(**layout) != stego_layout.DCT_DEFAULT_CHANNELS:
+            raise ValueError(f"JPEG coefficient mode embeds into Y only, not {stego_layout.describe_layout(stego_layout.dct_layout(**layout))}")
+        cover_jpeg = jpeg_domain.read_jpeg_coefficients(data)
+        capacity_bits = jpeg_domain.JPEG_capacity_bits(cover_jpeg)
+        embedded_message = message[:capacity_bits // 8]
+        secret_data = text_to_encoded_bits(embedded_message)
+        jpeg_domain.embed_encoded_data_into_JPEG(secret_data, cover_jpeg, key=key)
+        stego_bytes = jpeg_domain.write_jpeg_coefficients(cover_jpeg)
+        verified = None if verify is None else verify_dct.verify_embedded_JPEG(stego_bytes, secret_data, key=key)
+        return stego_file_name(name, os.path.splitext(name)[1]), stego_bytes, cover_jpeg.width, cover_jpeg.height, capacity_bits, embedded_message, verified
+
+    image = decode_image(data)
+    if image is None:
+        raise ValueError("Failed to decode image")
+    height, width = image.shape[:2]
+    if method == 'dct':
+        cover = DCT_Cover(image, key, **layout)
+        # Truncate the message to the capacity, like the DCT runner
+        embedded_message = message[:cover.capacity_bits // 8]
+        secret_data = text_to_encoded_bits(embedded_message)
+        stego_image = cover.embed(secret_data)
+        verified = None
+        if verify is not None:
+            verified = verify_dct.verify_embedded_data(stego_image, secret_data, full=(verify == 'full'), key=key, channels=cover.channel_names)
+    else:
+        cover = DWT_Cover(image, key, **layout)
+        embedded_message = message
+        stego_image = cover.embed(message)
+        if verify == 'full':
+            verified = dwt.sanitize_text(dwt.extract_text_from_image(stego_image, key, *cover.layout)) == dwt.sanitize_text(message)
+        elif verify == 'fast':
+            verified = dwt.verify_text_in_image(stego_image, message, key, *cover.layout)
+        else:
+            verified = None
+    success, encoded = cv2.imencode('.png', stego_image)
+    if not success:
+        raise ValueError("Failed to encode stego image")
+    return stego_file_name(name, '.png'), encoded.tobytes(), width, height, cover.capacity_bits, embedded_message, verified
@@ -0,0 +1,27 @@
+#------ External Libraries ------#
+import hashlib
+from functools import lru_cache
+import numpy as np
+#================================#
+
+# Number of (key, shape) permutations kept in memory. Batch runs over one folder usually see a
+# handful of distinct image sizes, so this keeps every permutation hot after the first image.
+PERMUTATION_CACHE_SIZE = 64
+
+def key_to_seed(key):
+    """Derive a 128-bit seed from a text key"""
+    return int.from_bytes(hashlib.sha256(str(key).encode('utf-8')).digest()[:16], 'big')
+
+@lru_cache(maxsize=PERMUTATION_CACHE_SIZE)
+def keyed_permutation(key, shape):
+    """Seeded permutation of every coefficient position of an array of the given shape (read-only, cached)"""
+    rng = np.random.default_rng(key_to_seed(key))
+    permutation = rng.permutation(int(np.prod(shape)))
+    permutation.setflags(write=False)
+    return permutation
+
+def coefficient_order(key, shape):
+    """Order in which coefficient positions are filled: sequential without a key, scattered with one"""
+    if key is None:
+        return np.arange(int(np.prod(shape)))
+    return keyed_permutation(key, tuple(shape))
@@ -0,0 +1,230 @@
+"""Intra-image parallelism: one cover is split into row bands that worker processes transform and embed.
+
+Pixels and coefficients live in multiprocessing.shared_memory buffers; workers only receive row ranges and
+their slice of the payload bits. Bands are aligned to the transform (8 rows for DCT blocks, 2 rows for Haar),
+so each worker computes exactly the coefficients the serial code computes for those rows. Payload bits are
+handed out from a prefix sum of the per-band capacity, which gives the same fill order as the serial embedders.
+Only the sequential default layouts are supported (DCT Y, DWT Cb HH+HL level 1, no key).
+A Band_Pool is opened once per folder; each task names the buffers of its cover, which the worker attaches on first use.
+"""
+import os
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+import cv2
+import pywt
+import bitstring
+
+import dct_zigzag as zz
+import dct_image_preparation as img
+import dct_data_embedding as stego
+
+DCT_BAND_ROWS = 8
+DWT_BAND_ROWS = 2
+# More bands than workers, so a slow band does not hold up the whole image
+BANDS_PER_WORKER = 4
+
+# Arrays attached by each worker process, by buffer name, and the shared memory behind them
+_buffers = {}
+_handles = {}
+
+class SharedBuffers(object):
+    """Named numpy arrays backed by shared memory; workers attach them through their specs"""
+    def __init__(self):
+        self.handles = []
+        self.arrays = {}
+        self.specs = {}
+
+    def create(self, name, shape, dtype):
+        dtype = np.dtype(dtype)
+        handle = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * dtype.itemsize, 1))
+        self.handles.append(handle)
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=handle.buf)
+        self.specs[name] = (handle.name, tuple(shape), dtype.str)
+        return self.arrays[name]
+
+    def close(self):
+        self.arrays.clear()
+        for handle in self.handles:
+            handle.close()
+            handle.unlink()
+        self.handles = []
+
+def attach_buffers(specs):
+    """Map the parent's shared buffers into this worker, dropping those of the previous cover"""
+    for name, (shm_name, shape, dtype) in specs.items():
+        if name in _handles and _handles[name].name == shm_name:
+            continue
+        handle = shared_memory.SharedMemory(name=shm_name)
+        _buffers[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=handle.buf)
+        if name in _handles:
+            _handles[name].close()
+        _handles[name] = handle
+
+def run_band(function, specs, *args):
+    """Worker entry point: attach the cover's buffers, then run one band"""
+    attach_buffers(specs)
+    return function(*args)
+
+def band_ranges(height, alignment, num_bands):
+    """Split rows [0, height) into at most num_bands (top, bottom) ranges whose tops are multiples of alignment"""
+    units = -(-height // alignment)
+    num_bands = max(1, min(num_bands, units))
+    edges = [(units * index // num_bands) * alignment for index in range(num_bands + 1)]
+    return [(top, min(bottom, height)) for top, bottom in zip(edges[:-1], edges[1:]) if top < bottom]
+
+def assign_bit_ranges(capacities, total_bits, start=0):
+    """(start, stop) range of the payload for each band, filling bands in order"""
+    ends = np.minimum(np.cumsum(capacities) + start, start + total_bits)
+    begins = np.concatenate([[start], ends[:-1]])
+    return [(int(begin), int(end)) for begin, end in zip(begins, ends)]
+
+class Band_Pool(object):
+    """Worker processes shared by every cover of a folder; use as a context manager or close() it"""
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = multiprocessing.Pool(self.workers)
+
+    def starmap(self, function, buffers, band_args):
+        """Run function over the bands of one cover whose arrays are in buffers"""
+        return self.pool.starmap(run_band, [(function, buffers.specs) + tuple(args) for args in band_args])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+#---------------------------------------- DCT ----------------------------------------#
+
+def dct_forward_band(top, bottom):
+    """Forward DCT, quantization and zigzag of all channels of a band; returns its Y capacity"""
+    ycc = _buffers['ycc']
+    coefficients = _buffers['coefficients']
+    blocks_per_row = ycc.shape[1] // 8
+    first, last = top // 8 * blocks_per_row, bottom // 8 * blocks_per_row
+    for chan_index in range(ycc.shape[2]):
+        dct_blocks = [cv2.dct(block) for block in img.split_image_into_8x8_blocks(ycc[top:bottom, :, chan_index])]
+        for index, block in enumerate(dct_blocks):
+            coefficients[chan_index, first + index] = zz.zigzag(np.around(np.divide(block, img.JPEG_STD_LUM_QUANT_TABLE)))
+    return int(np.count_nonzero(coefficients[0, first:last, 1:] > 1))
+
+def dct_inverse_band(top, bottom, bits):
+    """Embed the band's share of the payload into its Y AC coefficients, then inverse-transform all channels"""
+    coefficients = _buffers['coefficients']
+    stego_ycc = _buffers['stego']
+    width = stego_ycc.shape[1]
+    first, last = top // 8 * (width // 8), bottom // 8 * (width // 8)
+    if len(bits):
+        ac_coefficients = coefficients[0, first:last, 1:].reshape(-1)
+        positions = np.flatnonzero(ac_coefficients > 1)[:len(bits)]
+        ac_coefficients[positions] = (ac_coefficients[positions].astype(np.int64) & ~1) | bits
+        coefficients[0, first:last, 1:] = ac_coefficients.reshape(-1, 63)
+    for chan_index in range(stego_ycc.shape[2]):
+        desorted_coefficients = [zz.inverse_zigzag(block, vmax=8, hmax=8) for block in coefficients[chan_index, first:last]]
+        dct_dequants = [np.multiply(data, img.JPEG_STD_LUM_QUANT_TABLE) for data in desorted_coefficients]
+        idct_blocks = [cv2.idct(block) for block in dct_dequants]
+        stego_ycc[top:bottom, :, chan_index] = np.asarray(img.stitch_8x8_blocks_back_together(width, idct_blocks))
+    return bottom - top
+
+class DCT_Band_Job(object):
+    """
+    Parallel version of the pixel-domain DCT pipeline in dct_run_stego_algorithm.py for one 8x8-compliant cover.
+    Creating the job runs the forward stage and sets eligible_coefficients; embed() finishes the image.
+    The job owns the cover's shared memory: close() it (or use it as a context manager) once the image is done.
+    """
+    def __init__(self, padded_image, band_pool):
+        self.buffers = SharedBuffers()
+        self.band_pool = band_pool
+        try:
+            height, width = padded_image.shape[:2]
+            self.buffers.create('ycc', (height, width, 3), np.float32)[...] = cv2.cvtColor(np.float32(padded_image), cv2.COLOR_BGR2YCrCb)
+            self.buffers.create('coefficients', (3, (height // 8) * (width // 8), 64), np.float64)
+            self.buffers.create('stego', (height, width, 3), np.float32)
+            self.bands = band_ranges(height, DCT_BAND_ROWS, band_pool.workers * BANDS_PER_WORKER)
+            self.capacities = band_pool.starmap(dct_forward_band, self.buffers, self.bands)
+        except BaseException:
+            self.close()
+            raise
+        self.eligible_coefficients = sum(self.capacities)
+
+    def embed(self, encoded_bits):
+        '''
+        Embed behind the 32-bit length header, like embed_encoded_data_into_DCT, and return the BGR uint8 stego image
+        :param encoded_bits: payload bits
+        :return: stego image, identical to the serial pipeline's
+        '''
+        bits = stego.encoded_bits_to_array(bitstring.pack('uint:32', len(encoded_bits)) + bitstring.Bits(encoded_bits))
+        if len(bits) > self.eligible_coefficients:
+            raise ValueError(f"Insufficient capacity: Need {len(bits)} bits, Available {self.eligible_coefficients} bits")
+        ranges = assign_bit_ranges(self.capacities, len(bits))
+        self.band_pool.starmap(dct_inverse_band, self.buffers, [(top, bottom, bits[start:stop]) for (top, bottom), (start, stop) in zip(self.bands, ranges)])
+        stego_image_BGR = cv2.cvtColor(self.buffers.arrays['stego'], cv2.COLOR_YCR_CB2BGR)
+        return np.uint8(np.clip(stego_image_BGR, 0, 255))
+
+    def close(self):
+        self.buffers.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+#---------------------------------------- DWT ----------------------------------------#
+
+def dwt_forward_band(top, bottom):
+    """Haar transform of a band of the Cb plane; returns its (HH, HL) capacity"""
+    plane = _buffers['plane']
+    rows = bottom - top
+    band = cv2.copyMakeBorder(plane[top:bottom], 0, rows % 2, 0, plane.shape[1] % 2, cv2.BORDER_REFLECT)
+    LL, (LH, HL, HH) = pywt.dwt2(band, 'haar')
+    for name, subband in (('LL', LL), ('LH', LH), ('HL', HL), ('HH', HH)):
+        _buffers[name][top // 2:top // 2 + len(subband)] = subband
+    return HH.size, HL.size
+
+def dwt_inverse_band(top, bottom, hh_bits, hl_bits):
+    """Set the band's HH then HL bits and write the reconstructed rows of the Cb plane"""
+    plane = _buffers['stego_plane']
+    first, last = top // 2, (bottom + 1) // 2
+    for name, bits in (('HH', hh_bits), ('HL', hl_bits)):
+        if len(bits):
+            coefficients = _buffers[name][first:last].reshape(-1)
+            coefficients[:len(bits)] = (coefficients[:len(bits)].astype(np.int16) & ~1) | bits
+    subbands = [_buffers[name][first:last] for name in ('LL', 'LH', 'HL', 'HH')]
+    plane_modified = pywt.idwt2((subbands[0], tuple(subbands[1:])), 'haar')[:bottom - top, :plane.shape[1]]
+    plane[top:bottom] = plane_modified.astype('uint8')
+    return bottom - top
+
+def embed_dwt_parallel(image, bits, band_pool):
+    """Parallel dwt.embed_text_in_image for the default layout; bits are the header and text bits (uint8 0/1)"""
+    buffers = SharedBuffers()
+    try:
+        planes = list(cv2.split(cv2.cvtColor(image, cv2.COLOR_BGR2YCrCb)))
+        h, w = planes[1].shape
+        half_h, half_w = (h + 1) // 2, (w + 1) // 2
+        buffers.create('plane', (h, w), np.uint8)[...] = planes[1]
+        for name in ('LL', 'LH', 'HL', 'HH'):
+            buffers.create(name, (half_h, half_w), np.float64)
+        buffers.create('stego_plane', (h, w), np.uint8)
+        bands = band_ranges(h, DWT_BAND_ROWS, band_pool.workers * BANDS_PER_WORKER)
+        capacities = np.array(band_pool.starmap(dwt_forward_band, buffers, bands)).reshape(-1, 2)
+        hh_size = int(capacities[:, 0].sum())
+        if len(bits) > hh_size + int(capacities[:, 1].sum()):
+            raise ValueError(f"Insufficient capacity: Need {len(bits)} bits, Available {int(capacities.sum())} bits")
+        # HH is filled completely before HL
+        hh_ranges = assign_bit_ranges(capacities[:, 0], min(len(bits), hh_size))
+        hl_ranges = assign_bit_ranges(capacities[:, 1], max(len(bits) - hh_size, 0), start=hh_size)
+        band_pool.starmap(dwt_inverse_band, buffers, [(top, bottom, bits[hh_start:hh_stop], bits[hl_start:hl_stop])
+                                                      for (top, bottom), (hh_start, hh_stop), (hl_start, hl_stop) in zip(bands, hh_ranges, hl_ranges)])
+        planes[1] = buffers.arrays['stego_plane'].copy()
+        return cv2.cvtColor(cv2.merge(planes), cv2.COLOR_YCrCb2BGR)
+    finally:
+        buffers.close()
@@ -0,0 +1,238 @@
+"""Cheap pre-screen that routes each cover to DCT, DWT or skip before the full embed/write/extract run.
+
+Both embedders work locally and fill the cover in order from the top: DCT block by block, DWT (Haar) on
+2^levels x 2^levels pixel squares. So only small pieces go through the real embedder (fanout.DCT_Cover /
+fanout.DWT_Cover) and are read back:
+- DCT: capacity is estimated from a sample of 8x8 blocks tiled into a mosaic. Only blocks with pixels near
+  0/255 get clipped enough to push a re-quantized Y coefficient across the > 1 threshold (desynchronizing
+  every bit after it) or to flip a payload bit, so a sample of the saturated blocks the payload reaches is
+  embedded with random bits and their damage rate gives the expected share of message characters lost.
+- DWT: capacity is exact, and the top rows the message lands in are embedded with the message itself, which
+  shows the bit errors saturation of Cb / BGR near 0/255 causes.
+A method is usable when its expected character errors stay within the similarity compare_and_analyze
+still calls a slight difference; the usable method wins (DWT on a tie) and covers where neither is are
+skipped. The screen models the default in-order fill (no key).
+"""
+import os
+import csv
+from difflib import SequenceMatcher
+
+import numpy as np
+import cv2
+import bitstring
+
+import stego_layout
+import fanout
+import dwt
+from dct_run_stego_algorithm import SECRET_MESSAGE_STRING
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif')
+# 8x8 blocks simulated for DCT, laid out MOSAIC_COLUMNS blocks wide
+SAMPLE_BLOCKS = 512
+MOSAIC_COLUMNS = 32
+# Pixel distance from 0/255 at which a block counts as saturated
+SATURATION_MARGIN = 5
+# Headroom on the estimated DCT capacity before a message counts as fitting
+CAPACITY_MARGIN = 1.05
+# The DWT band height is rounded up to this (a multiple of 2^levels up to 4 levels)
+BAND_ROWS_MULTIPLE = 16
+# Score a method needs (1 usable, 0 not) for a cover to be routed at all
+MIN_SCORE = 0.5
+# Similarity above which compare_and_analyze.analyze_text_match still calls an extraction a slight difference
+USABLE_SIMILARITY = 0.9
+RANDOM_SEED = 0
+RESULT_COLUMNS = ["filename", "resolution", "dct_capacity_bits", "dct_char_error", "dct_score",
+                  "dwt_capacity_bits", "dwt_bit_error_rate", "dwt_score", "route"]
+
+def padded_to_blocks(image):
+    """The 8x8-compliant cover the DCT embedder works on"""
+    height, width = image.shape[:2]
+    return cv2.resize(image, (width + (-width) % 8, height + (-height) % 8))
+
+def image_blocks(padded_image):
+    """(num_blocks, 8, 8, 3) array of the 8x8 blocks in fill order"""
+    blocks_per_row = padded_image.shape[1] // 8
+    return padded_image.reshape(-1, 8, blocks_per_row, 8, 3).transpose(0, 2, 1, 3, 4).reshape(-1, 8, 8, 3)
+
+def mosaic(blocks, columns=MOSAIC_COLUMNS):
+    """Blocks tiled into one image, the last row padded with repeats of the first block"""
+    padded_count = -(-len(blocks) // columns) * columns
+    blocks = np.concatenate([blocks, np.repeat(blocks[:1], padded_count - len(blocks), axis=0)])
+    return np.ascontiguousarray(blocks.reshape(-1, columns, 8, 8, 3).transpose(0, 2, 1, 3, 4).reshape(-1, columns * 8, 3))
+
+def spread(indices, count=SAMPLE_BLOCKS):
+    """At most count evenly spaced entries of indices"""
+    return indices[np.unique(np.linspace(0, len(indices) - 1, min(count, len(indices))).astype(np.intp))]
+
+def damaged_blocks(blocks, rng):
+    '''
+    Embed random bits at full capacity into a mosaic of blocks and re-read it
+    :return: boolean per block, True where an eligible Y coefficient (> 1) appeared, vanished or lost its bit
+    '''
+    cover = fanout.DCT_Cover(mosaic(blocks))
+    expected = cover.coefficients[:, 1:].reshape(-1).copy()
+    if cover.capacity_bits > 0:
+        bits = rng.integers(0, 2, cover.capacity_bits, dtype=np.uint8)
+        stego_mosaic = cover.embed(bitstring.Bits(bytes=np.packbits(bits).tobytes(), length=len(bits)))
+        header = np.unpackbits(np.frombuffer(len(bits).to_bytes(4, 'big'), dtype=np.uint8))
+        expected[cover.positions] = cover.cleared_values | np.concatenate([header, bits])
+    else:
+        # Not even room for the header: the cover's own reconstruction shows the clipping
+        stego_mosaic = np.uint8(np.clip(cv2.cvtColor(cover.cover_ycc, cv2.COLOR_YCR_CB2BGR), 0, 255))
+    image_YCC = fanout.img.YCC_Image(cv2.cvtColor(np.float32(stego_mosaic), cv2.COLOR_BGR2YCrCb))
+    recovered = fanout.sorted_channel_coefficients(image_YCC, stego_layout.CHANNEL_INDEX['Y'])[:len(blocks), 1:].astype(np.int64)
+    expected = expected.reshape(-1, 63)[:len(blocks)].astype(np.int64)
+    eligible = expected > 1
+    return np.any((recovered > 1) != eligible, axis=1) | np.any(eligible & ((recovered ^ expected) & 1).astype(bool), axis=1)
+
+def screen_dct(image, message_bits, rng):
+    '''
+    DCT capacity estimated on a sample of blocks, and the characters lost in the saturated blocks the payload reaches
+    :return: (estimated capacity bits, expected character-error fraction, score)
+    '''
+    blocks = image_blocks(padded_to_blocks(image))
+    sample = spread(np.arange(len(blocks)))
+    header_bits = 32
+    eligible = np.count_nonzero(fanout.DCT_Cover(mosaic(blocks[sample])).coefficients[:len(sample), 1:] > 1)
+    capacity_bits = max(int(eligible / len(sample) * len(blocks)) - header_bits, 0)
+    if capacity_bits < message_bits * CAPACITY_MARGIN:
+        # The runner would cut the message to the capacity
+        return capacity_bits, float('nan'), 0.0
+
+    # Blocks are filled in order; only those with pixels near 0/255 get clipped enough to cross the > 1 threshold
+    blocks_needed = int(np.ceil(len(blocks) * (message_bits + header_bits) / (capacity_bits + header_bits)))
+    payload_blocks = blocks[:blocks_needed].reshape(blocks_needed, -1)
+    saturated = np.nonzero((payload_blocks.max(axis=1) >= 255 - SATURATION_MARGIN) | (payload_blocks.min(axis=1) <= SATURATION_MARGIN))[0]
+    if len(saturated) == 0:
+        return capacity_bits, 0.0, 1.0
+    damage_rate = float(np.mean(damaged_blocks(blocks[spread(saturated)], rng)))
+
+    # A damaged block garbles the characters its payload bits belong to; the text match compares the
+    # extraction character by character, so the lost share maps onto 1 - similarity
+    message_chars = message_bits / 8
+    chars_per_block = (message_bits + header_bits) / blocks_needed / 8 + 1
+    char_error = min(damage_rate * len(saturated) * chars_per_block / message_chars, 1.0)
+    return capacity_bits, char_error, float(char_error <= 1 - USABLE_SIMILARITY)
+
+def screen_dwt(image, message, layout=stego_layout.DWT_DEFAULT_LAYOUT):
+    '''
+    DWT capacity and bit error rate of the rows the message lands in
+    :return: (capacity bits, bit error rate, score)
+    '''
+    channels, subbands, levels = stego_layout.dwt_layout(*layout)
+    header = dwt.layout_header(channels, subbands, levels)
+    message_bits = len(dwt.text_to_binary(message))
+    capacity_bits = max(dwt.dwt_capacity_bits(image.shape, channels, subbands, levels) - 32 - len(header), 0)
+    if capacity_bits < message_bits:
+        return capacity_bits, float('nan'), 0.0
+
+    # The first subband is filled row by row from the top; each of its rows covers 2^levels image rows
+    scale = 2 ** levels
+    subband_width = -(-image.shape[1] // scale)
+    rows_needed = -(-(32 + len(header) + message_bits) // subband_width)
+    band_rows = -(-rows_needed * scale // BAND_ROWS_MULTIPLE) * BAND_ROWS_MULTIPLE
+    if band_rows * 2 > image.shape[0]:
+        # The message reaches past the first subband: embed into the whole cover
+        band_rows = image.shape[0]
+    band = image[:band_rows]
+    stego_band = fanout.DWT_Cover(band, None, channels, subbands, levels).embed(message)
+    embedded_bits = np.frombuffer((format(message_bits, '032b') + header + dwt.text_to_binary(message)).encode('ascii'), dtype=np.uint8) - ord('0')
+    recovered_bits = dwt.extract_bits_from_image(stego_band, None, channels, subbands, levels)[:len(embedded_bits)]
+    bit_error_rate = float(np.mean(recovered_bits != embedded_bits))
+
+    # The band holds the real message, so its extraction is the one the full run would produce
+    extracted = dwt.sanitize_text(dwt.extract_text_from_image(stego_band, None, channels, subbands, levels))
+    usable = extracted == message or SequenceMatcher(None, message, extracted).ratio() > USABLE_SIMILARITY
+    return capacity_bits, bit_error_rate, float(usable)
+
+def screen_image(image, message=SECRET_MESSAGE_STRING, dwt_layout=stego_layout.DWT_DEFAULT_LAYOUT):
+    '''
+    Screen one cover for both methods
+    :return: dict with the estimates of both methods and the route: 'dct', 'dwt' or 'skip'
+    '''
+    rng = np.random.default_rng(RANDOM_SEED)
+    message_bits = len(message.encode('utf-8')) * 8
+    dct_capacity, dct_char_error, dct_score = screen_dct(image, message_bits, rng)
+    dwt_capacity, dwt_bit_error_rate, dwt_score = screen_dwt(image, message, dwt_layout)
+    if max(dct_score, dwt_score) < MIN_SCORE:
+        route = 'skip'
+    else:
+        route = 'dwt' if dwt_score >= dct_score else 'dct'
+    return {'dct_capacity_bits': dct_capacity, 'dct_char_error': dct_char_error, 'dct_score': dct_score,
+            'dwt_capacity_bits': dwt_capacity, 'dwt_bit_error_rate': dwt_bit_error_rate, 'dwt_score': dwt_score, 'route': route}
+
+def screen_folder(folder_path, csv_path=None, message=SECRET_MESSAGE_STRING, dwt_layout=stego_layout.DWT_DEFAULT_LAYOUT):
+    '''
+    Screen every cover of a folder
+    :param csv_path: where to write the per-cover estimates and routes, None to skip the CSV
+    :return: {filename: route}
+    '''
+    routes = {}
+    rows = []
+    for filename in sorted(f for f in os.listdir(folder_path) if f.lower().endswith(IMAGE_EXTENSIONS)):
+        image = cv2.imread(os.path.join(folder_path, filename), flags=cv2.IMREAD_COLOR)
+        if image is None:
+            print(f"Error reading {filename}, skipping.")
+            continue
+        result = screen_image(image, message, dwt_layout)
+        routes[filename] = result['route']
+        rows.append([filename, f"{image.shape[1]}x{image.shape[0]}"] + [f"{value:.4f}" if isinstance(value, float) else value
+                                                                       for value in (result[name] for name in RESULT_COLUMNS[2:])])
+    if csv_path is not None:
+        with open(csv_path, "w", encoding="utf-8", newline='') as out_f:
+            writer = csv.writer(out_f)
+            writer.writerow(RESULT_COLUMNS)
+            writer.writerows(rows)
+        print(f"Screening results saved to {csv_path}")
+    counts = {route: list(routes.values()).count(route) for route in ('dct', 'dwt', 'skip')}
+    print(f"{folder_path}: {counts['dct']} to dct, {counts['dwt']} to dwt, {counts['skip']} skipped")
+    return routes
+
+def screen_csv_path(folder_path):
+    """ori/low -> ori/ori_low_screen.csv"""
+    folder_path = os.path.normpath(folder_path)
+    parent = os.path.dirname(folder_path)
+    return os.path.join(parent, f"{os.path.basename(os.path.abspath(parent))}_{os.path.basename(folder_path)}_screen.csv")
+
+def embed_routed(folder_path, output_root, message=SECRET_MESSAGE_STRING, verify='fast', csv_path=None):
+    '''
+    Screen a cover folder and embed each routed cover with its method into output_root/<method>/<tier>,
+    writing <method>_stego_results_<tier>.csv next to each tier folder; skipped covers are not processed
+    :param csv_path: screening CSV (default: screen_csv_path(folder_path))
+    :return: number of outputs that passed verification (or were written, when verify is None)
+    '''
+    tier = os.path.basename(os.path.normpath(folder_path))
+    routes = screen_folder(folder_path, csv_path or screen_csv_path(folder_path), message)
+    rows = {'dct': [], 'dwt': []}
+    usable = 0
+    for filename, route in routes.items():
+        if route == 'skip':
+            continue
+        with open(os.path.join(folder_path, filename), 'rb') as f:
+            data = f.read()
+        try:
+            stego_name, stego_data, width, height, capacity_bits, embedded_message, verified = fanout.embed_cover_bytes(filename, data, message, route, None, verify, {})
+        except Exception as e:
+            print(f"Error processing {filename}: {e}")
+            continue
+        output_folder = os.path.join(output_root, route, tier)
+        if not os.path.exists(output_folder):
+            os.makedirs(output_folder)
+        with open(os.path.join(output_folder, stego_name), 'wb') as f:
+            f.write(stego_data)
+        rows[route].append([filename, stego_name, len(data), len(stego_data), f"{width}x{height}", capacity_bits, embedded_message,
+                            "" if verified is None else verified])
+        usable += verified is not False
+    for method, method_rows in rows.items():
+        if method_rows:
+            with open(os.path.join(output_root, method, f"{method}_stego_results_{tier}.csv"), "w", encoding="utf-8", newline='') as out_f:
+                writer = csv.writer(out_f)
+                writer.writerow(["filename", "stego filename", "original size", "stego size", "resolution",
+                                 "capacity bits", "embedded_message", "verified"])
+                writer.writerows(method_rows)
+    routed = sum(len(method_rows) for method_rows in rows.values())
+    print(f"{usable} of {routed} routed covers passed verification, {list(routes.values()).count('skip')} skipped")
+    return usable
+
+if __name__ == "__main__":
+    screen_folder("./ori/low", screen_csv_path("./ori/low"))
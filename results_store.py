@@ -0,0 +1,224 @@
+import os
+import re
+import glob
+import uuid
+import math
+import hashlib
+from datetime import datetime, timezone
+
+# Append-only columnar store for embed/extract/analysis results (Parquet, needs pyarrow or fastparquet).
+# Every run adds one part file under results/, message texts live once under messages/, keyed by hash.
+RESULTS_STORE_PATH = "./results_store"
+
+RESULT_COLUMNS = {
+    'run_id': 'string',
+    'recorded_at': 'datetime64[ns, UTC]',
+    'algorithm': 'string',
+    'tier': 'string',
+    'stage': 'string',
+    'filename': 'string',
+    'layout': 'string',
+    'width': 'Int32',
+    'height': 'Int32',
+    'original_size': 'Int64',
+    'stego_size': 'Int64',
+    'size_increase_pct': 'Float64',
+    'capacity_bits': 'Int64',
+    'embed_seconds': 'Float64',
+    'extract_seconds': 'Float64',
+    'verified': 'boolean',
+    'analysis': 'string',
+    'ber_pct': 'Float64',
+    'psnr': 'Float64',
+    'ssim': 'Float64',
+    'expected_hash': 'string',
+    'extracted_hash': 'string',
+    'error': 'string',
+}
+
+MESSAGE_COLUMNS = {'message_hash': 'string', 'text': 'string'}
+
+# pandas is imported inside the functions that build or read frames, so producers only pay for it when storing
+
+def is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+def message_hash(text):
+    """SHA-256 of a message text, used as its key in the messages table"""
+    if is_missing(text):
+        return None
+    return hashlib.sha256(str(text).encode('utf-8')).hexdigest()
+
+def parse_legacy_number(value):
+    """Parse a number from the old CSVs.
+
+    Some analysis CSVs went through a spreadsheet that dropped the decimal point of the '%.4f' values
+    and regrouped the digits with dots, so 154.8608 became '1.548.608'. Those are turned back into
+    the original value; everything else is parsed as a plain float.
+    """
+    if is_missing(value):
+        return None
+    text = str(value).strip()
+    if re.fullmatch(r'-?\d{1,3}(\.\d{3})+', text):
+        return int(text.replace('.', '')) / 10**4
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+def size_increase_pct(original_size, stego_size):
+    if is_missing(original_size) or is_missing(stego_size) or original_size <= 0:
+        return None
+    return (stego_size - original_size) / original_size * 100
+
+def normalize_frame(rows, columns):
+    """Build a DataFrame with exactly the given columns and dtypes"""
+    import pandas as pd
+    df = pd.DataFrame(rows)
+    for column in columns:
+        if column not in df.columns:
+            df[column] = None
+    df = df[list(columns)]
+    for column, dtype in columns.items():
+        if dtype.startswith('datetime'):
+            df[column] = pd.to_datetime(df[column], utc=True)
+        elif dtype in ('Int32', 'Int64', 'Float64'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    return df
+
+def part_path(store_path, table):
+    folder = os.path.join(store_path, table)
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')
+    return os.path.join(folder, f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet")
+
+def append_messages(texts, store_path=RESULTS_STORE_PATH):
+    """Store message texts that are not in the store yet; returns their hashes"""
+    hashes = {}
+    for text in texts:
+        digest = message_hash(text)
+        if digest is not None:
+            hashes[digest] = str(text)
+    if not hashes:
+        return []
+    known = set(read_messages(store_path=store_path, columns=['message_hash'])['message_hash'])
+    new = [{'message_hash': digest, 'text': text} for digest, text in hashes.items() if digest not in known]
+    if new:
+        normalize_frame(new, MESSAGE_COLUMNS).to_parquet(part_path(store_path, 'messages'), index=False)
+    return list(hashes)
+
+def append_results(rows, store_path=RESULTS_STORE_PATH):
+    """Append result rows as one new part file.
+
+    Rows are dicts using the RESULT_COLUMNS names. 'expected' and 'extracted' texts may be given instead
+    of their hashes; they are moved to the messages table.
+    """
+    if not rows:
+        return None
+    run_id = uuid.uuid4().hex
+    recorded_at = datetime.now(timezone.utc)
+    texts = []
+    prepared = []
+    for row in rows:
+        row = dict(row)
+        for text_column, hash_column in (('expected', 'expected_hash'), ('extracted', 'extracted_hash')):
+            if text_column in row:
+                text = row.pop(text_column)
+                texts.append(text)
+                row.setdefault(hash_column, message_hash(text))
+        row.setdefault('run_id', run_id)
+        row.setdefault('recorded_at', recorded_at)
+        prepared.append(row)
+    append_messages(texts, store_path)
+    path = part_path(store_path, 'results')
+    normalize_frame(prepared, RESULT_COLUMNS).to_parquet(path, index=False)
+    return path
+
+def append_to_results_store(rows, store_path):
+    """append_results for the embed/extract/analysis scripts: skipped without a store path or a Parquet engine"""
+    if store_path is None:
+        return None
+    try:
+        return append_results(rows, store_path)
+    except ImportError as e:
+        print(f"Results store skipped: {e}")
+        return None
+
+def read_results(columns=None, filters=None, store_path=RESULTS_STORE_PATH):
+    """Read result rows; only the requested columns are loaded from disk"""
+    import pandas as pd
+    folder = os.path.join(store_path, 'results')
+    if not glob.glob(os.path.join(folder, '*.parquet')):
+        return normalize_frame([], RESULT_COLUMNS)[columns or list(RESULT_COLUMNS)]
+    return pd.read_parquet(folder, columns=columns, filters=filters)
+
+def read_messages(hashes=None, store_path=RESULTS_STORE_PATH, columns=None):
+    """Look up message texts by hash"""
+    import pandas as pd
+    folder = os.path.join(store_path, 'messages')
+    if not glob.glob(os.path.join(folder, '*.parquet')):
+        return normalize_frame([], MESSAGE_COLUMNS)[columns or list(MESSAGE_COLUMNS)]
+    filters = [('message_hash', 'in', list(hashes))] if hashes is not None else None
+    return pd.read_parquet(folder, columns=columns, filters=filters).drop_duplicates('message_hash')
+
+def import_analysis_csv(csv_path, algorithm, tier, store_path=RESULTS_STORE_PATH):
+    """Load one of the old *_analysis.csv files into the store.
+
+    Size increase and BER are recomputed from the sizes and texts, which also repairs the mangled numbers.
+    Blank rows (some files end in runs of ',,,,,,,') and rows without any size are skipped.
+    """
+    import pandas as pd
+    from compare_and_analyze import calculate_ber_percentage
+
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    rows = []
+    for _, row in df.iterrows():
+        original_size = parse_legacy_number(row.get('original size'))
+        stego_size = parse_legacy_number(row.get('stego size'))
+        increase = size_increase_pct(original_size, stego_size)
+        if increase is None:
+            increase = parse_legacy_number(row.get('size percentage increase'))
+        if not row['filename'].strip() or (original_size is None and stego_size is None and increase is None):
+            continue
+        rows.append({
+            'algorithm': algorithm,
+            'tier': tier,
+            'stage': 'analysis',
+            'filename': row['filename'],
+            'original_size': original_size,
+            'stego_size': stego_size,
+            'size_increase_pct': increase,
+            'analysis': row.get('analysis') or None,
+            'ber_pct': calculate_ber_percentage(row.get('expected', ''), row.get('extracted', '')),
+            'expected': row.get('expected', ''),
+            'extracted': row.get('extracted', ''),
+        })
+    return append_results(rows, store_path)
+
+def tier_summary(store_path=RESULTS_STORE_PATH):
+    """Per algorithm/tier averages of the analysis rows"""
+    columns = ['algorithm', 'tier', 'stage', 'size_increase_pct', 'ber_pct', 'analysis']
+    df = read_results(columns=columns, filters=[('stage', '==', 'analysis')], store_path=store_path)
+    return df.groupby(['algorithm', 'tier']).agg(
+        images=('ber_pct', 'size'),
+        mean_size_increase_pct=('size_increase_pct', 'mean'),
+        mean_ber_pct=('ber_pct', 'mean'),
+        matches=('analysis', lambda values: int((values == 'Match').sum())),
+    ).reset_index()
+
+def main():
+    """Import every */*_analysis.csv into the store and print the cross-tier summary"""
+    for csv_path in sorted(glob.glob(os.path.join('.', '*', '*_analysis.csv'))):
+        match = re.fullmatch(r'(\w+?)_(\w+)_analysis\.csv', os.path.basename(csv_path))
+        if not match:
+            continue
+        algorithm, tier = match.groups()
+        import_analysis_csv(csv_path, algorithm, tier)
+        print(f"Imported {csv_path}")
+    print(tier_summary().to_string(index=False))
+
+if __name__ == "__main__":
+    main()
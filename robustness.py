@@ -0,0 +1,177 @@
+"""Robustness harness: how much of the message survives common distortions of the stego images.
+
+Every stego image of the dct/* and dwt/* tier folders is decoded once and put through a matrix of attacks
+(lossless re-encode, JPEG at several qualities, Gaussian noise, crop, rescale). The matching extractor runs on
+each attacked image and the BER against the message embedded into it (from the tier's embed CSV, or the message
+cut to the image's DCT capacity) and against the unattacked extraction is written to
+<method>/<method>_<tier>_robustness.csv. Attacked images that decode to the
+same pixels share one extraction. Images are spread over a process pool, all attacks of one image in one task.
+"""
+import os
+import csv
+import glob
+import hashlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import cv2
+
+import dct_data_embedding as stego
+import stego_layout
+import compare_and_analyze
+import fanout
+import dwt
+from dct_run_stego_algorithm import SECRET_MESSAGE_STRING
+
+JPEG_QUALITIES = (95, 85, 75, 50)
+NOISE_SIGMAS = (1, 2)
+# Pixels cut from the right and bottom edges (a multiple of 8 keeps the DCT block grid)
+CROP_PIXELS = 8
+RESCALE_FACTORS = (0.9, 0.5)
+NOISE_SEED = 0
+RESULT_COLUMNS = ["filename", "attack", "resolution", "extracted", "expected", "BER %", "BER vs unattacked %", "error"]
+
+def reencode(image, ext, params=()):
+    success, encoded = cv2.imencode(ext, image, list(params))
+    if not success:
+        raise ValueError(f"Failed to encode {ext}")
+    return cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+
+def add_noise(image, sigma):
+    noise = np.random.default_rng(NOISE_SEED).normal(0, sigma, image.shape)
+    return np.uint8(np.clip(np.around(image + noise), 0, 255))
+
+def crop(image, pixels):
+    return image[:image.shape[0] - pixels, :image.shape[1] - pixels]
+
+def rescale(image, factor):
+    """Scale down and back up to the original size"""
+    height, width = image.shape[:2]
+    small = cv2.resize(image, (max(int(width * factor), 1), max(int(height * factor), 1)), interpolation=cv2.INTER_AREA)
+    return cv2.resize(small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+# Attack name -> function of the decoded stego image; 'none' is the unattacked reference
+ATTACKS = {'none': lambda image: image, 'png': functools.partial(reencode, ext='.png')}
+ATTACKS.update({f"jpeg_{quality}": functools.partial(reencode, ext='.jpg', params=(cv2.IMWRITE_JPEG_QUALITY, quality)) for quality in JPEG_QUALITIES})
+ATTACKS.update({f"noise_{sigma}": functools.partial(add_noise, sigma=sigma) for sigma in NOISE_SIGMAS})
+ATTACKS[f"crop_{CROP_PIXELS}"] = functools.partial(crop, pixels=CROP_PIXELS)
+ATTACKS.update({f"rescale_{int(factor * 100)}": functools.partial(rescale, factor=factor) for factor in RESCALE_FACTORS})
+
+def extract_message(image, method, key=None, layout=None):
+    '''
+    Message extracted from a (possibly attacked) stego image with the matching extractor
+    :param layout: channels for dct; channels, subbands, levels for dwt
+    '''
+    layout = layout or {}
+    if method == 'dct':
+        height, width = image.shape[:2]
+        if height % 8 or width % 8:
+            # Same 8x8 fit the embedder applies to covers
+            image = cv2.resize(image, (width + (-width) % 8, height + (-height) % 8))
+        channel_names = stego_layout.dct_layout(**layout)
+        layout_code = stego_layout.dct_layout_code(channel_names)
+        return stego.decode_extracted_data(fanout.recovered_coefficient_data(image, key, channel_names), layout_code)
+    return dwt.sanitize_text(dwt.extract_text_from_image(image, key, *stego_layout.dwt_layout(**layout)))
+
+def capacity_message(stego_image, method, message, key=None, layout=None):
+    """Message as the embedder wrote it: the DCT runner cuts it to the cover's capacity, DWT embeds it whole"""
+    if method == 'dct':
+        return message[:fanout.DCT_Cover(stego_image, key, **(layout or {})).capacity_bits // 8]
+    return message
+
+def attack_image(task):
+    '''
+    Run every attack on one stego image
+    :param task: (path, method, expected message or None, message, attack names, key, layout)
+    :return: result rows for the CSV
+    '''
+    path, method, expected, message, attack_names, key, layout = task
+    filename = os.path.basename(path)
+    stego_image = cv2.imread(path, cv2.IMREAD_COLOR)
+    if stego_image is None:
+        return [[filename, name, "", "", expected or "", "", "", "Failed to read image"] for name in attack_names]
+    if expected is None:
+        expected = capacity_message(stego_image, method, message, key, layout)
+
+    extractions = {}
+    def extract(image):
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest() + bytes(str(image.shape), 'ascii')
+        if digest not in extractions:
+            try:
+                extractions[digest] = (extract_message(image, method, key, layout), "")
+            except Exception as e:
+                extractions[digest] = ("", str(e))
+        return extractions[digest]
+
+    reference, _ = extract(stego_image)
+    rows = []
+    for name in attack_names:
+        try:
+            attacked = ATTACKS[name](stego_image)
+        except Exception as e:
+            rows.append([filename, name, "", "", expected, "", "", str(e)])
+            continue
+        extracted, error = extract(attacked)
+        rows.append([filename, name, f"{attacked.shape[1]}x{attacked.shape[0]}", extracted, expected,
+                     round(compare_and_analyze.calculate_ber_percentage(expected, extracted), 3),
+                     round(compare_and_analyze.calculate_ber_percentage(reference, extracted), 3), error])
+    return rows
+
+def embedded_messages(embed_csv):
+    """stego filename -> message embedded into it, from an embed summary CSV (cover filename, embedded_message)"""
+    if not os.path.exists(embed_csv):
+        return {}
+    with open(embed_csv, encoding="utf-8", newline='') as f:
+        return {"{0}_stego{1}".format(*os.path.splitext(row["filename"])): row["embedded_message"]
+                for row in csv.DictReader(f) if row.get("embedded_message")}
+
+def robustness_csv_path(stego_folder, method):
+    """dct/low -> dct/dct_low_robustness.csv, next to dct/dct_low_analysis.csv"""
+    stego_folder = os.path.normpath(stego_folder)
+    return os.path.join(os.path.dirname(stego_folder), f"{method}_{os.path.basename(stego_folder)}_robustness.csv")
+
+def run_folders(folders, attack_names=tuple(ATTACKS), key=None, workers=None, expected_message=SECRET_MESSAGE_STRING, **layout):
+    '''
+    Attack every stego image of the given folders and write one robustness CSV per folder
+    :param folders: (method, stego folder) pairs, e.g. default_folders()
+    :param layout: embedding layout, shared by every folder of a method
+    :return: {csv path: rows}
+    '''
+    tasks, destinations = [], []
+    for method, folder in folders:
+        tier = os.path.basename(os.path.normpath(folder))
+        expected = embedded_messages(os.path.join(os.path.dirname(os.path.normpath(folder)), f"{method}_stego_results_{tier}.csv"))
+        method_layout = {name: value for name, value in layout.items() if method == 'dwt' or name == 'channels'}
+        for filename in sorted(f for f in os.listdir(folder) if f.lower().endswith('.png') and '_steg' in f):
+            tasks.append((os.path.join(folder, filename), method, expected.get(filename), expected_message, tuple(attack_names), key, method_layout))
+            destinations.append(robustness_csv_path(folder, method))
+
+    results = {path: [] for path in dict.fromkeys(destinations)}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for destination, rows in zip(destinations, pool.map(attack_image, tasks, chunksize=4)):
+            results[destination].extend(rows)
+    for path, rows in results.items():
+        with open(path, "w", encoding="utf-8", newline='') as out_f:
+            writer = csv.writer(out_f)
+            writer.writerow(RESULT_COLUMNS)
+            writer.writerows(rows)
+        print(f"Robustness results saved to {path}")
+    return results
+
+def summarize(results):
+    """Mean BER per (CSV, attack), printed as a table"""
+    for path, rows in results.items():
+        print(os.path.basename(path))
+        for name in dict.fromkeys(row[1] for row in rows):
+            bers = [row[5] for row in rows if row[1] == name and row[5] != ""]
+            clean_bers = [row[6] for row in rows if row[1] == name and row[6] != ""]
+            if bers:
+                print(f"  {name:<12} BER {np.mean(bers):8.2f}%   vs unattacked {np.mean(clean_bers):8.2f}%   ({len(bers)} images)")
+
+def default_folders():
+    """(method, folder) for every tier folder under dct/ and dwt/"""
+    return [(method, folder) for method in ('dct', 'dwt') for folder in sorted(glob.glob(os.path.join(method, '*'))) if os.path.isdir(folder)]
+
+if __name__ == "__main__":
+    summarize(run_folders(default_folders()))
@@ -0,0 +1,197 @@
+"""LSB steganalysis on the coefficient domains the embedders write to.
+
+For every image the eligible quantized zigzagged Y DCT coefficients (> 1) and the Cb HH+HL Haar
+coefficients are taken in embedding order, and three statistics are computed on each sequence:
+- chi-square pairs-of-values test (Westfeld & Pfitzmann) over growing prefixes of the fill order:
+  its p-value is close to 1 while the prefix is filled with payload, so the share of prefixes with
+  p > 0.5 estimates how much of the sequence carries data;
+- the same test on the first LEADING_VALUES values, where the unkeyed embedders put any message. When
+  these values fall into a single pair (the Cb HH of a flat or chroma-subsampled cover is almost all 0)
+  the test has no degrees of freedom; twice the share of the pair's rarer value is used instead, which
+  is the rate of replaced LSBs for a cover that sits in one member of the pair;
+- RS-style analysis (Fridrich et al.) on groups of 4 coefficients, estimating the rate of flipped LSBs.
+  For DCT a group is the same zigzag coefficient of 4 horizontally adjacent blocks, kept when all four
+  have the same sign; consecutive coefficients of one block are not smooth enough for the test.
+The score is the largest of these estimates. Folders are scanned in parallel processes and each one
+gets a *_steganalysis.csv next to its analysis CSV.
+"""
+import os
+import csv
+import glob
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import cv2
+
+import dct_image_preparation as img
+import stego_layout
+import fanout
+import dwt
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.tif')
+# Prefixes of the fill order the chi-square test is evaluated on
+CHECKPOINTS = 100
+# Pairs of values seen fewer times than this are left out of the chi-square sum
+MIN_PAIR_COUNT = 5
+# Start of the fill order that is tested on its own
+LEADING_VALUES = 1024
+RS_GROUP_MASK = np.array([0, 1, 1, 0])
+# Fewer groups than this give no RS estimate
+RS_MIN_GROUPS = 64
+RESULT_COLUMNS = ["filename", "resolution", "dct_coefficients", "dct_chi2_p", "dct_chi2_fill", "dct_leading_fill", "dct_rs_rate",
+                  "dwt_coefficients", "dwt_chi2_p", "dwt_chi2_fill", "dwt_leading_fill", "dwt_rs_rate", "score"]
+
+def dct_sequences(image):
+    """Eligible Y AC coefficients in the order the DCT embedder fills them, and the RS groups (flattened)"""
+    height, width = image.shape[:2]
+    padded_image = cv2.resize(image, (width + (-width) % 8, height + (-height) % 8))
+    image_YCC = img.YCC_Image(cv2.cvtColor(np.float32(padded_image), cv2.COLOR_BGR2YCrCb))
+    ac_coefficients = fanout.sorted_channel_coefficients(image_YCC, stego_layout.CHANNEL_INDEX['Y'])[:, 1:].astype(np.int64)
+    # (block rows, groups of 4 blocks, 63 coefficients, 4 blocks) -> one group per coefficient and 4 adjacent blocks
+    group_size = len(RS_GROUP_MASK)
+    blocks_per_row = padded_image.shape[1] // 8
+    rows = ac_coefficients.reshape(-1, blocks_per_row, 63)[:, :blocks_per_row // group_size * group_size]
+    groups = rows.reshape(len(rows), -1, group_size, 63).transpose(0, 1, 3, 2).reshape(-1, group_size)
+    same_sign = np.all(groups > 0, axis=1) | np.all(groups < 0, axis=1)
+    return ac_coefficients.reshape(-1)[ac_coefficients.reshape(-1) > 1], groups[same_sign].reshape(-1)
+
+def dwt_sequence(image):
+    """Cb HH then HL coefficients, truncated like the DWT embedder reads them"""
+    _, _, targets = dwt.decompose_channels(image, *stego_layout.DWT_DEFAULT_LAYOUT)
+    return np.concatenate([target.flatten().astype(np.int16) for target in targets]).astype(np.int64)
+
+def chi2_survival(statistic, dof):
+    """P(X > statistic) for chi-square with dof degrees of freedom (scipy when available)"""
+    statistic, dof = np.asarray(statistic, dtype=np.float64), np.maximum(np.asarray(dof, dtype=np.float64), 1)
+    try:
+        from scipy.stats import chi2
+        return chi2.sf(statistic, dof)
+    except ImportError:
+        # Wilson-Hilferty approximation
+        z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / np.sqrt(2 / (9 * dof))
+        return 0.5 * np.vectorize(math.erfc)(z / math.sqrt(2))
+
+def chi_square_prefixes(values, checkpoints=CHECKPOINTS):
+    """p-values of the pairs-of-values test on the first 1/checkpoints, 2/checkpoints, ... of the sequence"""
+    if len(values) < checkpoints:
+        return np.zeros(0)
+    pairs = (values >> 1) - (values >> 1).min()
+    num_pairs = int(pairs.max()) + 1
+    segments = np.arange(len(values)) * checkpoints // len(values)
+    counts = np.bincount((segments * num_pairs + pairs) * 2 + (values & 1), minlength=checkpoints * num_pairs * 2)
+    counts = counts.reshape(checkpoints, num_pairs, 2).cumsum(axis=0)
+    pair_totals = counts.sum(axis=2)
+    used = pair_totals >= MIN_PAIR_COUNT
+    expected = np.where(used, pair_totals / 2, 1)
+    statistic = np.where(used, (counts[:, :, 0] - expected) ** 2 / expected, 0).sum(axis=1)
+    p_values = chi2_survival(statistic, used.sum(axis=1) - 1)
+    return np.where(used.sum(axis=1) > 1, p_values, 0)
+
+def leading_fill(values, count=LEADING_VALUES):
+    """How much of the first count values carries payload: the chi-square p-value, or for a single pair the LSB replacement rate"""
+    values = values[:count]
+    if len(values) == 0:
+        return 0.0
+    pairs = np.unique(values >> 1, return_inverse=True)[1]
+    counts = np.bincount(pairs * 2 + (values & 1), minlength=(int(pairs.max()) + 1) * 2).reshape(-1, 2)
+    counts = counts[counts.sum(axis=1) >= MIN_PAIR_COUNT]
+    if len(counts) == 0:
+        return 0.0
+    if len(counts) == 1:
+        return float(min(2 * counts.min() / counts.sum(), 1.0))
+    expected = counts.sum(axis=1) / 2
+    statistic = ((counts[:, 0] - expected) ** 2 / expected).sum()
+    return float(chi2_survival(statistic, len(counts) - 1))
+
+def flip_positive(values):
+    """F1: 2k <-> 2k+1"""
+    return values ^ 1
+
+def flip_negative(values):
+    """F-1: 2k-1 <-> 2k"""
+    return ((values + 1) ^ 1) - 1
+
+def regular_singular(groups, flip):
+    '''
+    Share of regular and singular groups when the masked members are flipped
+    :param groups: (num_groups, 4) coefficient groups
+    :return: (R, S)
+    '''
+    smoothness = np.abs(np.diff(groups, axis=1)).sum(axis=1)
+    flipped = np.where(RS_GROUP_MASK.astype(bool), flip(groups), groups)
+    flipped_smoothness = np.abs(np.diff(flipped, axis=1)).sum(axis=1)
+    return np.mean(flipped_smoothness > smoothness), np.mean(flipped_smoothness < smoothness)
+
+def rs_embedding_rate(values):
+    """Estimated share of flipped LSBs (0 = clean, 1 = every coefficient carries payload)"""
+    group_size = len(RS_GROUP_MASK)
+    if len(values) < RS_MIN_GROUPS * group_size:
+        return 0.0
+    groups = values[:len(values) // group_size * group_size].reshape(-1, group_size)
+    R_m, S_m = regular_singular(groups, flip_positive)
+    R_n, S_n = regular_singular(groups, flip_negative)
+    R_m1, S_m1 = regular_singular(groups ^ 1, flip_positive)
+    R_n1, S_n1 = regular_singular(groups ^ 1, flip_negative)
+    d0, d1, dn0, dn1 = R_m - S_m, R_m1 - S_m1, R_n - S_n, R_n1 - S_n1
+    # 2(d1 + d0)x^2 + (d-0 - d-1 - d1 - 3d0)x + d0 - d-0 = 0, rate = x / (x - 1/2)
+    roots = np.roots([2 * (d1 + d0), dn0 - dn1 - d1 - 3 * d0, d0 - dn0])
+    roots = roots[np.isreal(roots)].real
+    if len(roots) == 0:
+        return 0.0
+    x = roots[np.argmin(np.abs(roots))]
+    if x == 0.5:
+        return 1.0
+    return max(0.0, min(float(x / (x - 0.5)), 1.0))
+
+def analyze_sequence(values, rs_values=None):
+    """(count, chi-square p-value of the whole sequence, filled share of the prefixes, leading fill, RS rate on rs_values or values)"""
+    p_values = chi_square_prefixes(values)
+    lead = leading_fill(values)
+    rs_rate = rs_embedding_rate(values if rs_values is None else rs_values)
+    if len(p_values) == 0:
+        return len(values), 0.0, 0.0, lead, rs_rate
+    return len(values), float(p_values[-1]), float(np.mean(p_values > 0.5)), lead, rs_rate
+
+def scan_image(image):
+    """Statistics for both domains and the overall score"""
+    dct_stats = analyze_sequence(*dct_sequences(image))
+    dwt_stats = analyze_sequence(dwt_sequence(image))
+    score = max(dct_stats[2:] + dwt_stats[2:])
+    return dct_stats + dwt_stats + (score,)
+
+def steganalysis_csv_path(folder):
+    """dct/low -> dct/dct_low_steganalysis.csv, next to dct/dct_low_analysis.csv"""
+    folder = os.path.normpath(folder)
+    parent = os.path.dirname(folder)
+    return os.path.join(parent, f"{os.path.basename(os.path.abspath(parent))}_{os.path.basename(folder)}_steganalysis.csv")
+
+def scan_folder(folder, csv_path=None):
+    """Scan every image of a folder and write its steganalysis CSV; returns the CSV path"""
+    csv_path = csv_path or steganalysis_csv_path(folder)
+    rows = []
+    for filename in sorted(f for f in os.listdir(folder) if f.lower().endswith(IMAGE_EXTENSIONS)):
+        image = cv2.imread(os.path.join(folder, filename), cv2.IMREAD_COLOR)
+        if image is None:
+            print(f"Error reading {filename}, skipping.")
+            continue
+        stats = scan_image(image)
+        rows.append([filename, f"{image.shape[1]}x{image.shape[0]}"] + [f"{value:.4f}" if isinstance(value, float) else value for value in stats])
+    with open(csv_path, "w", encoding="utf-8", newline='') as out_f:
+        writer = csv.writer(out_f)
+        writer.writerow(RESULT_COLUMNS)
+        writer.writerows(rows)
+    print(f"Scanned {len(rows)} images in {folder}, results saved to {csv_path}")
+    return csv_path
+
+def scan_folders(folders, workers=None):
+    """Scan several folders in parallel processes"""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(scan_folder, folders))
+
+def default_folders():
+    """The tier folders of the repository layout: ori/*, dct/*, dwt/*"""
+    return [folder for root in ('ori', 'dct', 'dwt') for folder in sorted(glob.glob(os.path.join(root, '*'))) if os.path.isdir(folder)]
+
+if __name__ == "__main__":
+    scan_folders(default_folders())
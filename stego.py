@@ -0,0 +1,400 @@
+"""Command line entry point for both methods: python stego.py {embed,extract,analyze,stream,compare,scan,robustness,screen,bench} ...
+
+Only the standard library is imported up front. Each subcommand imports the modules it needs when it runs,
+so --help and short scripted calls don't pay for cv2, pywt, pandas or scikit-image they never use.
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+METHODS = ('dct', 'dwt')
+# Median wall time of a fresh `python stego.py --help`, checked by the bench subcommand
+STARTUP_BUDGET_SECONDS = 0.25
+BENCH_REPEATS = 5
+# Modules each subcommand loads, used by bench to report their import cost
+SUBCOMMAND_MODULES = {
+    'embed dct': ('dct_run_stego_algorithm',),
+    'embed dwt': ('dwt',),
+    'extract dct': ('dct_extract_stego_image',),
+    'extract dwt': ('dwt',),
+    'analyze': ('compare_and_analyze',),
+    'compare': ('dct_compare-m',),
+    'scan': ('steganalysis',),
+    'robustness': ('robustness',),
+    'screen': ('prescreen',),
+    'archive': ('archive_io',),
+}
+
+def split_names(value):
+    return tuple(name.strip() for name in value.split(',') if name.strip())
+
+def read_text(text, text_file):
+    if text_file is not None:
+        with open(text_file, encoding='utf-8') as f:
+            return f.read()
+    return text
+
+def store_path(args):
+    if args.no_store:
+        return None
+    if args.store is not None:
+        return args.store
+    import results_store
+    return results_store.RESULTS_STORE_PATH
+
+def tier_of(folder):
+    return os.path.basename(os.path.normpath(folder))
+
+def sibling_csv(folder, name):
+    """CSV next to the output folder, like ./dct/dct_stego_results_low.csv for ./dct/low"""
+    return os.path.join(os.path.dirname(os.path.normpath(folder)), name)
+
+def dwt_layout(args):
+    import stego_layout
+    return stego_layout.dwt_layout(split_names(args.channels or 'Cb'), split_names(args.subbands), args.levels)
+
+def is_archive_path(path):
+    """tar or zip file, checked with the standard library so plain folders never load archive_io"""
+    import tarfile
+    import zipfile
+    return os.path.isfile(path) and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path))
+
+def run_embed(args):
+    message = read_text(args.message, args.message_file)
+    verify = None if args.verify == 'none' else args.verify
+    if is_archive_path(args.input_folder):
+        # Covers read from the archive members, stego images and summary CSV written into the output archive
+        import archive_io
+        if message is None:
+            import dct_run_stego_algorithm as dct_embed
+            message = dct_embed.SECRET_MESSAGE_STRING
+        archive_io.embed_archive(args.input_folder, args.output_folder, message, args.method, args.key, verify,
+                                 store_path=store_path(args), **layout_kwargs(args))
+        return
+    # Named after the stego folder, which is where extract and robustness look for it
+    csv_path = args.csv or sibling_csv(args.output_folder, f"{args.method}_stego_results_{tier_of(args.output_folder)}.csv")
+    if args.method == 'dct':
+        import dct_run_stego_algorithm as dct_embed
+        count = dct_embed.embed_folder(args.input_folder, args.output_folder, csv_path,
+                                       message if message is not None else dct_embed.SECRET_MESSAGE_STRING,
+                                       verify_mode=verify, key=args.key, channels=split_names(args.channels or 'Y'),
+                                       parallel_workers=args.workers, jpeg_coefficient_mode=not args.no_jpeg_domain,
+                                       results_store_path=store_path(args))
+        print(f"Embedded {count} files, summary saved to {csv_path}")
+    else:
+        if message is None:
+            raise SystemExit("dwt embed needs --message or --message-file")
+        import dwt
+        dwt.embed_text_in_folder(args.input_folder, message, args.output_folder, csv_path, verify=verify, key=args.key,
+                                 layout=dwt_layout(args), store_path=store_path(args), workers=args.workers)
+
+def run_extract(args):
+    expected = read_text(args.expected, args.expected_file)
+    if is_archive_path(args.stego_folder):
+        import archive_io
+        csv_path = args.csv or os.path.join(os.path.dirname(args.stego_folder),
+                                            f"{args.method}_extracted_results_{archive_io.archive_stem(args.stego_folder)}.csv")
+        if expected is None:
+            import dct_extract_stego_image as dct_extract
+            expected = dct_extract.EXPECTED_MESSAGE
+        archive_io.extract_archive(args.stego_folder, csv_path, expected, args.method, args.key,
+                                   store_path=store_path(args), **layout_kwargs(args))
+        return
+    csv_path = args.csv or sibling_csv(args.stego_folder, f"{args.method}_extracted_results_{tier_of(args.stego_folder)}.csv")
+    if args.method == 'dct':
+        import dct_extract_stego_image as dct_extract
+        dct_extract.extract_folder(args.stego_folder, csv_path, expected if expected is not None else dct_extract.EXPECTED_MESSAGE,
+                                   key=args.key, channels=split_names(args.channels or 'Y'),
+                                   jpeg_coefficient_mode=not args.no_jpeg_domain, results_store_path=store_path(args))
+    else:
+        if expected is None:
+            raise SystemExit("dwt extract needs --expected or --expected-file")
+        import dwt
+        dwt.extract_texts_from_folder(args.stego_folder, csv_path, expected, key=args.key, layout=dwt_layout(args),
+                                      store_path=store_path(args))
+
+def run_analyze(args):
+    import compare_and_analyze
+    tier = args.tier or tier_of(args.stego_folder)
+    output_csv = args.output or os.path.join(os.path.dirname(args.input_csv), f"{args.method}_{tier}_analysis.csv")
+    compare_and_analyze.analyze(args.input_csv, args.original_folder, args.stego_folder, output_csv,
+                                algorithm=args.method, tier=tier, results_store_path=store_path(args))
+
+def layout_kwargs(args):
+    """Layout keywords for fanout / stream_frames"""
+    if args.method == 'dct':
+        return {'channels': split_names(args.channels or 'Y')}
+    return dict(zip(('channels', 'subbands', 'levels'), dwt_layout(args)))
+
+def run_stream(args):
+    import stream_frames
+    if args.action == 'embed':
+        if args.payload_file is None or args.output is None:
+            raise SystemExit("stream embed needs --payload-file and --output")
+        with open(args.payload_file, 'rb') as f:
+            payload = f.read()
+        index = stream_frames.embed_frame_folder(args.folder, payload, args.output, args.method, args.key, **layout_kwargs(args))
+        print(f"Embedded {index['embedded_bytes']} of {index['payload_bytes']} bytes in {len(index['frames'])} frames, index in {args.output}")
+    else:
+        data = stream_frames.extract_stream(args.folder, args.offset, args.length, key=args.key)
+        if args.output is None:
+            sys.stdout.buffer.write(data)
+        else:
+            with open(args.output, 'wb') as f:
+                f.write(data)
+            print(f"Extracted {len(data)} bytes to {args.output}")
+
+def stego_pairs(original_folder, stego_folder):
+    """(original, stego) paths, pairing name_stego.ext with name.* in the original folder"""
+    originals = {os.path.splitext(name)[0]: name for name in os.listdir(original_folder)}
+    pairs = []
+    for name in sorted(os.listdir(stego_folder)):
+        stem = os.path.splitext(name)[0]
+        if stem.endswith('_stego') and stem[:-len('_stego')] in originals:
+            pairs.append((os.path.join(original_folder, originals[stem[:-len('_stego')]]), os.path.join(stego_folder, name)))
+    return pairs
+
+def run_compare(args):
+    try:
+        compare = importlib.import_module('dct_compare-m')
+    except ImportError as e:
+        raise SystemExit(f"compare needs scikit-image and OpenCV: {e}")
+    if os.path.isdir(args.original) and os.path.isdir(args.stego):
+        pairs = stego_pairs(args.original, args.stego)
+    else:
+        pairs = [(args.original, args.stego)]
+    rows = []
+    for original_path, stego_path in pairs:
+        ssim_value, psnr_value = compare.compare_images(original_path, stego_path)
+        rows.append((os.path.basename(stego_path), ssim_value, psnr_value))
+        print(f"{os.path.basename(stego_path)}  SSIM: {ssim_value:.6f}  PSNR: {psnr_value:.6f}")
+    if args.csv is not None:
+        import csv
+        with open(args.csv, "w", encoding="utf-8", newline='') as out_f:
+            writer = csv.writer(out_f)
+            writer.writerow(["filename", "ssim", "psnr"])
+            writer.writerows(rows)
+        print(f"Comparison saved to {args.csv}")
+
+def run_scan(args):
+    import steganalysis
+    folders = args.folders or steganalysis.default_folders()
+    if args.workers == 1 or len(folders) == 1:
+        for folder in folders:
+            steganalysis.scan_folder(folder)
+    else:
+        steganalysis.scan_folders(folders, args.workers)
+
+def run_robustness(args):
+    import robustness
+    if args.folders:
+        if args.method is None:
+            raise SystemExit("robustness needs --method with explicit folders")
+        folders = [(args.method, folder) for folder in args.folders]
+    else:
+        folders = [(method, folder) for method, folder in robustness.default_folders() if args.method in (None, method)]
+    attack_names = split_names(args.attacks) if args.attacks else tuple(robustness.ATTACKS)
+    unknown = [name for name in attack_names if name not in robustness.ATTACKS]
+    if unknown:
+        raise SystemExit(f"Unknown attacks {', '.join(unknown)}; choose from {', '.join(robustness.ATTACKS)}")
+    layout = layout_kwargs(args) if args.method is not None else {}
+    robustness.summarize(robustness.run_folders(folders, attack_names, key=args.key, workers=args.workers, **layout))
+
+def run_screen(args):
+    import prescreen
+    message = read_text(args.message, args.message_file)
+    if message is None:
+        message = prescreen.SECRET_MESSAGE_STRING
+    csv_path = args.csv or prescreen.screen_csv_path(args.input_folder)
+    if args.embed is None:
+        prescreen.screen_folder(args.input_folder, csv_path, message)
+    else:
+        prescreen.embed_routed(args.input_folder, args.embed, message, None if args.verify == 'none' else args.verify, csv_path)
+
+def fresh_interpreter_seconds(command):
+    """Wall time of a command in a fresh interpreter, repeated BENCH_REPEATS times; returns the median"""
+    timings = []
+    for _ in range(BENCH_REPEATS):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=os.path.dirname(os.path.abspath(__file__)))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def import_seconds(modules):
+    """Import time of the given modules in a fresh interpreter"""
+    code = ("import importlib, time; start = time.perf_counter(); "
+            f"[importlib.import_module(name) for name in {list(modules)!r}]; print(time.perf_counter() - start)")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+def bench_folder(method, folder):
+    """Embed and extract a cover folder into a temporary directory; returns (files, embed seconds, extract seconds)"""
+    # Imported before the timers start, their cost is what the import report above is for
+    import dct_run_stego_algorithm as dct_embed
+    import dct_extract_stego_image as dct_extract
+    import dwt
+    with tempfile.TemporaryDirectory() as temp_dir, contextlib.redirect_stdout(io.StringIO()):
+        output_folder = os.path.join(temp_dir, tier_of(folder))
+        start = time.perf_counter()
+        if method == 'dct':
+            count = dct_embed.embed_folder(folder, output_folder, os.path.join(temp_dir, 'embed.csv'), results_store_path=None)
+            embed_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            dct_extract.extract_folder(output_folder, os.path.join(temp_dir, 'extract.csv'), results_store_path=None)
+        else:
+            dwt.embed_text_in_folder(folder, dct_embed.SECRET_MESSAGE_STRING, output_folder, os.path.join(temp_dir, 'embed.csv'), store_path=None)
+            embed_seconds = time.perf_counter() - start
+            count = len(os.listdir(output_folder))
+            start = time.perf_counter()
+            dwt.extract_texts_from_folder(output_folder, os.path.join(temp_dir, 'extract.csv'), dct_embed.SECRET_MESSAGE_STRING, store_path=None)
+        return count, embed_seconds, time.perf_counter() - start
+
+def bench_fanout(method, folder, payloads):
+    """Prepare the first cover of a folder once and embed+encode `payloads` messages into it; returns (prepare, per payload) seconds"""
+    import cv2
+    import fanout
+    import dct_run_stego_algorithm as dct_embed
+    cover_files = sorted(name for name in os.listdir(folder) if name.lower().endswith(('.png', '.jpg', '.jpeg')))
+    if not cover_files:
+        raise SystemExit(f"No covers in {folder}")
+    start = time.perf_counter()
+    raw_cover_image = cv2.imread(os.path.join(folder, cover_files[0]), flags=cv2.IMREAD_COLOR)
+    cover = fanout.DCT_Cover(raw_cover_image) if method == 'dct' else fanout.DWT_Cover(raw_cover_image)
+    prepare_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for index in range(payloads):
+        message = f"{index:06d} {dct_embed.SECRET_MESSAGE_STRING}"[:cover.capacity_bits // 8]
+        stego_image = cover.embed(fanout.text_to_encoded_bits(message)) if method == 'dct' else cover.embed(message)
+        cv2.imencode('.png', stego_image)
+    return prepare_seconds, (time.perf_counter() - start) / payloads
+
+def run_bench(args):
+    startup = fresh_interpreter_seconds([sys.executable, os.path.abspath(__file__), '--help'])
+    status = 'OK' if startup <= STARTUP_BUDGET_SECONDS else 'OVER BUDGET'
+    print(f"Cold start (--help, median of {BENCH_REPEATS}): {startup * 1000:.1f} ms, budget {STARTUP_BUDGET_SECONDS * 1000:.0f} ms [{status}]")
+    for subcommand, modules in SUBCOMMAND_MODULES.items():
+        seconds = import_seconds(modules)
+        print(f"  {subcommand:<12} imports: " + (f"{seconds * 1000:.1f} ms" if seconds is not None else "unavailable (missing dependency)"))
+    if args.folder is not None:
+        for method in (METHODS if args.method is None else (args.method,)):
+            count, embed_seconds, extract_seconds = bench_folder(method, args.folder)
+            per_file = max(count, 1)
+            print(f"{method}: {count} files, embed {embed_seconds / per_file:.3f} s/file, extract {extract_seconds / per_file:.3f} s/file")
+            if args.payloads:
+                prepare_seconds, payload_seconds = bench_fanout(method, args.folder, args.payloads)
+                print(f"{method} fan-out: cover prepared once in {prepare_seconds:.3f} s, "
+                      f"each additional payload {payload_seconds:.4f} s (embed + PNG encode, {args.payloads} payloads)")
+    if startup > STARTUP_BUDGET_SECONDS:
+        sys.exit(1)
+
+def add_store_options(parser):
+    parser.add_argument('--store', help="results store path (default: ./results_store)")
+    parser.add_argument('--no-store', action='store_true', help="only write the CSV")
+
+def add_layout_options(parser):
+    parser.add_argument('--method', choices=METHODS, required=True)
+    parser.add_argument('--key', help="key used for scattered coefficient selection")
+    parser.add_argument('--channels', help="comma separated channels, e.g. Y,Cb (default: Y for dct, Cb for dwt)")
+    parser.add_argument('--subbands', default='HH,HL', help="dwt subbands (default: HH,HL)")
+    parser.add_argument('--levels', type=int, default=1, help="dwt decomposition levels (default: 1)")
+    parser.add_argument('--no-jpeg-domain', action='store_true', help="dct: decode JPEG covers to pixels instead of embedding in their coefficients")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='stego', description="DCT/DWT image steganography")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    embed = subparsers.add_parser('embed', help="embed a message into every cover of a folder (or tar/zip archive)")
+    embed.add_argument('input_folder', help="cover folder, or a .tar/.tar.gz/.zip archive of covers")
+    embed.add_argument('output_folder', help="stego folder, or the output archive when the input is an archive")
+    add_layout_options(embed)
+    embed.add_argument('--message', help="text to embed (dct default: the built-in test message)")
+    embed.add_argument('--message-file', help="read the text to embed from a file")
+    embed.add_argument('--csv', help="summary CSV (default: <method>_stego_results_<output folder name>.csv next to the output folder)")
+    embed.add_argument('--verify', choices=('fast', 'full', 'none'), default='fast')
+    embed.add_argument('--workers', type=int, help="worker processes splitting each cover into row bands (0 = one per CPU)")
+    add_store_options(embed)
+    embed.set_defaults(handler=run_embed)
+
+    extract = subparsers.add_parser('extract', help="extract the messages from a folder (or tar/zip archive) of stego images")
+    extract.add_argument('stego_folder', help="stego folder or archive")
+    add_layout_options(extract)
+    extract.add_argument('--expected', help="expected text written to the CSV for comparison (dct default: the built-in test message)")
+    extract.add_argument('--expected-file', help="read the expected text from a file")
+    extract.add_argument('--csv', help="results CSV (default: <method>_extracted_results_<tier>.csv next to the folder)")
+    add_store_options(extract)
+    extract.set_defaults(handler=run_extract)
+
+    analyze = subparsers.add_parser('analyze', help="BER and match analysis of an extraction CSV")
+    analyze.add_argument('input_csv')
+    analyze.add_argument('original_folder')
+    analyze.add_argument('stego_folder')
+    analyze.add_argument('--method', choices=METHODS, required=True)
+    analyze.add_argument('--tier', help="tier name (default: name of the stego folder)")
+    analyze.add_argument('--output', help="analysis CSV (default: <method>_<tier>_analysis.csv next to the input CSV)")
+    add_store_options(analyze)
+    analyze.set_defaults(handler=run_analyze)
+
+    stream = subparsers.add_parser('stream', help="spread one payload over a numbered frame sequence, or read a byte range back")
+    stream.add_argument('action', choices=('embed', 'extract'))
+    stream.add_argument('folder', help="frame folder (embed) or stego frame folder with its index (extract)")
+    add_layout_options(stream)
+    stream.add_argument('--payload-file', help="embed: file whose bytes are spread over the frames")
+    stream.add_argument('--output', help="embed: output folder for the stego frames; extract: file for the bytes (default: stdout)")
+    stream.add_argument('--offset', type=int, default=0, help="extract: first payload byte")
+    stream.add_argument('--length', type=int, help="extract: number of bytes (default: to the end)")
+    stream.set_defaults(handler=run_stream)
+
+    compare = subparsers.add_parser('compare', help="SSIM/PSNR of an original and a stego image (or two folders)")
+    compare.add_argument('original')
+    compare.add_argument('stego')
+    compare.add_argument('--csv', help="write the per-file results to a CSV")
+    compare.set_defaults(handler=run_compare)
+
+    scan = subparsers.add_parser('scan', help="chi-square/RS LSB steganalysis of image folders")
+    scan.add_argument('folders', nargs='*', help="image folders (default: every tier folder, e.g. ori/low, dct/low, dwt/low)")
+    scan.add_argument('--workers', type=int, help="folders scanned in parallel (default: one per CPU)")
+    scan.set_defaults(handler=run_scan)
+
+    robust = subparsers.add_parser('robustness', help="BER of the stego images under re-encoding, JPEG, noise, crop and rescale")
+    robust.add_argument('folders', nargs='*', help="stego folders (default: every tier folder under dct/ and dwt/)")
+    robust.add_argument('--method', choices=METHODS, help="extractor for the folders (default: both, by parent folder)")
+    robust.add_argument('--key', help="key used for scattered coefficient selection")
+    robust.add_argument('--channels', help="comma separated channels, e.g. Y,Cb (default: Y for dct, Cb for dwt)")
+    robust.add_argument('--subbands', default='HH,HL', help="dwt subbands (default: HH,HL)")
+    robust.add_argument('--levels', type=int, default=1, help="dwt decomposition levels (default: 1)")
+    robust.add_argument('--attacks', help="comma separated subset of robustness.ATTACKS (default: all)")
+    robust.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    robust.set_defaults(handler=run_robustness)
+
+    screen = subparsers.add_parser('screen', help="route each cover to dct, dwt or skip with a cheap sampled pre-screen")
+    screen.add_argument('input_folder')
+    screen.add_argument('--message', help="text the covers are screened for (default: the built-in test message)")
+    screen.add_argument('--message-file', help="read the text from a file")
+    screen.add_argument('--csv', help="screening CSV (default: <parent>_<tier>_screen.csv next to the input folder)")
+    screen.add_argument('--embed', metavar='OUTPUT_ROOT', help="also embed each routed cover into OUTPUT_ROOT/<method>/<tier>")
+    screen.add_argument('--verify', choices=('fast', 'full', 'none'), default='fast')
+    screen.set_defaults(handler=run_screen)
+
+    bench = subparsers.add_parser('bench', help="cold-start and per-subcommand import timings, optionally per-file throughput")
+    bench.add_argument('--folder', help="cover folder to time embedding and extraction on")
+    bench.add_argument('--method', choices=METHODS, help="only bench one method (default: both)")
+    bench.add_argument('--payloads', type=int, default=0, help="also time a fan-out of this many payloads into the folder's first cover")
+    bench.set_defaults(handler=run_bench)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Embedding layouts: which channels / subbands / DWT levels carry the payload, and the header word describing them."""
+
+# Plane indices of cv2's YCrCb image. dwt.py has always split it as (y, cb, cr), so 'Cb' is plane 1;
+# the names are kept that way so images embedded before layouts existed still extract.
+CHANNEL_INDEX = {'Y': 0, 'Cb': 1, 'Cr': 2}
+CHANNEL_BIT = {'Y': 1, 'Cb': 2, 'Cr': 4}
+SUBBAND_BIT = {'LH': 1, 'HL': 2, 'HH': 4}
+
+# Fill order. Each method's original target comes first, so the default layout reads the same coefficients as before.
+DWT_CHANNEL_ORDER = ('Cb', 'Cr', 'Y')
+DWT_SUBBAND_ORDER = ('HH', 'HL', 'LH')
+DCT_CHANNEL_ORDER = ('Y', 'Cb', 'Cr')
+
+DWT_DEFAULT_LAYOUT = (('Cb',), ('HH', 'HL'), 1)
+DCT_DEFAULT_CHANNELS = ('Y',)
+
+LAYOUT_CODE_BITS = 16
+
+def ordered(selection, order, kind):
+    """Validate a channel/subband selection and return it in fill order"""
+    unknown = [name for name in selection if name not in order]
+    if unknown or not selection:
+        raise ValueError(f"Invalid {kind} selection {tuple(selection)}, choose from {order}")
+    return tuple(name for name in order if name in selection)
+
+def dwt_layout(channels=('Cb',), subbands=('HH', 'HL'), levels=1):
+    """Normalized (channels, subbands, levels) for the DWT embedder"""
+    if not (1 <= int(levels) <= 15):
+        raise ValueError(f"Invalid DWT level count {levels}, choose 1-15")
+    return ordered(channels, DWT_CHANNEL_ORDER, 'channel'), ordered(subbands, DWT_SUBBAND_ORDER, 'subband'), int(levels)
+
+def dct_layout(channels=('Y',)):
+    """Normalized channel tuple for the DCT embedder"""
+    return ordered(channels, DCT_CHANNEL_ORDER, 'channel')
+
+def layout_code(channels, subbands=(), levels=1):
+    """16-bit header word: channel mask (high nibble), subband mask, level count (low byte)"""
+    channel_mask = sum(CHANNEL_BIT[name] for name in channels)
+    subband_mask = sum(SUBBAND_BIT[name] for name in subbands)
+    return (channel_mask << 12) | (subband_mask << 8) | levels
+
+def dct_layout_code(channels):
+    """Layout word the DCT embedder writes after the length header; the original Y layout has none"""
+    if channels == DCT_DEFAULT_CHANNELS:
+        return None
+    return layout_code(channels)
+
+def describe_layout(channels, subbands=(), levels=1):
+    """Readable layout, e.g. 'Cb+Cr HH+HL L2'"""
+    description = '+'.join(channels)
+    if subbands:
+        description += f" {'+'.join(subbands)} L{levels}"
+    return description
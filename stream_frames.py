@@ -0,0 +1,205 @@
+"""Streaming mode for numbered frame sequences (PNG/TIFF exported from video).
+
+One continuous payload is spread over the frames: a running cursor hands each frame as many payload
+bytes as its DCT/DWT capacity holds, and every frame carries its own length header, so it can be read
+on its own. Each stego frame is verified after embedding; when its chunk doesn't survive, the chunk is
+shrunk and embedded again before the frame goes into the index.
+
+Frames are embedded in their top-left region aligned to the transform (8x8 blocks for DCT, 2^levels for
+DWT). The stego frames keep the size of the source frames, and no payload lands in the padding the
+embedders add to odd sizes. Decoding, embedding and encoding run in separate threads with bounded queues.
+
+The index written next to the stego frames maps each frame to its payload byte range, so extraction can
+start at any offset and only decodes the frames it needs.
+"""
+import os
+import re
+import json
+import zlib
+import queue
+import threading
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import cv2
+import bitstring
+
+import dct_data_embedding as stego
+import dct_verification as verify_dct
+import stego_layout
+import fanout
+import dwt
+
+FRAME_EXTENSIONS = ('.png', '.tif', '.tiff')
+# Frames decoded ahead of / waiting to be written behind the embedder
+QUEUE_DEPTH = 4
+INDEX_NAME = "stream_index.json"
+# Share of a chunk kept when its frame fails verification
+SHRINK_FACTOR = 0.75
+
+def frame_sort_key(name):
+    """Natural order, so frame_10 comes after frame_9"""
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', name)]
+
+def read_frames(folder):
+    """Yield (filename, image) for the frames of a folder in frame order"""
+    for name in sorted((f for f in os.listdir(folder) if f.lower().endswith(FRAME_EXTENSIONS)), key=frame_sort_key):
+        image = cv2.imread(os.path.join(folder, name), flags=cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Failed to read frame {name}")
+        yield name, image
+
+def prefetch(items, depth=QUEUE_DEPTH):
+    """Run a generator in a background thread, at most `depth` items ahead of the consumer"""
+    buffer = queue.Queue(maxsize=depth)
+    finished = object()
+
+    def produce():
+        try:
+            for item in items:
+                buffer.put(item)
+        except BaseException as e:
+            buffer.put(e)
+        buffer.put(finished)
+
+    threading.Thread(target=produce, daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is finished:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+
+def aligned_region(image, method, layout):
+    """Top-left part of a frame whose size is a multiple of the transform's block (8 for DCT, 2^levels for DWT)"""
+    multiple = 8 if method == 'dct' else 2 ** stego_layout.dwt_layout(**layout)[2]
+    height, width = image.shape[:2]
+    return image[:height - height % multiple, :width - width % multiple]
+
+def open_cover(image, method, key, layout):
+    if method == 'dct':
+        return fanout.DCT_Cover(aligned_region(image, method, layout), key, **layout)
+    return fanout.DWT_Cover(aligned_region(image, method, layout), key, **layout)
+
+def paste_region(image, region):
+    stego_image = image.copy()
+    stego_image[:region.shape[0], :region.shape[1]] = region
+    return stego_image
+
+def embed_chunk(cover, image, method, key, chunk):
+    '''
+    Embed one chunk into a frame and verify it
+    :return: (stego frame at the source size, True if the chunk reads back intact)
+    '''
+    if method == 'dct':
+        encoded_bits = bitstring.BitStream(bytes=chunk)
+        region = cover.embed(encoded_bits)
+        return paste_region(image, region), verify_dct.verify_embedded_data(region, encoded_bits, key=key, channels=cover.channel_names)
+    # Bytes map one-to-one onto the 8-bit characters dwt.text_to_binary writes
+    text = chunk.decode('latin-1')
+    region = cover.embed(text)
+    return paste_region(image, region), dwt.verify_text_in_image(region, text, key, *cover.layout)
+
+def embed_verified(cover, image, method, key, chunk):
+    '''
+    Embed the largest prefix of chunk that survives, shrinking it by SHRINK_FACTOR after each failed verification
+    :return: (stego frame, number of embedded bytes); the frame is returned unchanged when nothing survives
+    '''
+    length = len(chunk)
+    while length > 0:
+        stego_image, verified = embed_chunk(cover, image, method, key, chunk[:length])
+        if verified:
+            return stego_image, length
+        length = min(int(length * SHRINK_FACTOR), length - 1)
+    return image, 0
+
+def extract_chunk(image, method, key, layout):
+    """Payload bytes of one stego frame"""
+    if method == 'dct':
+        channel_names = stego_layout.dct_layout(layout.get('channels', stego_layout.DCT_DEFAULT_CHANNELS))
+        layout_code = stego_layout.dct_layout_code(channel_names)
+        return stego.decode_extracted_bytes(fanout.recovered_coefficient_data(aligned_region(image, method, layout), key, channel_names), layout_code)
+    channels, subbands, levels = stego_layout.dwt_layout(**layout)
+    bits = dwt.extract_bits_from_image(aligned_region(image, method, layout), key, channels, subbands, levels).astype(np.uint8)
+    header = dwt.layout_header(channels, subbands, levels)
+    text_length = int.from_bytes(np.packbits(bits[:32]).tobytes(), 'big')
+    if ''.join(map(str, bits[32:32 + len(header)])) != header:
+        raise ValueError("Layout mismatch")
+    start = 32 + len(header)
+    return np.packbits(bits[start:start + text_length]).tobytes()
+
+def stego_frame_name(name):
+    stem, ext = os.path.splitext(name)
+    return f"{stem}_stego{ext if ext.lower() in FRAME_EXTENSIONS else '.png'}"
+
+def embed_stream(frames, payload, output_folder, method='dwt', key=None, index_path=None, **layout):
+    '''
+    Embed one payload across a sequence of frames
+    :param frames: iterable of (filename, BGR image), e.g. read_frames(folder)
+    :param payload: bytes to spread over the frames
+    :param layout: channels for dct; channels, subbands, levels for dwt
+    :return: the index written to index_path (default: stream_index.json in output_folder)
+    '''
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+    index = {'method': method, 'key_used': key is not None, 'layout': layout, 'payload_bytes': len(payload), 'frames': []}
+    cursor = 0
+    pending = collections.deque()
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for name, image in prefetch(frames):
+            out_name = stego_frame_name(name)
+            if cursor < len(payload):
+                cover = open_cover(image, method, key, layout)
+                image, length = embed_verified(cover, image, method, key, payload[cursor:cursor + cover.capacity_bits // 8])
+                if length:
+                    chunk = payload[cursor:cursor + length]
+                    index['frames'].append({'frame': name, 'stego': out_name, 'offset': cursor, 'length': length,
+                                            'crc32': zlib.crc32(chunk)})
+                    cursor += length
+            # Frames after the end of the payload are written unchanged, so the sequence stays complete
+            pending.append(writer.submit(cv2.imwrite, os.path.join(output_folder, out_name), image))
+            while len(pending) > QUEUE_DEPTH:
+                pending.popleft().result()
+        for result in pending:
+            result.result()
+    index['embedded_bytes'] = cursor
+    if cursor < len(payload):
+        print(f"Frames ran out: embedded {cursor} of {len(payload)} payload bytes")
+    with open(index_path or os.path.join(output_folder, INDEX_NAME), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=1)
+    return index
+
+def embed_frame_folder(folder, payload, output_folder, method='dwt', key=None, **layout):
+    """embed_stream over the frames of a folder"""
+    return embed_stream(read_frames(folder), payload, output_folder, method, key, **layout)
+
+def extract_stream(stego_folder, offset=0, length=None, key=None, index_path=None):
+    '''
+    Payload bytes [offset, offset + length) of a stego frame sequence, decoding only the frames holding them
+    :param key: key used when embedding, if any
+    :return: bytes; frames whose data fails its CRC are reported and returned as decoded
+    '''
+    with open(index_path or os.path.join(stego_folder, INDEX_NAME), encoding='utf-8') as f:
+        index = json.load(f)
+    end = index['embedded_bytes'] if length is None else min(offset + length, index['embedded_bytes'])
+    needed = [entry for entry in index['frames'] if entry['offset'] < end and entry['offset'] + entry['length'] > offset]
+
+    def decode(entry):
+        image = cv2.imread(os.path.join(stego_folder, entry['stego']), flags=cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError(f"Failed to read frame {entry['stego']}")
+        return entry, image
+
+    data = bytearray()
+    for entry, image in prefetch(decode(entry) for entry in needed):
+        chunk = extract_chunk(image, index['method'], key, index['layout'])
+        if len(chunk) != entry['length'] or zlib.crc32(chunk) != entry['crc32']:
+            print(f"Corrupted payload in {entry['stego']} (bytes {entry['offset']}-{entry['offset'] + entry['length']})")
+        # Keep the frame's byte range aligned even when its length header was damaged
+        data += chunk[:entry['length']].ljust(entry['length'], b'\0')
+    if not needed:
+        return b''
+    start = offset - needed[0]['offset']
+    return bytes(data[start:start + end - offset])
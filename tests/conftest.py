@@ -0,0 +1,18 @@
+import os
+import sys
+
+import cv2
+import pytest
+
+# The modules live flat in the repository root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def cover_crop(number, height, width):
+    """Top-left crop of one of the low tier covers"""
+    image = cv2.imread(os.path.join(ROOT, "ori", "low", f"low_{number}.png"), cv2.IMREAD_COLOR)
+    return image[:height, :width].copy()
+
+@pytest.fixture
+def make_cover():
+    return cover_crop
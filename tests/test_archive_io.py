@@ -0,0 +1,39 @@
+import io
+import csv
+import tarfile
+import zipfile
+
+import cv2
+import pytest
+
+import archive_io
+
+MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+
+def write_cover_tar(path, covers):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in covers.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+def read_csv(data):
+    return list(csv.DictReader(io.StringIO(data.decode('utf-8'))))
+
+@pytest.mark.parametrize("method", ['dct', 'dwt'])
+def test_archive_embed_and_extract_round_trip(tmp_path, make_cover, method):
+    covers = {"covers/a.png": cv2.imencode('.png', make_cover(1, 200, 300))[1].tobytes(),
+              "covers/b.jpg": cv2.imencode('.jpg', make_cover(16, 160, 240))[1].tobytes()}
+    input_archive = str(tmp_path / "covers_low.tar.gz")
+    write_cover_tar(input_archive, covers)
+    output_archive = str(tmp_path / "stego_low.zip")
+
+    assert archive_io.embed_archive(input_archive, output_archive, MESSAGE, method, store_path=None) == 2
+
+    with zipfile.ZipFile(output_archive) as archive:
+        embedded = read_csv(archive.read(f"{method}_stego_results_covers_low.csv"))
+    assert [row["verified"] for row in embedded] == ["True", "True"]
+    csv_path = tmp_path / "extract.csv"
+    assert archive_io.extract_archive(output_archive, str(csv_path), MESSAGE, method, store_path=None) == 2
+    extracted = read_csv(csv_path.read_bytes())
+    assert {row["filename"]: row["extracted"] for row in extracted} == {row["stego filename"]: row["embedded_message"] for row in embedded}
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+import dwt
+import fanout
+from dct_run_stego_algorithm import SECRET_MESSAGE_STRING
+
+def embedded_bits(text, levels):
+    full_data = format(len(dwt.text_to_binary(text)), '032b') + dwt.layout_header(('Cb',), ('HH', 'HL'), levels) + dwt.text_to_binary(text)
+    return np.frombuffer(full_data.encode('ascii'), dtype=np.uint8) - ord('0')
+
+@pytest.mark.parametrize("number", [1, 3, 16])
+@pytest.mark.parametrize("levels", [1, 2])
+def test_keyed_round_trip_on_real_covers(make_cover, number, levels):
+    image = make_cover(number, 200, 300)
+
+    stego_image = dwt.embed_text_in_image(image, SECRET_MESSAGE_STRING, "secret", levels=levels)
+
+    assert dwt.extract_text_from_image(stego_image, "secret", levels=levels) == SECRET_MESSAGE_STRING
+    assert dwt.verify_text_in_image(stego_image, SECRET_MESSAGE_STRING, "secret", levels=levels)
+
+def test_keyed_groups_that_do_not_settle_only_flip_bits(make_cover):
+    # Dark cover: some pixel groups clip whatever value they are given
+    image = make_cover(18, 200, 300)
+    bits = embedded_bits(SECRET_MESSAGE_STRING, 1)
+
+    stego_image = dwt.embed_text_in_image(image, SECRET_MESSAGE_STRING, "secret")
+
+    # A fill order shifted by one coefficient would get about half of the bits wrong
+    assert np.mean(dwt.extract_bits_from_image(stego_image, "secret")[:len(bits)] != bits) < 0.02
+
+@pytest.mark.parametrize("key, levels", [(None, 1), (None, 2), ("secret", 1), ("secret", 2)])
+def test_fill_capacity_bits_counts_the_fill_order(make_cover, key, levels):
+    image = make_cover(1, 200, 300)
+
+    capacity_bits = dwt.fill_capacity_bits(image, key, levels=levels)
+
+    assert capacity_bits == len(fanout.DWT_Cover(image, key, levels=levels).order)
+    if key is not None:
+        # Only finest-level coefficients that round-trip carry keyed bits
+        assert capacity_bits <= dwt.dwt_capacity_bits(image.shape, levels=1) < dwt.dwt_capacity_bits(image.shape, levels=2)
@@ -0,0 +1,59 @@
+import cv2
+import pytest
+
+import dct_run_stego_algorithm
+import dct_data_embedding as stego
+import fanout
+import dwt
+
+MESSAGES = ["Lorem ipsum dolor sit amet, consectetur adipiscing elit.", "Curabitur dictum justo eget est maximus."]
+
+@pytest.mark.parametrize("key, channels", [(None, ('Y',)), ("secret", ('Y',)), (None, ('Y', 'Cb')), ("secret", ('Y', 'Cb', 'Cr'))])
+def test_dct_cover_matches_serial_embedder(tmp_path, make_cover, key, channels):
+    image = make_cover(16, 203, 301)
+    cover = fanout.DCT_Cover(image, key, channels)
+    for index, message in enumerate(MESSAGES):
+        covers = tmp_path / f"covers_{index}"
+        covers.mkdir()
+        cv2.imwrite(str(covers / "cover.png"), image)
+        dct_run_stego_algorithm.embed_folder(str(covers), str(tmp_path / f"serial_{index}"), str(tmp_path / f"serial_{index}.csv"), message,
+                                             verify_mode=None, key=key, channels=channels, parallel_workers=None,
+                                             jpeg_coefficient_mode=False, results_store_path=None)
+        serial = cv2.imread(str(tmp_path / f"serial_{index}" / "cover_stego.png"), cv2.IMREAD_COLOR)
+
+        stego_image = cover.embed(fanout.text_to_encoded_bits(message[:cover.capacity_bits // 8]))
+
+        assert stego_image.tobytes() == serial.tobytes()
+
+@pytest.mark.parametrize("key, layout", [(None, (('Cb',), ('HH', 'HL'), 1)), ("secret", (('Cb',), ('HH', 'HL'), 1)),
+                                         ("secret", (('Cb',), ('HH', 'HL'), 2)), (None, (('Y', 'Cb', 'Cr'), ('HH',), 1))])
+def test_dwt_cover_matches_serial_embedder(make_cover, key, layout):
+    image = make_cover(1, 203, 301)
+    cover = fanout.DWT_Cover(image, key, *layout)
+    for message in MESSAGES:
+        serial = dwt.embed_text_in_image(image, message, key, *layout)
+
+        assert cover.embed(message).tobytes() == serial.tobytes()
+
+def test_payload_over_capacity_raises(make_cover):
+    image = make_cover(1, 96, 128)
+    dct_cover = fanout.DCT_Cover(image)
+    dwt_cover = fanout.DWT_Cover(image)
+    long_message = MESSAGES[0] * 40
+
+    with pytest.raises(ValueError, match="Insufficient capacity"):
+        dct_cover.embed(fanout.text_to_encoded_bits(long_message))
+    with pytest.raises(ValueError, match="Insufficient capacity"):
+        dwt_cover.embed(long_message)
+    with pytest.raises(ValueError, match="Insufficient capacity"):
+        dwt.embed_text_in_image(image, long_message)
+
+def test_wrong_key_does_not_recover_the_payload(make_cover):
+    image = make_cover(1, 200, 296)
+    dct_stego = fanout.DCT_Cover(image, "secret").embed(fanout.text_to_encoded_bits(MESSAGES[0]))
+    dwt_stego = fanout.DWT_Cover(image, "secret").embed(MESSAGES[0])
+
+    assert stego.decode_extracted_data(fanout.recovered_coefficient_data(dct_stego, "secret", ('Y',))) == MESSAGES[0]
+    assert stego.decode_extracted_data(fanout.recovered_coefficient_data(dct_stego, "other", ('Y',))) != MESSAGES[0]
+    assert dwt.extract_text_from_image(dwt_stego, "secret") == MESSAGES[0]
+    assert dwt.extract_text_from_image(dwt_stego, "other") != MESSAGES[0]
@@ -0,0 +1,69 @@
+import csv
+
+import cv2
+import pytest
+
+import dct_jpeg_domain as jpeg_domain
+import dct_data_embedding as stego
+import dct_run_stego_algorithm as run_stego
+
+MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+
+def encode_jpeg(image, params=()):
+    success, encoded = cv2.imencode('.jpg', image, list(params))
+    assert success
+    return encoded.tobytes()
+
+@pytest.mark.parametrize("name, size, params", [
+    ("q75", (203, 301), (cv2.IMWRITE_JPEG_QUALITY, 75)),
+    ("q100", (203, 301), (cv2.IMWRITE_JPEG_QUALITY, 100)),
+    ("grayscale", (203, 301), ()),
+    ("restart_interval", (203, 301), (cv2.IMWRITE_JPEG_RST_INTERVAL, 4)),
+    ("odd_size", (97, 131), ()),
+])
+def test_parse_and_reencode_is_byte_identical(make_cover, name, size, params):
+    image = make_cover(3, *size)
+    if name == "grayscale":
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    cover_bytes = encode_jpeg(image, params)
+    if name == "restart_interval":
+        assert b'\xff\xdd' in cover_bytes
+
+    jpeg = jpeg_domain.read_jpeg_coefficients(cover_bytes)
+
+    assert (jpeg.width, jpeg.height) == (size[1], size[0])
+    assert jpeg_domain.write_jpeg_coefficients(jpeg) == cover_bytes
+
+def test_progressive_jpeg_is_rejected(make_cover):
+    cover_bytes = encode_jpeg(make_cover(3, 203, 301), (cv2.IMWRITE_JPEG_PROGRESSIVE, 1))
+
+    with pytest.raises(ValueError):
+        jpeg_domain.read_jpeg_coefficients(cover_bytes)
+
+@pytest.mark.parametrize("key", [None, "secret"])
+def test_embed_folder_round_trips_a_jpeg_cover(tmp_path, make_cover, key):
+    cover_folder = tmp_path / "low"
+    cover_folder.mkdir()
+    (cover_folder / "a.jpg").write_bytes(encode_jpeg(make_cover(16, 160, 240)))
+    output_csv = tmp_path / "embed.csv"
+
+    assert run_stego.embed_folder(str(cover_folder), str(tmp_path / "stego"), str(output_csv), MESSAGE, verify_mode='fast',
+                                  key=key, jpeg_coefficient_mode=True, results_store_path=None) == 1
+
+    row = list(csv.DictReader(output_csv.open(encoding='utf-8')))[0]
+    assert row["verified"] == "True"
+    stego_jpeg = jpeg_domain.read_jpeg_coefficients((tmp_path / "stego" / "a_stego.jpg").read_bytes())
+    assert stego.decode_extracted_data(jpeg_domain.extract_encoded_data_from_JPEG(stego_jpeg, key=key)) == MESSAGE
+
+def test_embed_folder_rejects_chroma_layouts_for_jpeg_covers(tmp_path, make_cover):
+    cover_folder = tmp_path / "low"
+    cover_folder.mkdir()
+    (cover_folder / "a.jpg").write_bytes(encode_jpeg(make_cover(16, 160, 240)))
+    output_csv = tmp_path / "embed.csv"
+
+    assert run_stego.embed_folder(str(cover_folder), str(tmp_path / "stego"), str(output_csv), MESSAGE, channels=('Y', 'Cb'),
+                                  jpeg_coefficient_mode=True, results_store_path=None) == 0
+
+    row = list(csv.DictReader(output_csv.open(encoding='utf-8')))[0]
+    assert row["original_size"].startswith("[ERROR: JPEG coefficient mode embeds into Y only")
+    assert not (tmp_path / "stego" / "a_stego.jpg").exists()
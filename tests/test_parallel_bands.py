@@ -0,0 +1,63 @@
+import os
+
+import bitstring
+import cv2
+import pytest
+
+import dct_run_stego_algorithm
+import dct_verification as verify
+import dwt
+import parallel_bands
+
+MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. Curabitur dictum justo eget est maximus."
+
+@pytest.mark.parametrize("size", [(203, 301), (256, 320)])
+def test_dwt_bands_match_serial_embedder(make_cover, size):
+    image = make_cover(1, *size)
+
+    serial = dwt.embed_text_in_image(image, MESSAGE)
+    parallel = dwt.embed_text_in_image(image, MESSAGE, workers=2)
+
+    assert parallel.shape == serial.shape
+    assert parallel.tobytes() == serial.tobytes()
+
+def test_dct_bands_match_serial_embedder(tmp_path, make_cover):
+    covers = tmp_path / "covers"
+    covers.mkdir()
+    for number, size in ((1, (203, 301)), (16, (256, 320))):
+        cv2.imwrite(str(covers / f"cover_{number}.png"), make_cover(number, *size))
+
+    outputs = {}
+    for name, workers in (("serial", None), ("parallel", 2)):
+        dct_run_stego_algorithm.embed_folder(str(covers), str(tmp_path / name), str(tmp_path / f"{name}.csv"), MESSAGE,
+                                             verify_mode=None, key=None, channels=('Y',), parallel_workers=workers,
+                                             jpeg_coefficient_mode=False, results_store_path=None)
+        outputs[name] = {path.name: path.read_bytes() for path in sorted((tmp_path / name).iterdir())}
+
+    assert len(outputs["serial"]) == 2
+    assert outputs["parallel"] == outputs["serial"]
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="needs /dev/shm to list shared memory")
+def test_dct_bands_release_shared_memory_when_a_cover_fails(tmp_path, make_cover):
+    covers = tmp_path / "covers"
+    covers.mkdir()
+    for number in (1, 16):
+        cv2.imwrite(str(covers / f"cover_{number}.png"), make_cover(number, 160, 240))
+    before = set(os.listdir("/dev/shm"))
+
+    # The message fails to encode after the forward stage has filled the shared buffers
+    count = dct_run_stego_algorithm.embed_folder(str(covers), str(tmp_path / "stego"), str(tmp_path / "embed.csv"), "Grüße",
+                                                 verify_mode=None, key=None, channels=('Y',), parallel_workers=2,
+                                                 jpeg_coefficient_mode=False, results_store_path=None)
+
+    assert count == 0
+    assert set(os.listdir("/dev/shm")) - before == set()
+
+def test_band_pool_serves_covers_of_different_sizes(make_cover):
+    with parallel_bands.Band_Pool(2) as band_pool:
+        for number, size in ((1, (160, 240)), (3, (200, 320))):
+            image = make_cover(number, *size)
+            with parallel_bands.DCT_Band_Job(image, band_pool) as band_job:
+                stego_image = band_job.embed(bitstring.Bits(bytes=b"hello"))
+            assert stego_image.shape == image.shape
+            assert verify.verify_embedded_data(stego_image, bitstring.Bits(bytes=b"hello"))
@@ -0,0 +1,36 @@
+import cv2
+import numpy as np
+
+import prescreen
+
+def test_textured_cover_is_routed(make_cover):
+    result = prescreen.screen_image(make_cover(1, 200, 296))
+
+    assert result['route'] in ('dct', 'dwt')
+    assert max(result['dct_score'], result['dwt_score']) >= prescreen.MIN_SCORE
+
+def test_cover_too_small_for_the_message_is_skipped(make_cover):
+    result = prescreen.screen_image(make_cover(1, 40, 40))
+
+    assert result['route'] == 'skip'
+    assert result['dct_score'] == result['dwt_score'] == 0.0
+
+def test_saturated_chroma_is_a_dwt_risk():
+    # Pure blue: Cb sits at 255 and clips the embedded HH/HL values
+    blue = np.zeros((200, 296, 3), dtype=np.uint8)
+    blue[..., 0] = 255
+
+    result = prescreen.screen_image(blue)
+
+    assert result['dwt_bit_error_rate'] > 0.3
+    assert result['route'] == 'skip'
+
+def test_screen_folder_writes_a_row_per_cover(tmp_path, make_cover):
+    cv2.imwrite(str(tmp_path / "a.png"), make_cover(1, 200, 296))
+    cv2.imwrite(str(tmp_path / "b.png"), make_cover(1, 40, 40))
+    csv_path = tmp_path / "screen.csv"
+
+    routes = prescreen.screen_folder(str(tmp_path), str(csv_path))
+
+    assert routes["b.png"] == 'skip' and routes["a.png"] != 'skip'
+    assert len(csv_path.read_text(encoding="utf-8").splitlines()) == 3
@@ -0,0 +1,36 @@
+import pytest
+
+import results_store
+
+pytest.importorskip("pyarrow")
+
+ANALYSIS_CSV = (
+    "filename,original size,stego size,size percentage increase,extracted,expected,analysis,BER %\r\n"
+    "low_1_stego.png,1000,1500,500.000,abcd,abcd,Match,0\r\n"
+    "low_2_stego.png,2000,3000,5.000.000,abcd,abce,Slightly Different,1.25\r\n"
+    ",,,,,,,\r\n"
+    ",,,,,,,\r\n"
+    "low_3_stego.png,,,,,abcd,,\r\n"
+)
+
+def test_import_skips_blank_rows(tmp_path):
+    csv_path = tmp_path / "dct_low_analysis.csv"
+    csv_path.write_bytes(ANALYSIS_CSV.encode('utf-8'))
+    store_path = str(tmp_path / "store")
+
+    results_store.import_analysis_csv(str(csv_path), 'dct', 'low', store_path)
+
+    summary = results_store.tier_summary(store_path).iloc[0]
+    assert summary['images'] == 2
+    assert summary['mean_size_increase_pct'] == pytest.approx(50.0)
+    # "abcd" vs "abce": 1 of 32 bits, averaged with the match
+    assert summary['mean_ber_pct'] == pytest.approx(1.5625)
+    assert summary['matches'] == 1
+
+def test_parse_legacy_number_repairs_regrouped_digits():
+    assert results_store.parse_legacy_number("1.548.608") == pytest.approx(154.8608)
+    assert results_store.parse_legacy_number("12.5") == 12.5
+    assert results_store.parse_legacy_number("") is None
+
+def test_append_to_results_store_without_path_is_a_no_op():
+    assert results_store.append_to_results_store([{'algorithm': 'dct', 'stage': 'embed'}], None) is None
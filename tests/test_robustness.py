@@ -0,0 +1,37 @@
+import cv2
+
+import robustness
+import dwt
+
+MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+
+def test_attacks_on_a_dwt_stego_image(tmp_path, make_cover):
+    stego_path = tmp_path / "a_stego.png"
+    cv2.imwrite(str(stego_path), dwt.embed_text_in_image(make_cover(1, 200, 296), MESSAGE))
+    attack_names = ('none', 'png', 'crop_8', 'rescale_50')
+
+    rows = robustness.attack_image((str(stego_path), 'dwt', MESSAGE, MESSAGE, attack_names, None, {}))
+
+    results = {row[1]: row for row in rows}
+    assert list(results) == list(attack_names)
+    assert results['none'][3] == MESSAGE and results['none'][5] == 0
+    assert results['png'][5] == 0
+    assert results['crop_8'][2] == "288x192"
+    assert results['rescale_50'][5] > 0
+
+def test_unreadable_stego_image_gives_an_error_row_per_attack(tmp_path):
+    stego_path = tmp_path / "a_stego.png"
+    stego_path.write_bytes(b"not an image")
+
+    rows = robustness.attack_image((str(stego_path), 'dct', None, MESSAGE, ('none', 'png'), None, {}))
+
+    assert [row[-1] for row in rows] == ["Failed to read image"] * 2
+
+def test_embedded_messages_are_keyed_by_stego_filename(tmp_path):
+    embed_csv = tmp_path / "dct_stego_results_low.csv"
+    embed_csv.write_text("filename,original_size,stego_size,resolution,embedded_message,verified\n"
+                         "a.png,1,2,8x8,hello,True\n"
+                         "b.jpg,[ERROR: bad],,,,\n", encoding="utf-8")
+
+    assert robustness.embedded_messages(str(embed_csv)) == {"a_stego.png": "hello"}
+    assert robustness.embedded_messages(str(tmp_path / "missing.csv")) == {}
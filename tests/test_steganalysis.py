@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import steganalysis
+import fanout
+import dwt
+from dct_run_stego_algorithm import SECRET_MESSAGE_STRING
+
+@pytest.mark.parametrize("number", [3, 6])
+def test_cover_scores_below_its_stego_images(make_cover, number):
+    image = make_cover(number, 240, 320)
+    cover = fanout.DCT_Cover(image)
+    dct_stego = cover.embed(fanout.text_to_encoded_bits(SECRET_MESSAGE_STRING[:cover.capacity_bits // 8]))
+    dwt_stego = dwt.embed_text_in_image(image, SECRET_MESSAGE_STRING)
+
+    cover_score = steganalysis.scan_image(image)[-1]
+
+    assert cover_score < 0.1
+    assert steganalysis.scan_image(dct_stego)[-1] > cover_score + 0.5
+    assert steganalysis.scan_image(dwt_stego)[-1] > cover_score + 0.5
+
+def test_leading_fill_of_a_single_pair():
+    rng = np.random.default_rng(0)
+    flat = np.zeros(4096, dtype=np.int64)
+    half_filled = flat.copy()
+    half_filled[:512] = rng.integers(0, 2, 512)
+
+    assert steganalysis.leading_fill(flat) == 0.0
+    # Half of the leading values carry random bits, so a quarter of them turned odd
+    assert steganalysis.leading_fill(half_filled) == pytest.approx(0.5, abs=0.1)
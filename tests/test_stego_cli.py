@@ -0,0 +1,20 @@
+import cv2
+import pytest
+
+import stego
+
+def test_embed_csv_is_named_after_the_stego_folder(tmp_path, make_cover):
+    cover_folder = tmp_path / "ori" / "low"
+    cover_folder.mkdir(parents=True)
+    cv2.imwrite(str(cover_folder / "a.png"), make_cover(1, 200, 300))
+    stego_folder = tmp_path / "dwt" / "low_keyed"
+
+    stego.main(['embed', '--method', 'dwt', str(cover_folder), str(stego_folder), '--message', "hello", '--no-store'])
+
+    # robustness and extract find the embedded messages by the stego folder's name
+    assert (tmp_path / "dwt" / "dwt_stego_results_low_keyed.csv").exists()
+    assert not (tmp_path / "dwt" / "dwt_stego_results_low.csv").exists()
+
+def test_dwt_extract_needs_the_expected_text(tmp_path):
+    with pytest.raises(SystemExit, match="--expected"):
+        stego.main(['extract', '--method', 'dwt', str(tmp_path), '--no-store'])
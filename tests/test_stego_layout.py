@@ -0,0 +1,41 @@
+import pytest
+
+import stego_layout
+import dct_data_embedding as stego
+import fanout
+import dwt
+
+MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+
+def test_layout_words():
+    assert stego_layout.dct_layout_code(('Y',)) is None
+    assert stego_layout.dct_layout_code(('Y', 'Cb')) == 0x3001
+    assert dwt.layout_header(*stego_layout.DWT_DEFAULT_LAYOUT) == ''
+    assert dwt.layout_header(('Cb', 'Cr'), ('HH', 'HL'), 2) == format(0x6602, '016b')
+
+def test_selections_are_validated_and_put_in_fill_order():
+    assert stego_layout.dct_layout(('Cr', 'Y')) == ('Y', 'Cr')
+    assert stego_layout.dwt_layout(('Y', 'Cb'), ('HL', 'HH'), 2) == (('Cb', 'Y'), ('HH', 'HL'), 2)
+    with pytest.raises(ValueError):
+        stego_layout.dct_layout(('R',))
+    with pytest.raises(ValueError):
+        stego_layout.dwt_layout(('Cb',), (), 1)
+    with pytest.raises(ValueError):
+        stego_layout.dwt_layout(('Cb',), ('HH',), 16)
+
+def test_dct_layout_word_is_checked_on_extraction(make_cover):
+    stego_image = fanout.DCT_Cover(make_cover(3, 200, 296), channels=('Y', 'Cb')).embed(fanout.text_to_encoded_bits(MESSAGE))
+    layout_code = stego_layout.dct_layout_code(('Y', 'Cb'))
+
+    assert stego.decode_extracted_data(fanout.recovered_coefficient_data(stego_image, None, ('Y', 'Cb')), layout_code) == MESSAGE
+    with pytest.raises(ValueError, match="Layout mismatch"):
+        stego.decode_extracted_data(fanout.recovered_coefficient_data(stego_image, None, ('Y', 'Cr')), stego_layout.dct_layout_code(('Y', 'Cr')))
+
+@pytest.mark.parametrize("layout", [(('Cb', 'Cr'), ('HH', 'HL'), 1), (('Cb',), ('HH', 'HL', 'LH'), 2)])
+def test_dwt_layouts_round_trip_and_add_capacity(make_cover, layout):
+    image = make_cover(3, 200, 296)
+
+    stego_image = dwt.embed_text_in_image(image, MESSAGE, None, *layout)
+
+    assert dwt.extract_text_from_image(stego_image, None, *layout) == MESSAGE
+    assert dwt.dwt_capacity_bits(image.shape, *layout) > dwt.dwt_capacity_bits(image.shape, *stego_layout.DWT_DEFAULT_LAYOUT)
@@ -0,0 +1,79 @@
+import os
+import zlib
+import json
+
+import cv2
+import pytest
+
+import stream_frames
+
+@pytest.mark.parametrize("method", ['dct', 'dwt'])
+def test_stream_round_trip(tmp_path, make_cover, method):
+    frames_folder = tmp_path / "frames"
+    frames_folder.mkdir()
+    for index, number in enumerate((1, 3, 16, 20)):
+        # Odd size: DCT frames must come back at the source size
+        cv2.imwrite(str(frames_folder / f"frame_{index}.png"), make_cover(number, 203, 301))
+    payload = os.urandom(2500 if method == 'dct' else 12000)
+    output_folder = tmp_path / "stego"
+
+    index = stream_frames.embed_frame_folder(str(frames_folder), payload, str(output_folder), method)
+
+    assert index['embedded_bytes'] > 0
+    with open(output_folder / stream_frames.INDEX_NAME, encoding='utf-8') as f:
+        assert json.load(f) == index
+    for entry in index['frames']:
+        stego_frame = cv2.imread(str(output_folder / entry['stego']))
+        assert stego_frame.shape == (203, 301, 3)
+        chunk = stream_frames.extract_chunk(stego_frame, method, None, index['layout'])
+        assert len(chunk) == entry['length']
+        assert zlib.crc32(chunk) == entry['crc32']
+    assert stream_frames.extract_stream(str(output_folder)) == payload[:index['embedded_bytes']]
+    offset, length = index['embedded_bytes'] // 3, index['embedded_bytes'] // 2
+    assert stream_frames.extract_stream(str(output_folder), offset=offset, length=length) == payload[offset:offset + length]
+
+@pytest.fixture
+def keyed_stream(tmp_path, make_cover):
+    frames_folder = tmp_path / "frames"
+    frames_folder.mkdir()
+    for index, number in enumerate((1, 3)):
+        cv2.imwrite(str(frames_folder / f"frame_{index}.png"), make_cover(number, 120, 160))
+    payload = os.urandom(1500)
+    output_folder = tmp_path / "stego"
+    index = stream_frames.embed_frame_folder(str(frames_folder), payload, str(output_folder), 'dwt', "secret")
+    assert index['embedded_bytes'] == len(payload) and len(index['frames']) == 2
+    return frames_folder, output_folder, payload
+
+def test_wrong_key_is_reported_and_keeps_the_byte_ranges(keyed_stream, capsys):
+    _, output_folder, payload = keyed_stream
+
+    data = stream_frames.extract_stream(str(output_folder), key="other")
+
+    assert len(data) == len(payload) and data != payload
+    assert "Corrupted payload in frame_0_stego.png" in capsys.readouterr().out
+    assert stream_frames.extract_stream(str(output_folder), key="secret") == payload
+
+def test_missing_index_or_frame_raises(keyed_stream):
+    frames_folder, output_folder, payload = keyed_stream
+
+    with pytest.raises(FileNotFoundError):
+        stream_frames.extract_stream(str(frames_folder), key="secret")
+    os.remove(output_folder / "frame_1_stego.png")
+    # Ranges held by the remaining frame still extract
+    with open(output_folder / stream_frames.INDEX_NAME, encoding='utf-8') as f:
+        first = json.load(f)['frames'][0]
+    assert stream_frames.extract_stream(str(output_folder), length=first['length'], key="secret") == payload[:first['length']]
+    with pytest.raises(ValueError, match="Failed to read frame frame_1_stego.png"):
+        stream_frames.extract_stream(str(output_folder), key="secret")
+
+def test_payload_larger_than_the_frames_is_cut(tmp_path, make_cover, capsys):
+    frames_folder = tmp_path / "frames"
+    frames_folder.mkdir()
+    cv2.imwrite(str(frames_folder / "frame_0.png"), make_cover(1, 96, 128))
+    payload = os.urandom(5000)
+
+    index = stream_frames.embed_frame_folder(str(frames_folder), payload, str(tmp_path / "stego"), 'dct')
+
+    assert 0 < index['embedded_bytes'] < len(payload)
+    assert f"embedded {index['embedded_bytes']} of {len(payload)} payload bytes" in capsys.readouterr().out
+    assert stream_frames.extract_stream(str(tmp_path / "stego")) == payload[:index['embedded_bytes']]
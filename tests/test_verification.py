@@ -0,0 +1,36 @@
+import cv2
+import pytest
+
+import dct_verification as verify
+import fanout
+import dwt
+
+MESSAGE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+
+def blur_rows(image, top, bottom):
+    damaged = image.copy()
+    damaged[top:bottom] = cv2.GaussianBlur(damaged[top:bottom], (5, 5), 0)
+    return damaged
+
+@pytest.mark.parametrize("full", [False, True])
+def test_dct_verification_catches_damaged_payload_blocks(make_cover, full):
+    bits = fanout.text_to_encoded_bits(MESSAGE)
+    stego_image = fanout.DCT_Cover(make_cover(1, 200, 296)).embed(bits)
+
+    assert verify.verify_embedded_data(stego_image, bits, full=full)
+    # The payload starts in the top block rows, blurring them drops coefficients to 1 or below
+    assert not verify.verify_embedded_data(blur_rows(stego_image, 0, 48), bits, full=full)
+
+def test_dct_verification_checks_the_key(make_cover):
+    bits = fanout.text_to_encoded_bits(MESSAGE)
+    stego_image = fanout.DCT_Cover(make_cover(1, 200, 296), "secret").embed(bits)
+
+    assert verify.verify_embedded_data(stego_image, bits, key="secret")
+    assert not verify.verify_embedded_data(stego_image, bits, key="other")
+
+def test_dwt_fast_verification_catches_damaged_rows(make_cover):
+    stego_image = dwt.embed_text_in_image(make_cover(1, 200, 296), MESSAGE)
+
+    assert dwt.verify_text_in_image(stego_image, MESSAGE)
+    assert not dwt.verify_text_in_image(blur_rows(stego_image, 0, 4), MESSAGE)
+    assert not dwt.verify_text_in_image(stego_image, MESSAGE.upper())